@@ -0,0 +1,407 @@
+"""
+Headless benchmark suite for rendering, interaction and deck hot paths.
+
+Runs against the SDL dummy video driver so it works without a display.
+Results are written as JSON and compared against a stored baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py                     # run and compare
+    python benchmarks/run_benchmarks.py --update-baseline   # store new baseline
+    python benchmarks/run_benchmarks.py --sizes 10 100 --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Must be set before pygame is imported anywhere
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pygame  # noqa: E402
+
+from main import Game  # noqa: E402
+from src.card import Card, CARD_TYPES  # noqa: E402
+from src.deck import Deck  # noqa: E402
+from src.deck_manager import DeckManager  # noqa: E402
+from src.card_index import CardIndex  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25  # Flag results more than 25% slower than baseline
+MIN_DELTA_MS = 0.05  # Ignore slowdowns smaller than this (timer noise)
+SEED = 1234
+
+
+def make_cards(count, seed=SEED):
+    """
+    Build a reproducible list of cards covering every card type.
+
+    Args:
+        count: Number of cards to create
+        seed: Seed for attribute values
+
+    Returns:
+        List of Card objects
+    """
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        card_type = CARD_TYPES[i % len(CARD_TYPES)]
+        card = Card(f"Card {i}", card_type=card_type,
+                    level=rng.randint(0, 5), special_rules="Bench rules text")
+        card.set_position(rng.randint(10, 1170), rng.randint(200, 400))
+        cards.append(card)
+    return cards
+
+
+def measure(func, setup=None, min_time=0.2, max_repeats=50, min_repeats=3):
+    """
+    Time a function repeatedly and return the median wall time.
+
+    Args:
+        func: Callable to time; receives the value returned by setup
+        setup: Optional callable run (untimed) before each repeat
+        min_time: Keep repeating until this many seconds have elapsed
+        max_repeats: Upper bound on repeats
+        min_repeats: Lower bound on repeats
+
+    Returns:
+        Dict with median, min and repeat count (times in ms)
+    """
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_repeats:
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        func(arg)
+        times.append((time.perf_counter() - t0) * 1000.0)
+        if len(times) >= min_repeats and time.perf_counter() - started >= min_time:
+            break
+    return {
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "repeats": len(times),
+    }
+
+
+def bench_render_card(game, size):
+    """Render every card once onto the display surface."""
+    cards = make_cards(size)
+    renderer = game.renderer
+
+    def run(_):
+        for card in cards:
+            renderer.render_card(card)
+    return measure(run)
+
+
+def bench_update_hover(game, size):
+    """Run Game.update with a table of cards to measure hover testing."""
+    for card in make_cards(size):
+        game._add_to_table(card)
+    game.hand_cards = []
+    game.input_handler.mouse_x, game.input_handler.mouse_y = 300, 300
+
+    def run(_):
+        game.update()
+    result = measure(run)
+    game._clear_table()
+    return result
+
+
+def bench_render_table(game, size):
+    """Render a full frame with a table of cards spread over the virtual table."""
+    rng = random.Random(SEED)
+    for card in make_cards(size):
+        card.set_position(rng.randint(0, 4000), rng.randint(0, 3000))
+        game._add_to_table(card)
+    game.hand_cards = []
+
+    def run(_):
+        game.render()
+    result = measure(run)
+    game._clear_table()
+    return result
+
+
+def bench_first_frame(game, size):
+    """Render the first frame after a table of new cards appears, with background pre-warming."""
+    rng = random.Random(SEED)
+    positions = [(rng.randint(0, 1200), rng.randint(200, 500)) for _ in range(size)]
+    prewarmer = game.prewarmer
+
+    def setup():
+        game._clear_table()
+        for card, (x, y) in zip(make_cards(size), positions):
+            card.set_position(x, y)
+            game._add_to_table(card)
+        prewarmer.prewarm(game.cards)
+
+    def run(_):
+        game.render()
+    game.renderer.prewarmer = prewarmer
+    result = measure(run, setup, max_repeats=20)
+    # Let queued faces finish before the next benchmark runs synchronously
+    while prewarmer.busy():
+        prewarmer.publish()
+    game.renderer.prewarmer = None
+    game._clear_table()
+    return result
+
+
+def bench_hand_layout(game, size):
+    """Recompute the layout of a hand of cards."""
+    game.cards = []
+    game.hand_cards = make_cards(size)
+
+    def run(_):
+        game.hand_layout.invalidate()
+        game._layout_hand()
+    result = measure(run)
+    game.hand_cards = []
+    return result
+
+
+def bench_deck_draw(size):
+    """Draw every card from a full deck."""
+    cards = make_cards(size)
+
+    def setup():
+        deck = Deck("Bench")
+        for card in cards:
+            deck.add_card(card)
+        return deck
+
+    def run(deck):
+        while deck.draw_card() is not None:
+            pass
+    return measure(run, setup)
+
+
+def bench_deck_shuffle(size):
+    """Shuffle a full deck."""
+    deck = Deck("Bench")
+    for card in make_cards(size):
+        deck.add_card(card)
+    random.seed(SEED)
+
+    def run(_):
+        deck.shuffle()
+    return measure(run)
+
+
+def bench_deck_add_to_top(size):
+    """Place every card on top of an initially empty deck."""
+    cards = make_cards(size)
+
+    def run(_):
+        deck = Deck("Bench")
+        for card in cards:
+            deck.add_to_top(card)
+    return measure(run)
+
+
+def bench_deck_save(manager, size):
+    """Save a deck through DeckManager."""
+    deck = Deck(f"Bench{size}")
+    for card in make_cards(size):
+        deck.add_card(card)
+
+    def run(_):
+        manager.save_deck(deck)
+    return measure(run, max_repeats=20)
+
+
+def bench_deck_load(manager, size):
+    """Load a deck previously written by bench_deck_save."""
+    def run(_):
+        manager.load_deck(f"Bench{size}")
+    return measure(run, max_repeats=20)
+
+
+def bench_card_index(size):
+    """Index a collection of cards in one bulk add."""
+    cards = make_cards(size)
+
+    def run(_):
+        CardIndex(observe=False).add_cards(cards)
+    return measure(run, max_repeats=20)
+
+
+def bench_card_search(size):
+    """Run keyword, prefix, type+range and range queries and fetch the first page of each."""
+    index = CardIndex()
+    index.add_cards(make_cards(size))
+    queries = [str(size // 2), "bench rul*", "type:plan level:2..3", "level>4"]
+
+    def run(_):
+        for query in queries:
+            index.search(query).page(0, 20)
+    return measure(run)
+
+
+def bench_quicksave(game, size):
+    """Flip one card and quicksave with a deck of cards (only the change is written)."""
+    game.table_deck.set_cards(make_cards(size))
+    card = game.table_deck.cards[0]
+    game.save_game("bench")
+
+    def run(_):
+        before = game._card_states([card])
+        card.flip()
+        game._record_op("flip", before)
+        game.save_game("bench")
+    result = measure(run)
+    game.table_deck.set_cards(())
+    return result
+
+
+def bench_memory_sample(game, size, diff):
+    """Take a memory sample with a deck of cards traced; diff=True includes the per-module snapshot diff."""
+    memory = game.memory
+    memory.enable()
+    game.table_deck.set_cards(make_cards(size))
+
+    def run(_):
+        memory.sample("bench", diff=diff)
+    result = measure(run, max_repeats=20)
+    memory.disable()
+    game.table_deck.set_cards(())
+    return result
+
+
+def run_suite(sizes):
+    """
+    Run every benchmark at every size.
+
+    Args:
+        sizes: Iterable of card counts
+
+    Returns:
+        Dict mapping "benchmark/size" to timing results
+    """
+    data_dir = tempfile.mkdtemp(prefix="paper_bench_")
+    results = {}
+    try:
+        game = Game(data_dir=data_dir)
+        # Render benchmarks measure synchronous rasterization unless noted
+        game.renderer.prewarmer = None
+        manager = DeckManager(data_dir)
+        for size in sizes:
+            results[f"render_card/{size}"] = bench_render_card(game, size)
+            results[f"update_hover/{size}"] = bench_update_hover(game, size)
+            results[f"render_table/{size}"] = bench_render_table(game, size)
+            results[f"first_frame/{size}"] = bench_first_frame(game, size)
+            results[f"hand_layout/{size}"] = bench_hand_layout(game, size)
+            results[f"deck_draw/{size}"] = bench_deck_draw(size)
+            results[f"deck_shuffle/{size}"] = bench_deck_shuffle(size)
+            results[f"deck_add_to_top/{size}"] = bench_deck_add_to_top(size)
+            results[f"deck_save/{size}"] = bench_deck_save(manager, size)
+            results[f"deck_load/{size}"] = bench_deck_load(manager, size)
+            results[f"card_index/{size}"] = bench_card_index(size)
+            results[f"card_search/{size}"] = bench_card_search(size)
+            results[f"quicksave/{size}"] = bench_quicksave(game, size)
+            results[f"memory_sample/{size}"] = bench_memory_sample(game, size, diff=False)
+            results[f"memory_diff/{size}"] = bench_memory_sample(game, size, diff=True)
+            for name, result in results.items():
+                if name.endswith(f"/{size}"):
+                    result["items"] = size
+                    if result["median_ms"] > 0:
+                        result["items_per_sec"] = size / (result["median_ms"] / 1000.0)
+            print(f"  finished size {size}", file=sys.stderr)
+    finally:
+        pygame.quit()
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results against a baseline.
+
+    Args:
+        results: Current results dict
+        baseline: Baseline results dict
+        threshold: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        List of (name, baseline_ms, current_ms, ratio) for regressions
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous or previous["median_ms"] <= 0:
+            continue
+        ratio = current["median_ms"] / previous["median_ms"]
+        delta = current["median_ms"] - previous["median_ms"]
+        if ratio > 1.0 + threshold and delta > MIN_DELTA_MS:
+            regressions.append((name, previous["median_ms"], current["median_ms"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    """Entry point."""
+    parser = argparse.ArgumentParser(description="Run the Paper Adventures benchmark suite.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Card counts to benchmark")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "sizes": args.sizes,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": run_suite(args.sizes),
+    }
+
+    for name, result in sorted(report["results"].items()):
+        print(f"{name:<28} {result['median_ms']:10.3f} ms  (n={result['repeats']})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare(report["results"], baseline.get("results", {}), args.threshold)
+    if regressions:
+        print("\nRegressions:")
+        for name, before, after, ratio in regressions:
+            print(f"  {name:<28} {before:10.3f} -> {after:10.3f} ms  (x{ratio:.2f})")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,84 +2,194 @@
 Main entry point for the PyGame card game.
 """
 
-import pygame
+import argparse
+import os
+import random
 import sys
+import time
+
+import pygame
 from src.card import Card, CARD_TYPES
 from src.deck import Deck
 from src.renderer import CardRenderer
 from src.input_handler import InputHandler
 from src.deck_manager import DeckManager
+from src.input_recorder import InputRecorder, InputReplay
+from src.frame_scheduler import FrameScheduler
+from src.hand_layout import HandLayout
+from src.deck_viewer import CardBrowserView, DeckListView
+from src.camera import Camera
+from src.spatial_index import SpatialHash
+from src.face_prewarmer import FacePrewarmer
+from src.asset_loader import AssetLoader
+from src.thumbnail_cache import ThumbnailCache
+from src.widgets import Button, Panel, Selector, TextInput, WidgetTree
+from src.operation_log import OperationLog
+from src.card_index import CardIndex
+from src.table_client import NETWORK_EVENT, TableClient
+from src.save_game import SaveGame, fold
+from src.ai_player import ATTACH_OFFSET, ATTACH_ROWS, AIPlayer, make_state, profile, read_table
+from src.profiler import FrameProfiler
+from src.memory_tracker import MemoryTracker, zone_usage
+
+# Card Creator fields shown for each card type, top to bottom
+CREATOR_FIELDS = {
+    "Character": ['level', 'class', 'strength', 'agility', 'intelligence', 'wisdom', 'special_rules'],
+    "Upgrade": ['level', 'strength_mod', 'agility_mod', 'intelligence_mod', 'wisdom_mod', 'special_rules'],
+    "Plan": ['strength_req', 'agility_req', 'intelligence_req', 'wisdom_req', 'special_rules'],
+    "Skill": ['strength_req', 'agility_req', 'intelligence_req', 'wisdom_req', 'special_rules'],
+    "Location": ['level', 'strength_def', 'agility_def', 'intelligence_def', 'wisdom_def',
+                 'hit_points', 'special_rules'],
+    "Encounter": ['strength_def', 'agility_def', 'intelligence_def', 'wisdom_def',
+                  'hit_points', 'special_rules'],
+}
+
+FIELD_LABELS = {
+    'name': 'Card Name',
+    'level': 'Level',
+    'class': 'Class',
+    'strength': 'Strength',
+    'agility': 'Agility',
+    'intelligence': 'Intelligence',
+    'wisdom': 'Wisdom',
+    'strength_mod': 'Strength Mod',
+    'agility_mod': 'Agility Mod',
+    'intelligence_mod': 'Intelligence Mod',
+    'wisdom_mod': 'Wisdom Mod',
+    'strength_req': 'Strength Req',
+    'agility_req': 'Agility Req',
+    'intelligence_req': 'Intelligence Req',
+    'wisdom_req': 'Wisdom Req',
+    'strength_def': 'Strength Def',
+    'agility_def': 'Agility Def',
+    'intelligence_def': 'Intelligence Def',
+    'wisdom_def': 'Wisdom Def',
+    'hit_points': 'Hit Points',
+    'special_rules': 'Special Rules',
+}
+
+# Free-text fields and their maximum lengths; all other fields are numeric
+TEXT_FIELD_LENGTHS = {'name': 30, 'class': 100, 'special_rules': 100}
 
 
 class Game:
     """Main game class managing the game loop and state."""
     
-    def __init__(self):
-        """Initialize the game."""
+    def __init__(self, data_dir="data", record_path=None, replay_path=None, seed=None, connect=None,
+                 memory_report=None):
+        """
+        Initialize the game.
+        
+        Args:
+            data_dir: Directory used for saved decks
+            record_path: If set, record the input stream to this file on exit
+            replay_path: If set, replay a recorded input stream instead of live input
+            seed: RNG seed for the session (random if not given)
+            connect: If set, join the table server at this address ("host:port" or "unix:/path")
+            memory_report: If set, track memory from the start and write a report here on exit
+        """
         pygame.init()
         self.screen_width = 1280
         self.screen_height = 720
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
         pygame.display.set_caption("Paper Adventures - Card Game")
         self.clock = pygame.time.Clock()
+        # Sleeps on input when idle; fixed-timestep simulation when active
+        self.scheduler = FrameScheduler()
+        self.needs_redraw = True
+        self.sim_ticks = 0
         
         # Initialize systems
         self.input_handler = InputHandler()
+        # Unused event types never reach the queue
+        InputHandler.install_event_filter()
+        self._build_event_handlers()
         self.renderer = CardRenderer(self.screen)
-        self.deck_manager = DeckManager()
+        # Card faces are rasterized on worker threads; placeholders show meanwhile
+        self.prewarmer = FacePrewarmer(self.renderer)
+        self.renderer.prewarmer = self.prewarmer
+        # Card art ("art" attribute) is decoded in the background from assets/
+        self.assets = AssetLoader()
+        self.renderer.assets = self.assets
+        self.deck_manager = DeckManager(data_dir)
+        # Card and deck previews, kept as PNGs across runs
+        self.thumbnails = ThumbnailCache(self.renderer, os.path.join(data_dir, "thumbnails"))
+        # Frame-phase profiler (F3 toggles overlay, F4 dumps trace)
+        self.profiler = FrameProfiler()
+        # Opt-in memory accounting (F7 toggles overlay, F8 writes a report)
+        self.memory = MemoryTracker()
+        self.memory_report = memory_report
+        self.memory.add_probe("cards", self._memory_zones)
+        self.memory.add_probe("renderer", self.renderer.memory_usage)
+        self.memory.add_probe("card art", self.assets.memory_usage)
+        self.memory.add_probe("thumbnails", self.thumbnails.memory_usage)
+        if memory_report:
+            self.memory.enable()
         self.table_deck = Deck("Table Deck")
+        # Shown beside the pile, so its statistics are kept up to date
+        self.table_deck.track_stats()
+        # Input recording / replay
+        self.record_path = record_path
+        replay = InputReplay.load(replay_path) if replay_path else None
+        # Replays must not touch saved decks so they stay repeatable
+        self.persist = replay is None
+        if replay is not None:
+            seed = replay.seed
+        elif seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        random.seed(seed)
         # Persistent deck for cards created via Card Creator
-        loaded_created = self.deck_manager.load_deck("CreatedCards")
-        self.created_cards_deck = loaded_created if loaded_created else Deck("CreatedCards")
+        if replay is not None:
+            self.created_cards_deck = Deck("CreatedCards")
+            for card_data in replay.initial_cards:
+                self.created_cards_deck.add_card(DeckManager.card_from_dict(card_data))
+        else:
+            loaded_created = self.deck_manager.load_deck("CreatedCards")
+            self.created_cards_deck = loaded_created if loaded_created else Deck("CreatedCards")
+        self.input_handler.replay = replay
+        if record_path:
+            initial_cards = [DeckManager.card_to_dict(c) for c in self.created_cards_deck.cards]
+            self.input_handler.recorder = InputRecorder(seed, initial_cards)
         # Static deck placement and size (matches card size)
         self.deck_x = 10
         self.deck_y = 10
         self.deck_width = 100
         self.deck_height = 140
-        # Debug view flag for deck contents
+        # Debug view of deck contents (V over the deck toggles it)
         self.view_deck_debug = False
+        self.deck_view = DeckListView()
+        # Searchable browser over the created cards (B opens it, Escape closes it)
+        self.card_index = CardIndex()
+        self.card_index.add_cards(self.created_cards_deck.cards)
+        self.show_card_browser = False
+        self.card_browser = CardBrowserView(self.card_index)
+        self.card_browser_x = self.deck_x + self.deck_width + 12
+        self.card_browser_y = self.deck_y
         # Draw button under deck
         self.draw_btn_width = self.deck_width
         self.draw_btn_height = 36
         self.draw_btn_x = self.deck_x
         self.draw_btn_y = self.deck_y + self.deck_height + 20
         
-        # Upper-right Card Creator inputs
+        # Upper-right Card Creator widgets
         self.card_type_index = 0  # Index into CARD_TYPES
-        self.card_name_input = ""
-        # Fields for all card types
-        self.level_input = ""
-        self.class_input = ""
-        self.strength_input = ""
-        self.agility_input = ""
-        self.intelligence_input = ""
-        self.wisdom_input = ""
-        self.strength_mod_input = ""
-        self.agility_mod_input = ""
-        self.intelligence_mod_input = ""
-        self.wisdom_mod_input = ""
-        self.strength_req_input = ""
-        self.agility_req_input = ""
-        self.intelligence_req_input = ""
-        self.wisdom_req_input = ""
-        self.strength_def_input = ""
-        self.agility_def_input = ""
-        self.intelligence_def_input = ""
-        self.wisdom_def_input = ""
-        self.hit_points_input = ""
-        self.special_rules_input = ""
-        self.input_focus = None  # Current focused input field
         self.card_name_input_width = 260
         self.card_name_input_height = 28
         self.card_name_input_x = self.screen_width - self.card_name_input_width - 10
         self.card_name_input_y = 10
         self.spacing = 40  # Spacing between input fields
+        # Retained widgets route clicks through a region index and keys to the focused input
+        self.ui = WidgetTree()
+        self._build_widgets()
         # Player hand area along bottom
         self.hand_x = 10
         self.hand_y = self.screen_height - 180
         self.hand_width = self.screen_width - 20
         self.hand_height = 170
         self.hand_cards = []
+        # Slot positions are cached and only recomputed when the hand changes
+        self.hand_layout = HandLayout(self.hand_x, self.hand_y, self.hand_width, self.hand_height)
         
         # In-play area in the center of the window
         self.play_area_x = 10
@@ -87,328 +197,1162 @@ class Game:
         self.play_area_width = self.screen_width - 20
         self.play_area_height = self.hand_y - self.play_area_y - 20
         
+        # Camera over a virtual table much larger than the play area.
+        # Table cards (self.cards) use world coordinates; hand and UI use screen.
+        self.camera = Camera((self.play_area_x, self.play_area_y,
+                              self.play_area_width, self.play_area_height))
+        self.panning = False
+        
         # Game state
         self.running = True
         self.cards = []
+        # Spatial index over table cards for culling and hit testing
+        self.table_index = SpatialHash()
+        self.hovered_cards = set()
+        # Selected table cards drag together; dragged table cards are lifted
+        # out of the spatial index until they are dropped
+        self.selection = set()
+        self.lifted_cards = set()
+        self.rubber_band = None  # Screen point where a selection rectangle started
+        # Undo/redo: zone moves, draws, flips and card creation are recorded as
+        # per-card before/after states, with periodic snapshots of every zone
+        self.history = OperationLog()
+        self._drag_before = None  # Card states captured when the current drag started
+        # Save slots (F5 quicksave, F9 quickload, periodic autosave); each slot
+        # tracks which cards changed since it was last written
+        self.save_dir = os.path.join(data_dir, "saves")
+        self.saves = {}
+        self.autosave_interval = 60.0
+        self._next_autosave = time.monotonic() + self.autosave_interval
+        # Computer player (A toggles); its worker processes start on first use
+        self.ai = None
+        self.ai_enabled = False
+        self.ai_move_delay = 0.4  # Seconds between AI moves so they can be followed
+        self._next_ai_move = 0.0
         
         # Add previously created cards (persisted) to the table
         for persisted_card in self.created_cards_deck.cards:
             # Ensure their rects are set and include in current table
             if not persisted_card.rect:
                 persisted_card.update_rect()
-            self.cards.append(persisted_card)
+            self._add_to_table(persisted_card)
+        # Rasterize loaded faces in the background so the first frame stays cheap
+        self.prewarmer.prewarm(self.created_cards_deck.cards)
+        self.history.add_snapshot(self._snapshot())
+        
+        # Shared table: the server's state replaces the local one when its welcome arrives
+        self.net = None
+        self.cards_by_id = {}  # Every card seen at the shared table, in play or not
+        self._remote_drags = {}  # Card another player is dragging -> its position before the drag
+        if connect:
+            self.net = TableClient(connect)
+            self.net.start()
+            pygame.event.set_allowed(NETWORK_EVENT)
+            # Undo steps through single changes so each one reaches the server
+            self.history.snapshot_cost = float("inf")
 
-    def _get_visible_fields(self):
-        """Get list of visible field names for current card type."""
-        card_type = CARD_TYPES[self.card_type_index]
-        fields = ['name']
-        if card_type == "Character":
-            fields.extend(['type_selector', 'level', 'class', 'strength', 'agility', 
-                          'intelligence', 'wisdom', 'special_rules'])
-        elif card_type == "Upgrade":
-            fields.extend(['type_selector', 'level', 'strength_mod', 'agility_mod', 
-                          'intelligence_mod', 'wisdom_mod', 'special_rules'])
-        elif card_type == "Plan":
-            fields.extend(['type_selector', 'strength_req', 'agility_req', 
-                          'intelligence_req', 'wisdom_req', 'special_rules'])
-        elif card_type == "Skill":
-            fields.extend(['type_selector', 'strength_req', 'agility_req', 
-                          'intelligence_req', 'wisdom_req', 'special_rules'])
-        elif card_type == "Location":
-            fields.extend(['type_selector', 'level', 'strength_def', 'agility_def', 
-                          'intelligence_def', 'wisdom_def', 'hit_points', 'special_rules'])
-        elif card_type == "Encounter":
-            fields.extend(['type_selector', 'strength_def', 'agility_def', 
-                          'intelligence_def', 'wisdom_def', 'hit_points', 'special_rules'])
-        return fields
+    def _add_to_table(self, card):
+        """Place a card on top of the in-play area (card position is in world coordinates)."""
+        card.update_rect()
+        self.cards.append(card)
+        self.table_index.insert(card)
     
-    def _get_field_y_position(self, field_name):
-        """Get Y position for a field in the card creator."""
-        card_type = CARD_TYPES[self.card_type_index]
-        field_order = ['name']
+    def _remove_from_table(self, card):
+        """Remove a card from the in-play area if present."""
+        self._remove_cards_from_table([card])
+    
+    def _remove_cards_from_table(self, cards):
+        """Remove several cards from the in-play area in one pass."""
+        leaving = {card for card in cards if self._is_table_card(card)}
+        if not leaving:
+            return
+        for card in leaving:
+            self.table_index.remove(card)
+            card.hovered = False
+            card.selected = False
+        self.cards = [card for card in self.cards if card not in leaving]
+        self.hovered_cards -= leaving
+        self.selection -= leaving
+        self.lifted_cards -= leaving
+    
+    def _is_table_card(self, card):
+        """Check whether a card is in the in-play area (including while lifted by a drag)."""
+        return card in self.table_index or card in self.lifted_cards
+    
+    def _clear_table(self):
+        """Remove every card from the in-play area."""
+        for card in self.hovered_cards:
+            card.hovered = False
+        self._set_selection(())
+        self.hovered_cards = set()
+        self.lifted_cards = set()
+        self.cards = []
+        self.table_index.clear()
+        for save in self.saves.values():
+            save.mark_all()
+    
+    def _set_selection(self, cards):
+        """Replace the selected table cards."""
+        for card in self.selection:
+            card.selected = False
+        self.selection = set(cards)
+        for card in self.selection:
+            card.selected = True
+    
+    def _select_in_rect(self, sx0, sy0, sx1, sy1, extend):
+        """
+        Select table cards overlapping a screen rectangle (rubber band).
         
-        if card_type == "Character":
-            field_order.extend(['type_selector', 'level', 'class', 'strength', 'agility', 
-                               'intelligence', 'wisdom', 'special_rules'])
-        elif card_type == "Upgrade":
-            field_order.extend(['type_selector', 'level', 'strength_mod', 'agility_mod', 
-                               'intelligence_mod', 'wisdom_mod', 'special_rules'])
-        elif card_type == "Plan":
-            field_order.extend(['type_selector', 'strength_req', 'agility_req', 
-                               'intelligence_req', 'wisdom_req', 'special_rules'])
-        elif card_type == "Skill":
-            field_order.extend(['type_selector', 'strength_req', 'agility_req', 
-                               'intelligence_req', 'wisdom_req', 'special_rules'])
-        elif card_type == "Location":
-            field_order.extend(['type_selector', 'level', 'strength_def', 'agility_def', 
-                               'intelligence_def', 'wisdom_def', 'hit_points', 'special_rules'])
-        elif card_type == "Encounter":
-            field_order.extend(['type_selector', 'strength_def', 'agility_def', 
-                               'intelligence_def', 'wisdom_def', 'hit_points', 'special_rules'])
+        Args:
+            sx0, sy0, sx1, sy1: Opposite corners in screen coordinates
+            extend: Add to the current selection instead of replacing it
+        """
+        wx0, wy0 = self.camera.screen_to_world(min(sx0, sx1), min(sy0, sy1))
+        wx1, wy1 = self.camera.screen_to_world(max(sx0, sx1), max(sy0, sy1))
+        found = self.table_index.query_rect(wx0, wy0, wx1 - wx0, wy1 - wy0)
+        self._set_selection(self.selection.union(found) if extend else found)
+    
+    def _lift_table_cards(self, cards):
+        """Take dragged table cards out of the spatial index so moving them costs nothing per card."""
+        for card in cards:
+            self.table_index.remove(card)
+            self.lifted_cards.add(card)
+            if card.hovered:
+                card.hovered = False
+                self.hovered_cards.discard(card)
+    
+    def _drop_cards(self, cards, mx, my):
+        """
+        Move released cards to the zone under the cursor as one transaction.
+        
+        Dropping on the deck stacks them on top (first card on top), dropping
+        on the hand inserts them at the slot under the cursor in order, and
+        anywhere else leaves them on the table above the other cards.
+        
+        Args:
+            cards: Released cards, grabbed card first
+            mx, my: Screen position of the drop
+        """
+        moving = set(cards)
+        lifted = [card for card in cards if card in self.lifted_cards]
+        if (self.deck_x <= mx <= self.deck_x + self.deck_width and
+            self.deck_y <= my <= self.deck_y + self.deck_height):
+            self._remove_cards_from_table(cards)
+            self.hand_cards = [card for card in self.hand_cards if card not in moving]
+            for card in cards:
+                card.set_position(self.deck_x, self.deck_y)
+            self.table_deck.add_cards_to_top(cards)
+        elif (self.hand_x <= mx <= self.hand_x + self.hand_width and
+              self.hand_y <= my <= self.hand_y + self.hand_height):
+            index = self.hand_layout.insertion_index(mx)
+            # Table cards continue from where they appear on screen
+            for card in lifted:
+                sx, sy = self.camera.world_to_screen(card.x, card.y)
+                card.set_position(int(sx), int(sy))
+            self._remove_cards_from_table(cards)
+            # Slots before the insertion point vacated by moving cards shift it left
+            index -= sum(1 for card in self.hand_cards[:index] if card in moving)
+            remaining = [card for card in self.hand_cards if card not in moving]
+            remaining[index:index] = cards
+            self.hand_cards = remaining
+        elif lifted:
+            # Back onto the table on top of the stack, grabbed card uppermost
+            for card in lifted[1:] + lifted[:1]:
+                self.table_index.insert(card)
+                self.lifted_cards.discard(card)
+        # Drop ended: the hand may need to close or reopen a gap
+        self.hand_layout.invalidate()
+    
+    def _card_states(self, cards):
+        """
+        Capture where cards are so a change to them can be undone.
+        
+        A state is (zone, position, x, y, face_up): zone is "table", "hand"
+        or "deck"; position is the table stacking stamp or the index in the
+        hand or deck; x/y are only kept for table cards. Cards in no zone
+        get None.
+        
+        Args:
+            cards: Cards to capture
+        
+        Returns:
+            List of (card, state) pairs
+        """
+        hand_index = deck_index = None
+        # For a few cards, scanning the lists in C beats building index dicts
+        few = len(cards) <= 8
+        states = []
+        for card in cards:
+            if self._is_table_card(card):
+                state = ("table", self.table_index.stamp_of(card), card.x, card.y, card.face_up)
+            elif few:
+                state = None
+                for zone, pile in (("hand", self.hand_cards), ("deck", self.table_deck.cards)):
+                    try:
+                        state = (zone, pile.index(card), None, None, card.face_up)
+                        break
+                    except ValueError:
+                        pass
+            else:
+                if hand_index is None:
+                    hand_index = {c: i for i, c in enumerate(self.hand_cards)}
+                    deck_index = {c: i for i, c in enumerate(self.table_deck.cards)}
+                if card in hand_index:
+                    state = ("hand", hand_index[card], None, None, card.face_up)
+                elif card in deck_index:
+                    state = ("deck", deck_index[card], None, None, card.face_up)
+                else:
+                    state = None
+            states.append((card, state))
+        return states
+    
+    @staticmethod
+    def _same_place(old, new):
+        """Check whether two card states differ at most in table stacking order."""
+        if old == new:
+            return True
+        return (old is not None and new is not None and
+                old[0] == new[0] == "table" and old[2:] == new[2:])
+    
+    def _record_op(self, kind, before):
+        """
+        Record a change in the undo history.
+        
+        Args:
+            kind: Operation name ("move", "draw", "flip" or "create")
+            before: _card_states() of the affected cards taken before the change
+        
+        Returns:
+            True if anything changed
+        """
+        after = self._card_states([card for card, _ in before])
+        changes = [(card, old, new) for (card, old), (_, new) in zip(before, after)
+                   if not self._same_place(old, new)]
+        if not changes:
+            return False
+        self.history.record({"kind": kind, "changes": changes})
+        if self.history.wants_snapshot():
+            self.history.add_snapshot(self._snapshot())
+        self._mark_saves([card for card, _, _ in changes])
+        self._share(kind, changes)
+        self.memory.action(kind)
+        return True
+    
+    def _apply_card_states(self, states):
+        """
+        Put cards into recorded zones; the one path undo and redo go through.
+        
+        Args:
+            states: (card, state) pairs as produced by _card_states()
+        """
+        cards = [card for card, _ in states]
+        moving = set(cards)
+        for card, state in states:
+            if state is not None and state[0] == "hand" and self._is_table_card(card):
+                # Table cards slide into the hand from where they appear on screen
+                sx, sy = self.camera.world_to_screen(card.x, card.y)
+                card.set_position(int(sx), int(sy))
+        self._remove_cards_from_table(cards)
+        self.hand_cards = [card for card in self.hand_cards if card not in moving]
+        self.table_deck.remove_cards(moving)
+        # Inserting in ascending index order restores each zone's original order
+        placed = sorted(((card, state) for card, state in states if state is not None),
+                        key=lambda item: item[1][:2])
+        for card, (zone, position, x, y, face_up) in placed:
+            if card.face_up != face_up:
+                card.flip()
+            if zone == "table":
+                card.set_position(x, y)
+                self.cards.append(card)
+                self.table_index.insert(card, position)
+            elif zone == "hand":
+                self.hand_cards.insert(position, card)
+            else:
+                card.set_position(self.deck_x, self.deck_y)
+                self.table_deck.insert_card(position, card)
+        self._mark_saves(cards)
+        self.hand_layout.invalidate()
+        self.needs_redraw = True
+    
+    def _revert_op(self, op):
+        """Undo one recorded operation."""
+        self._apply_card_states([(card, old) for card, old, _ in op["changes"]])
+        self._share(op["kind"], [(card, new, old) for card, old, new in op["changes"]])
+        if op["kind"] == "create":
+            self._set_created_cards([card for card, _, _ in op["changes"]], False)
+    
+    def _replay_op(self, op):
+        """Redo one recorded operation."""
+        self._apply_card_states([(card, new) for card, _, new in op["changes"]])
+        self._share(op["kind"], op["changes"])
+        if op["kind"] == "create":
+            self._set_created_cards([card for card, _, _ in op["changes"]], True)
+    
+    def _set_created_cards(self, cards, present):
+        """Add cards to or remove them from the persistent created-cards deck."""
+        if present:
+            for card in cards:
+                self.created_cards_deck.add_card(card)
+                self.card_index.add(card)
+        else:
+            self.created_cards_deck.remove_cards(set(cards))
+            for card in cards:
+                self.card_index.remove(card)
+        if self.persist:
+            self.deck_manager.save_deck(self.created_cards_deck)
+    
+    def _snapshot(self):
+        """Capture every zone so the history can jump far without stepping through each change."""
+        stamp_of = self.table_index.stamp_of
+        return {
+            "table": [(card, stamp_of(card), card.x, card.y, card.face_up) for card in self.cards],
+            "hand": [(card, card.face_up) for card in self.hand_cards],
+            "deck": [(card, card.face_up) for card in self.table_deck.cards],
+            "created": list(self.created_cards_deck.cards),
+        }
+    
+    def _restore_snapshot(self, snapshot):
+        """Rebuild every zone from a snapshot taken by _snapshot()."""
+        self._clear_table()
+        for card, stamp, x, y, face_up in snapshot["table"]:
+            if card.face_up != face_up:
+                card.flip()
+            card.set_position(x, y)
+            self.cards.append(card)
+            self.table_index.insert(card, stamp)
+        for card, face_up in snapshot["hand"] + snapshot["deck"]:
+            if card.face_up != face_up:
+                card.flip()
+        self.hand_cards = [card for card, _ in snapshot["hand"]]
+        for card, _ in snapshot["deck"]:
+            card.set_position(self.deck_x, self.deck_y)
+        self.table_deck.set_cards(card for card, _ in snapshot["deck"])
+        if snapshot["created"] != self.created_cards_deck.cards:
+            restored = set(snapshot["created"])
+            for card in self.created_cards_deck.cards:
+                if card not in restored:
+                    self.card_index.remove(card)
+            self.card_index.add_cards(snapshot["created"])
+            self.created_cards_deck.set_cards(snapshot["created"])
+            if self.persist:
+                self.deck_manager.save_deck(self.created_cards_deck)
+        self.hand_layout.invalidate()
+        self.needs_redraw = True
+    
+    def _mark_saves(self, cards):
+        """Note changed cards in every save slot so the next save only writes those."""
+        for save in self.saves.values():
+            save.mark(cards)
+    
+    def _save_path(self, slot):
+        """Get the file a save slot is written to."""
+        return os.path.join(self.save_dir, f"{slot}.save")
+    
+    def _save_slot(self, slot):
+        """Get the SaveGame for a slot name, creating it on first use."""
+        save = self.saves.get(slot)
+        if save is None:
+            save = self.saves[slot] = SaveGame(self._save_path(slot))
+        return save
+    
+    def save_game(self, slot="quicksave"):
+        """
+        Save the table, hand and deck to a slot.
         
-        try:
-            index = field_order.index(field_name)
-            return self.card_name_input_y + index * self.spacing
-        except ValueError:
+        Only the cards changed since the slot was last written are appended,
+        unless the slot needs a new base snapshot (first save this session,
+        or the appended frames outgrew the base).
+        
+        Args:
+            slot: Save slot name (data/saves/<slot>.save)
+        
+        Returns:
+            True if anything was written
+        """
+        if not self.persist or self.lifted_cards:
+            return False  # Replays never write; dragged cards have no zone to save yet
+        save = self._save_slot(slot)
+        camera = self.camera.get_view()
+        if not save.needs_base():
+            return save.append_frame(self._card_states(save.dirty), camera)
+        os.makedirs(self.save_dir, exist_ok=True)
+        stamp_of = self.table_index.stamp_of
+        save.write_base([(card, stamp_of(card)) for card in self.cards],
+                        self.hand_cards, self.table_deck.cards, camera)
+        return True
+    
+    def load_game(self, slot="quicksave"):
+        """
+        Replace the table, hand and deck with a saved slot.
+        
+        The save's frames are folded into its base on plain ids first, so
+        the zones are built in one pass. Cards from the created-cards deck
+        keep their objects. Undo history starts over.
+        
+        Args:
+            slot: Save slot name
+        
+        Returns:
+            True if the slot existed and was loaded
+        """
+        if self.net is not None or self.lifted_cards:
+            return False  # The server owns a shared table
+        save = SaveGame(self._save_path(slot))
+        loaded = save.read()
+        if loaded is None:
+            return False
+        saved = fold(*loaded)
+        known = {card.card_id: card for card in self.created_cards_deck.cards}
+        cards = {}
+        table = []
+        for card_id, (zone, position, x, y, face_up) in saved["states"].items():
+            card = known.get(card_id)
+            if card is None:
+                card = DeckManager.card_from_dict(saved["cards"][card_id])
+            cards[card_id] = card
+            if card.face_up != face_up:
+                card.flip()
+            if zone == "table":
+                card.set_position(x, y)
+                table.append((position, card))
+            elif zone == "deck":
+                card.set_position(self.deck_x, self.deck_y)
+            elif x is not None:
+                card.set_position(x, y)
+        self._clear_table()
+        table.sort(key=lambda item: item[0])
+        for stamp, card in table:
+            self.cards.append(card)
+            self.table_index.insert(card, stamp)
+        self.hand_cards = [cards[card_id] for card_id in saved["hand"]]
+        self.table_deck.set_cards(cards[card_id] for card_id in saved["deck"])
+        self.camera.set_view(saved["camera"])
+        # Later saves to this slot continue the loaded file
+        self.saves[slot] = save
+        self.history = OperationLog()
+        self.history.add_snapshot(self._snapshot())
+        self.prewarmer.prewarm(self.cards)
+        self.hand_layout.invalidate()
+        self.memory.action("load")
+        self.needs_redraw = True
+        return True
+    
+    def undo(self, steps=1):
+        """
+        Undo recent operations (not while dragging).
+        
+        Args:
+            steps: Number of operations to undo
+        
+        Returns:
+            Number of operations stepped through
+        """
+        if self.input_handler.dragged_card is not None:
+            return 0
+        history = self.history
+        return history.seek(history.position - steps, self._revert_op, self._replay_op,
+                            self._restore_snapshot)
+    
+    def redo(self, steps=1):
+        """
+        Redo undone operations (not while dragging).
+        
+        Args:
+            steps: Number of operations to redo
+        
+        Returns:
+            Number of operations stepped through
+        """
+        if self.input_handler.dragged_card is not None:
+            return 0
+        history = self.history
+        return history.seek(history.position + steps, self._revert_op, self._replay_op,
+                            self._restore_snapshot)
+    
+    def _share(self, kind, changes):
+        """
+        Send a change already applied locally to the table server, if connected.
+        
+        Args:
+            kind: Operation name
+            changes: (card, before, after) triples of local card states
+        """
+        if self.net is None or self.net.seat is None:
+            return
+        wire = []
+        new_cards = []
+        for card, old, new in changes:
+            self.cards_by_id[card.card_id] = card
+            wire.append([card.card_id, self._to_wire(old), self._to_wire(new)])
+            if old is None:
+                new_cards.append(DeckManager.card_to_dict(card))
+        self.net.send_op(kind, wire, new_cards)
+    
+    def _to_wire(self, state):
+        """Convert a local card state to the server's form (own hand becomes "hand:<seat>")."""
+        if state is None:
+            return None
+        zone, position, x, y, face_up = state
+        if zone == "hand":
+            zone = f"hand:{self.net.seat}"
+        elif zone == "table":
+            position = None  # Stacking stamps are local
+        return [zone, position, x, y, face_up]
+    
+    def _from_wire(self, state):
+        """Convert a server card state to a local one; other players' hands are out of play here."""
+        if state is None:
+            return None
+        zone, position, x, y, face_up = state
+        if zone.startswith("hand:"):
+            if zone != f"hand:{self.net.seat}":
+                return None
+            zone = "hand"
+        return (zone, position, x, y, face_up)
+    
+    def _apply_network(self):
+        """
+        Apply messages received from the table server.
+        
+        Returns:
+            True if any message arrived
+        """
+        messages = self.net.poll()
+        for message in messages:
+            handler = self._net_handlers.get(message["t"])
+            if handler is not None:
+                handler(message)
+        return bool(messages)
+    
+    def _apply_wire_states(self, pairs):
+        """Move cards to server-given states, skipping those already there."""
+        states = []
+        for card_id, wire_state in pairs:
+            card = self.cards_by_id.get(card_id)
+            if card is not None:
+                self._remote_drags.pop(card, None)
+                states.append((card, self._from_wire(wire_state)))
+        current = dict(self._card_states([card for card, _ in states]))
+        states = [(card, state) for card, state in states if not self._same_place(current[card], state)]
+        if states:
+            self._apply_card_states(states)
+    
+    def _on_net_welcome(self, message):
+        """Replace the local table, hand and deck with the server's state."""
+        seat = message["seat"]
+        self.net.seat = seat
+        for card_data in message["cards"]:
+            card = DeckManager.card_from_dict(card_data)
+            self.cards_by_id[card.card_id] = card
+        # Cards created here get ids no other seat uses
+        Card.reserve_ids(seat << 32)
+        self._clear_table()
+        self.hand_cards = []
+        self.table_deck.set_cards(())
+        self.history = OperationLog(snapshot_cost=float("inf"))
+        # Cards in other players' hands come without contents; they are out of play here
+        self._apply_card_states([(self.cards_by_id[card_id], self._from_wire(state))
+                                 for card_id, state in message["zones"] if card_id in self.cards_by_id])
+    
+    def _on_net_op(self, message):
+        """Apply another player's change, or the server's answer to one of ours."""
+        seq = message.get("seq")
+        if seq is not None and self.net.confirm(seq):
+            return  # A later local change to these cards is already shown
+        for card_data in message["cards"]:
+            if card_data["card_id"] not in self.cards_by_id:
+                card = DeckManager.card_from_dict(card_data)
+                self.cards_by_id[card.card_id] = card
+        self._apply_wire_states(message["changes"])
+    
+    def _on_net_reject(self, message):
+        """Roll a refused local change back to the server's state."""
+        self.net.confirm(message["seq"])
+        self._apply_wire_states(message["states"])
+    
+    def _on_net_drag(self, message):
+        """Show another player's drag by moving their cards from where they were picked up."""
+        dx, dy = message["dx"], message["dy"]
+        for card_id in message["ids"]:
+            card = self.cards_by_id.get(card_id)
+            if card is None or card not in self.table_index:
+                continue
+            x, y = self._remote_drags.setdefault(card, (card.x, card.y))
+            card.set_position(x + dx, y + dy)
+            self.table_index.update(card)
+            if message["end"]:
+                del self._remote_drags[card]
+    
+    def _on_net_seats(self, message):
+        """Show the seat and player count in the window title."""
+        self.net.seats = message["seats"]
+        pygame.display.set_caption(f"Paper Adventures - Card Game "
+                                   f"(seat {self.net.seat}, {len(message['seats'])} players)")
+    
+    def _on_net_closed(self, message):
+        """Keep playing locally after the server went away."""
+        self.net = None
+        pygame.display.set_caption("Paper Adventures - Card Game (disconnected)")
+    
+    def _share_drag(self):
+        """Send the visible area and any table drag in progress, throttled by the client."""
+        handler = self.input_handler
+        self.net.send_view(self.camera.visible_world_rect())
+        if handler.dragged_card is not None and handler.dragged_card in self.lifted_cards:
+            self.net.send_drag([card.card_id for card in handler.drag_group],
+                               handler.drag_dx, handler.drag_dy)
+    
+    def _table_card_at(self, sx, sy):
+        """
+        Find the top-most table card under a screen point.
+        
+        Args:
+            sx, sy: Screen coordinates
+        
+        Returns:
+            Card or None
+        """
+        if not self.camera.contains_screen_point(sx, sy):
             return None
+        hits = self.table_index.query_point(*self.camera.screen_to_world(sx, sy))
+        return hits[-1] if hits else None
+    
+    def _hand_card_at(self, sx, sy):
+        """Find the top-most hand card under a screen point, or None."""
+        for card in reversed(self.hand_cards):  # Check from top to bottom
+            if card.is_point_inside(sx, sy):
+                return card
+        return None
+
+    def _build_widgets(self):
+        """Create the Draw button and the Card Creator widgets."""
+        ui = self.ui
+        ui.add(Button("Draw", self._draw_to_hand, enabled=lambda: not self.table_deck.is_empty(),
+                      x=self.draw_btn_x, y=self.draw_btn_y,
+                      width=self.draw_btn_width, height=self.draw_btn_height))
+        self.creator_panel = ui.add(Panel("Card Creator"))
+        self.type_selector = ui.add(Selector(CARD_TYPES, self._on_card_type_changed,
+                                             prefix="Type: ", index=self.card_type_index))
+        self.creator_inputs = {}
+        for field_name, label in FIELD_LABELS.items():
+            numeric = field_name not in TEXT_FIELD_LENGTHS
+            max_length = 3 if numeric else TEXT_FIELD_LENGTHS[field_name]
+            self.creator_inputs[field_name] = ui.add(TextInput(label, max_length, numeric))
+        self.submit_button = ui.add(Button("Submit", self._submit_creator_inputs))
+        self._layout_card_creator()
+    
+    def _layout_card_creator(self):
+        """Position the Card Creator widgets for the selected card type."""
+        card_type = CARD_TYPES[self.card_type_index]
+        rows = ['name', 'type_selector'] + CREATOR_FIELDS[card_type]
+        x = self.card_name_input_x
+        width = self.card_name_input_width
+        top = self.card_name_input_y
+        for field_name, widget in self.creator_inputs.items():
+            widget.visible = field_name in rows
+            if widget.visible:
+                row_y = top + rows.index(field_name) * self.spacing
+                widget.set_rect(x, row_y + TextInput.LABEL_HEIGHT, width, self.card_name_input_height)
+        self.type_selector.set_rect(x, top + rows.index('type_selector') * self.spacing, width, 32)
+        submit_y = top + len(rows) * self.spacing
+        self.submit_button.set_rect(x, submit_y, width, 32)
+        # Panel bottom = submit button bottom + padding
+        self.creator_panel.set_rect(x - 8, top - 8, width + 16, submit_y + 32 + 12 - (top - 8))
+        self.ui.invalidate_layout()
+    
+    def _on_card_type_changed(self, card_type):
+        """Show the fields of the newly selected card type."""
+        self.card_type_index = CARD_TYPES.index(card_type)
+        self._layout_card_creator()
+    
+    def _creator_value(self, field_name):
+        """Get the text typed into a Card Creator field."""
+        return self.creator_inputs[field_name].value
+    
+    def _draw_to_hand(self):
+        """Draw the top card of the deck into the hand, if any."""
+        before = self._card_states(self.table_deck.cards[:1])
+        drawn = self.table_deck.draw_card()
+        if drawn is not None:
+            self._remove_from_table(drawn)
+            if drawn in self.hand_cards:
+                self.hand_cards.remove(drawn)
+            self.hand_cards.append(drawn)
+            self.hand_layout.invalidate()
+            self._record_op("draw", before)
 
     def handle_events(self):
-        """Process all input events."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            
+        """Process this frame's input events through the dispatch tables."""
+        events = self.input_handler.poll_events()
+        if events:
+            self.needs_redraw = True
+        handlers = self._event_handlers
+        for event in events:
             # Update input handler
             self.input_handler.update(event)
             
-            # Handle mouse clicks on cards
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mx, my = event.pos
-                input_w = self.card_name_input_width
-                input_h = self.card_name_input_height
-                base_x = self.card_name_input_x
-                handled = False
-                
-                # Check card type selector (dropdown)
-                type_selector_y = self._get_field_y_position('type_selector')
-                if type_selector_y is not None:
-                    if (base_x <= mx <= base_x + input_w and
-                        type_selector_y <= my <= type_selector_y + 32):
-                        # Cycle through card types
-                        self.card_type_index = (self.card_type_index + 1) % len(CARD_TYPES)
-                        self.input_focus = None
-                        handled = True
-                
-                if not handled:
-                    # Check all visible fields
-                    visible_fields = self._get_visible_fields()
-                    for field_name in visible_fields:
-                        if field_name == 'type_selector':
-                            continue
-                        field_y = self._get_field_y_position(field_name)
-                        if field_y is not None:
-                            if (base_x <= mx <= base_x + input_w and
-                                field_y + 18 <= my <= field_y + 18 + input_h):
-                                self.input_focus = field_name
-                                handled = True
-                                break
-                
-                if not handled:
-                    # Check Submit button
-                    visible_fields = self._get_visible_fields()
-                    submit_y = self.card_name_input_y + len(visible_fields) * self.spacing
-                    submit_w = self.card_name_input_width
-                    submit_h = 32
-                    if (base_x <= mx <= base_x + submit_w and
-                        submit_y <= my <= submit_y + submit_h):
-                        self._submit_creator_inputs()
-                        handled = True
-                
-                if not handled:
-                    # Draw button click
-                    if (self.draw_btn_x <= mx <= self.draw_btn_x + self.draw_btn_width and
-                        self.draw_btn_y <= my <= self.draw_btn_y + self.draw_btn_height):
-                        # Draw top card into hand if available
-                        drawn = self.table_deck.draw_card()
-                        if drawn is not None:
-                            if drawn in self.cards:
-                                self.cards.remove(drawn)
-                            if drawn in self.hand_cards:
-                                self.hand_cards.remove(drawn)
-                            self.hand_cards.append(drawn)
-                        # Do not start dragging when clicking button
-                        handled = True
-                
-                if not handled:
-                    # Check which card was clicked
-                    for card in reversed(self.cards + self.hand_cards):  # Check from top to bottom
-                        if card.is_point_inside(*event.pos):
-                            self.input_handler.start_drag(card)
-                            # Clear input focus when clicking on cards
-                            self.input_focus = None
-                            handled = True
-                            break
-                
-                if not handled:
-                    # Clicking elsewhere clears focus
-                    self.input_focus = None
-            
-            # Handle right-click on cards in hand to move to in-play area
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:  # Right mouse button
-                # Check if a card in hand was right-clicked
-                for card in reversed(self.hand_cards):  # Check from top to bottom
-                    if card.is_point_inside(*event.pos):
-                        # Remove from hand
-                        self.hand_cards.remove(card)
-                        # Position in center of play area
-                        center_x = self.play_area_x + self.play_area_width // 2 - card.width // 2
-                        center_y = self.play_area_y + self.play_area_height // 2 - card.height // 2
-                        card.set_position(center_x, center_y)
-                        # Add to in-play area (cards list)
-                        self.cards.append(card)
-                        break
+            # Card browser and deck viewer take keyboard and wheel input while open
+            if self.show_card_browser and self._handle_card_browser_event(event):
+                continue
+            if self.view_deck_debug and self._handle_deck_view_event(event):
+                continue
             
-            # Handle flip on 'F' key while hovering a card
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_f:
-                # Avoid flipping while dragging a card
-                if not self.input_handler.dragged_card:
-                    mouse_pos = pygame.mouse.get_pos()
-                    for card in reversed(self.cards):  # Top-most first
-                        if card.is_point_inside(*mouse_pos):
-                            card.flip()
-                            break
-
-            # Handle dropping onto the deck area
-            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                released = self.input_handler.released_card
-                if released is not None:
-                    mx, my = pygame.mouse.get_pos()
-                    if (self.deck_x <= mx <= self.deck_x + self.deck_width and
-                        self.deck_y <= my <= self.deck_y + self.deck_height):
-                        # Remove from table if present
-                        if released in self.cards:
-                            self.cards.remove(released)
-                        if released in self.hand_cards:
-                            self.hand_cards.remove(released)
-                        # Snap to deck position
-                        released.set_position(self.deck_x, self.deck_y)
-                        # Place on top of deck
-                        self.table_deck.add_to_top(released)
-                    elif (self.hand_x <= mx <= self.hand_x + self.hand_width and
-                          self.hand_y <= my <= self.hand_y + self.hand_height):
-                        # Drop into player hand
-                        if released in self.cards:
-                            self.cards.remove(released)
-                        if released in self.hand_cards:
-                            self.hand_cards.remove(released)
-                        self.hand_cards.append(released)
-                        # Positioning handled by layout in update()
-                    # Clear the released reference
-                    self.input_handler.released_card = None
-
-            # Debug: show deck contents while holding V over deck
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_v:
-                mx, my = pygame.mouse.get_pos()
-                self.view_deck_debug = (
-                    self.deck_x <= mx <= self.deck_x + self.deck_width and
-                    self.deck_y <= my <= self.deck_y + self.deck_height
-                )
-            if event.type == pygame.KEYUP and event.key == pygame.K_v:
-                self.view_deck_debug = False
+            # Widgets get first pick of clicks and of keys while an input has focus
+            if self.ui.dispatch(event):
+                continue
             
-            # Typing into upper-right inputs when focused
-            if event.type == pygame.KEYDOWN and self.input_focus is not None:
-                # Helper to get/set value by focus key
-                def get_val():
-                    field_map = {
-                        'name': self.card_name_input,
-                        'level': self.level_input,
-                        'class': self.class_input,
-                        'strength': self.strength_input,
-                        'agility': self.agility_input,
-                        'intelligence': self.intelligence_input,
-                        'wisdom': self.wisdom_input,
-                        'strength_mod': self.strength_mod_input,
-                        'agility_mod': self.agility_mod_input,
-                        'intelligence_mod': self.intelligence_mod_input,
-                        'wisdom_mod': self.wisdom_mod_input,
-                        'strength_req': self.strength_req_input,
-                        'agility_req': self.agility_req_input,
-                        'intelligence_req': self.intelligence_req_input,
-                        'wisdom_req': self.wisdom_req_input,
-                        'strength_def': self.strength_def_input,
-                        'agility_def': self.agility_def_input,
-                        'intelligence_def': self.intelligence_def_input,
-                        'wisdom_def': self.wisdom_def_input,
-                        'hit_points': self.hit_points_input,
-                        'special_rules': self.special_rules_input,
-                    }
-                    return field_map.get(self.input_focus, "")
-                
-                def set_val(v):
-                    if self.input_focus == 'name': self.card_name_input = v
-                    elif self.input_focus == 'level': self.level_input = v
-                    elif self.input_focus == 'class': self.class_input = v
-                    elif self.input_focus == 'strength': self.strength_input = v
-                    elif self.input_focus == 'agility': self.agility_input = v
-                    elif self.input_focus == 'intelligence': self.intelligence_input = v
-                    elif self.input_focus == 'wisdom': self.wisdom_input = v
-                    elif self.input_focus == 'strength_mod': self.strength_mod_input = v
-                    elif self.input_focus == 'agility_mod': self.agility_mod_input = v
-                    elif self.input_focus == 'intelligence_mod': self.intelligence_mod_input = v
-                    elif self.input_focus == 'wisdom_mod': self.wisdom_mod_input = v
-                    elif self.input_focus == 'strength_req': self.strength_req_input = v
-                    elif self.input_focus == 'agility_req': self.agility_req_input = v
-                    elif self.input_focus == 'intelligence_req': self.intelligence_req_input = v
-                    elif self.input_focus == 'wisdom_req': self.wisdom_req_input = v
-                    elif self.input_focus == 'strength_def': self.strength_def_input = v
-                    elif self.input_focus == 'agility_def': self.agility_def_input = v
-                    elif self.input_focus == 'intelligence_def': self.intelligence_def_input = v
-                    elif self.input_focus == 'wisdom_def': self.wisdom_def_input = v
-                    elif self.input_focus == 'hit_points': self.hit_points_input = v
-                    elif self.input_focus == 'special_rules': self.special_rules_input = v
-                
-                current = get_val()
-                if event.key == pygame.K_BACKSPACE:
-                    set_val(current[:-1])
-                elif event.key == pygame.K_RETURN:
-                    # Ignore submit behavior for now
-                    pass
-                else:
-                    if event.unicode:
-                        # Text fields: name, class, special_rules
-                        if self.input_focus in ['name', 'class', 'special_rules']:
-                            max_len = 30 if self.input_focus == 'name' else 100
-                            if len(current) < max_len:
-                                set_val(current + event.unicode)
-                        # Numeric fields
-                        else:
-                            if event.unicode.isdigit() or (event.unicode == '-' and len(current) == 0):
-                                max_len = 3
-                                if len(current) < max_len:
-                                    set_val(current + event.unicode)
+            handler = handlers.get(event.type)
+            if handler is not None:
+                handler(event)
+    
+    def _build_event_handlers(self):
+        """Create the event-type and key dispatch tables used by handle_events."""
+        self._event_handlers = {
+            pygame.QUIT: self._on_quit,
+            pygame.MOUSEBUTTONDOWN: self._on_mouse_down,
+            pygame.MOUSEBUTTONUP: self._on_mouse_up,
+            pygame.MOUSEMOTION: self._on_mouse_motion,
+            pygame.MOUSEWHEEL: self._on_mouse_wheel,
+            pygame.KEYDOWN: self._on_key_down,
+        }
+        self._button_down_handlers = {
+            1: self._on_left_click,
+            2: self._on_middle_click,
+            3: self._on_right_click,
+        }
+        self._net_handlers = {
+            "welcome": self._on_net_welcome,
+            "op": self._on_net_op,
+            "reject": self._on_net_reject,
+            "drag": self._on_net_drag,
+            "seats": self._on_net_seats,
+            "closed": self._on_net_closed,
+        }
+        self._key_handlers = {
+            pygame.K_LEFT: self._on_pan_key,
+            pygame.K_RIGHT: self._on_pan_key,
+            pygame.K_UP: self._on_pan_key,
+            pygame.K_DOWN: self._on_pan_key,
+            pygame.K_f: self._on_flip_key,
+            pygame.K_v: self._on_deck_view_key,
+            pygame.K_b: self._on_card_browser_key,
+            pygame.K_a: self._on_ai_key,
+            pygame.K_F3: self._on_profiler_key,
+            pygame.K_F4: self._on_trace_key,
+            pygame.K_F7: self._on_memory_key,
+            pygame.K_F8: self._on_memory_key,
+            pygame.K_z: self._on_undo_key,
+            pygame.K_y: self._on_undo_key,
+            pygame.K_HOME: self._on_undo_key,
+            pygame.K_F5: self._on_save_key,
+            pygame.K_F9: self._on_save_key,
+        }
+    
+    def _on_quit(self, event):
+        """Stop the main loop."""
+        self.running = False
+    
+    def _on_mouse_down(self, event):
+        """Route a mouse press by button."""
+        handler = self._button_down_handlers.get(event.button)
+        if handler is not None:
+            handler(event)
+    
+    def _on_left_click(self, event):
+        """Grab a card (or the selection it belongs to), toggle it with Shift, or start a rubber band."""
+        mx, my = event.pos
+        shift = self.input_handler.shift_down
+        # Check which card was clicked (hand cards sit above the table)
+        card = self._hand_card_at(mx, my)
+        if card is not None:
+            self._set_selection(())
+            self._drag_before = self._card_states([card])
+            self.input_handler.start_drag(card)
+            self.hand_layout.invalidate()
+            return
+        card = self._table_card_at(mx, my)
+        if card is not None and shift:
+            # Shift-click toggles a card in the selection
+            self._set_selection(self.selection ^ {card})
+        elif card is not None:
+            if card not in self.selection:
+                self._set_selection((card,))
+            # The whole selection moves with the grabbed card, keeping stacking order
+            group = None
+            if len(self.selection) > 1:
+                group = sorted(self.selection, key=self.table_index.stamp_of)
+            self._drag_before = self._card_states(group or [card])
+            self._lift_table_cards(group or [card])
+            self.input_handler.start_drag(card, self.camera.screen_to_world, group)
+        elif self.camera.contains_screen_point(mx, my):
+            # Empty table: start a selection rectangle
+            self.rubber_band = (mx, my)
+            if not shift:
+                self._set_selection(())
+        else:
+            self._set_selection(())
+    
+    def _on_middle_click(self, event):
+        """Start panning the camera when pressed over the table."""
+        self.panning = self.camera.contains_screen_point(*event.pos)
+    
+    def _on_right_click(self, event):
+        """Move a right-clicked hand card to the center of the visible play area."""
+        card = self._hand_card_at(*event.pos)
+        if card is not None:
+            before = self._card_states([card])
+            # Remove from hand
+            self.hand_cards.remove(card)
+            self.hand_layout.invalidate()
+            # Position in center of the visible play area
+            center_x, center_y = self.camera.screen_to_world(
+                self.play_area_x + self.play_area_width // 2,
+                self.play_area_y + self.play_area_height // 2)
+            card.set_position(int(center_x) - card.width // 2,
+                              int(center_y) - card.height // 2)
+            # Add to in-play area (cards list)
+            self._add_to_table(card)
+            self._record_op("move", before)
+    
+    def _on_mouse_up(self, event):
+        """Stop panning, drop dragged cards, or finish a selection rectangle."""
+        if event.button == 2:
+            self.panning = False
+        elif event.button == 1:
+            released = self.input_handler.released_cards
+            if released:
+                self._drop_cards(released, self.input_handler.mouse_x, self.input_handler.mouse_y)
+                self.input_handler.released_cards = []
+                if self._drag_before is not None:
+                    moved = self._record_op("move", self._drag_before)
+                    if not moved and self.net is not None:
+                        # Dropped where it started: tell others to put their previews back
+                        ids = [card.card_id for card, state in self._drag_before
+                               if state is not None and state[0] == "table"]
+                        if ids:
+                            self.net.send_drag(ids, 0, 0, end=True)
+                    self._drag_before = None
+            elif self.rubber_band is not None:
+                self._select_in_rect(*self.rubber_band, *event.pos, self.input_handler.shift_down)
+                self.rubber_band = None
+    
+    def _on_mouse_motion(self, event):
+        """Pan the camera during a middle-button drag."""
+        if self.panning:
+            self.camera.pan(-event.rel[0], -event.rel[1])
+    
+    def _on_mouse_wheel(self, event):
+        """Zoom the camera at the cursor."""
+        mx, my = self.input_handler.mouse_x, self.input_handler.mouse_y
+        if self.camera.contains_screen_point(mx, my):
+            self.camera.zoom_at(event.y, mx, my)
+    
+    def _on_key_down(self, event):
+        """Route a key press through the key table."""
+        handler = self._key_handlers.get(event.key)
+        if handler is not None:
+            handler(event)
+    
+    def _on_pan_key(self, event):
+        """Pan the camera with the arrow keys."""
+        if self.ui.focus is not None:
+            return
+        step = 120
+        dx = {pygame.K_LEFT: -step, pygame.K_RIGHT: step}.get(event.key, 0)
+        dy = {pygame.K_UP: -step, pygame.K_DOWN: step}.get(event.key, 0)
+        self.camera.pan(dx, dy)
+    
+    def _on_flip_key(self, event):
+        """Flip the table card under the cursor (not while dragging)."""
+        if not self.input_handler.dragged_card:
+            card = self._table_card_at(self.input_handler.mouse_x, self.input_handler.mouse_y)
+            if card is not None:
+                before = self._card_states([card])
+                card.flip()
+                self._record_op("flip", before)
+    
+    def _on_undo_key(self, event):
+        """Ctrl+Z undoes, Ctrl+Y or Ctrl+Shift+Z redoes, Ctrl+Home undoes the whole history window."""
+        if not event.mod & pygame.KMOD_CTRL:
+            return
+        if event.key == pygame.K_HOME:
+            self.undo(len(self.history))
+        elif event.key == pygame.K_y or event.mod & pygame.KMOD_SHIFT:
+            self.redo()
+        else:
+            self.undo()
+    
+    def _on_deck_view_key(self, event):
+        """Debug: open the deck contents viewer with V over the deck."""
+        if self.ui.focus is not None:
+            return
+        mx, my = self.input_handler.mouse_x, self.input_handler.mouse_y
+        if (self.deck_x <= mx <= self.deck_x + self.deck_width and
+            self.deck_y <= my <= self.deck_y + self.deck_height):
+            self.view_deck_debug = True
+            self.show_card_browser = False
+            self.deck_view.set_filter("")
+    
+    def _on_card_browser_key(self, event):
+        """Open the card browser with B."""
+        if self.ui.focus is not None:
+            return
+        self.show_card_browser = True
+        self.view_deck_debug = False
+        self.card_browser.set_filter("")
+    
+    def _on_ai_key(self, event):
+        """Let the computer player take over the hand, deck and table with A (again to stop)."""
+        if self.ui.focus is not None:
+            return
+        self.ai_enabled = not self.ai_enabled
+        if self.ai_enabled and self.ai is None:
+            self.ai = AIPlayer()
+        self._next_ai_move = time.monotonic()
+    
+    def _on_profiler_key(self, event):
+        """Profiler: F3 toggles the overlay."""
+        self.profiler.toggle()
+    
+    def _on_memory_key(self, event):
+        """Memory: F7 toggles tracking and its overlay, F8 writes a report."""
+        if event.key == pygame.K_F7:
+            self.memory.toggle()
+        elif self.memory.enabled:
+            self.memory.dump("memory_report.txt")
+    
+    def _memory_zones(self):
+        """Memory probe: the cards on the table, in the hand and in the decks, and the decks."""
+        decks = [self.table_deck, self.created_cards_deck]
+        cards = dict.fromkeys(self.cards)
+        cards.update(dict.fromkeys(self.hand_cards))
+        cards.update(dict.fromkeys(self.lifted_cards))
+        for deck in decks:
+            cards.update(dict.fromkeys(deck.cards))
+        return zone_usage(list(cards), decks)
+    
+    def _on_save_key(self, event):
+        """Save-games: F5 quicksaves, F9 quickloads."""
+        if event.key == pygame.K_F5:
+            self.save_game("quicksave")
+        else:
+            self.load_game("quicksave")
+    
+    def _on_trace_key(self, event):
+        """Profiler: F4 dumps recorded frame traces."""
+        if self.profiler.traces:
+            self.profiler.dump_trace("frame_trace.jsonl")
+    
+    def _handle_card_browser_event(self, event):
+        """
+        Route an event to the open card browser.
+        
+        Typing edits the query, the wheel, arrow keys and PageUp/PageDown
+        scroll, clicking a result shows that card, and Escape closes the
+        browser.
+        
+        Args:
+            event: Pygame event
+        
+        Returns:
+            True if the browser consumed the event
+        """
+        view = self.card_browser
+        if event.type == pygame.MOUSEWHEEL:
+            view.scroll_by(-event.y * 3)
+            return True
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            card = view.card_at(self.card_browser_x, self.card_browser_y, *event.pos)
+            if card is not None:
+                self._show_card(card)
+                return True
+            return False
+        if event.type != pygame.KEYDOWN or event.mod & pygame.KMOD_CTRL:
+            return False
+        if event.key == pygame.K_ESCAPE:
+            self.show_card_browser = False
+        elif event.key == pygame.K_PAGEDOWN:
+            view.page(1)
+        elif event.key == pygame.K_PAGEUP:
+            view.page(-1)
+        elif event.key == pygame.K_DOWN:
+            view.scroll_by(1)
+        elif event.key == pygame.K_UP:
+            view.scroll_by(-1)
+        elif event.key == pygame.K_BACKSPACE:
+            view.set_filter(view.filter_text[:-1])
+        elif event.unicode and event.unicode.isprintable():
+            view.set_filter(view.filter_text + event.unicode)
+        else:
+            return False
+        return True
+    
+    def _show_card(self, card):
+        """Center the camera on a table card and select it."""
+        if card in self.table_index:
+            self.camera.center_on(card.x + card.width / 2, card.y + card.height / 2)
+            self._set_selection((card,))
+    
+    def _handle_deck_view_event(self, event):
+        """
+        Route an event to the open deck viewer.
+        
+        Wheel and PageUp/PageDown scroll, Home/End jump to the ends, typing
+        filters by name, Enter on a number jumps to that position, and V or
+        Escape closes the viewer.
+        
+        Args:
+            event: Pygame event
+        
+        Returns:
+            True if the viewer consumed the event
+        """
+        view = self.deck_view
+        if event.type == pygame.MOUSEWHEEL:
+            view.scroll_by(-event.y * 3)
+            return True
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key in (pygame.K_ESCAPE, pygame.K_v):
+            self.view_deck_debug = False
+        elif event.key == pygame.K_PAGEDOWN:
+            view.page(1)
+        elif event.key == pygame.K_PAGEUP:
+            view.page(-1)
+        elif event.key == pygame.K_HOME:
+            view.jump_to(self.table_deck, 0)
+        elif event.key == pygame.K_END:
+            view.jump_to(self.table_deck, self.table_deck.size())
+        elif event.key == pygame.K_DOWN:
+            view.scroll_by(1)
+        elif event.key == pygame.K_UP:
+            view.scroll_by(-1)
+        elif event.key == pygame.K_BACKSPACE:
+            view.set_filter(view.filter_text[:-1])
+        elif event.key == pygame.K_RETURN:
+            if view.filter_text.isdigit():
+                position = int(view.filter_text)
+                view.set_filter("")
+                view.jump_to(self.table_deck, max(0, position - 1))
+        elif event.unicode and event.unicode.isprintable():
+            view.set_filter(view.filter_text + event.unicode)
+        else:
+            return False
+        return True
     
     def update(self):
         """Update game state."""
-        # Update card positions
+        # Dragged cards are lifted out of the index; only the group translation changes
         self.input_handler.update_drag()
+        if self.net is not None:
+            self._share_drag()
+        if self.persist and time.monotonic() >= self._next_autosave:
+            self._next_autosave = time.monotonic() + self.autosave_interval
+            self.save_game("autosave")
         
         # Reset click flag
         self.input_handler.reset_click()
         
-        # Update card hover states
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        for card in self.cards + self.hand_cards:
+        # Update card hover states (table cards via the spatial index)
+        mouse_x, mouse_y = self.input_handler.mouse_x, self.input_handler.mouse_y
+        for card in self.hand_cards:
             card.hovered = card.is_point_inside(mouse_x, mouse_y)
+        hovered = set()
+        if self.camera.contains_screen_point(mouse_x, mouse_y):
+            hovered.update(self.table_index.query_point(*self.camera.screen_to_world(mouse_x, mouse_y)))
+        for card in self.hovered_cards - hovered:
+            card.hovered = False
+        for card in hovered:
+            card.hovered = True
+        self.hovered_cards = hovered
         
         # Layout hand cards
         self._layout_hand()
 
-    def _layout_hand(self):
-        """Arrange cards in the player's hand neatly centered along the hand area."""
-        if not self.hand_cards:
+    def _ai_state(self):
+        """Get the computer player's view of the game: (search state, Character rows)."""
+        characters, score = read_table(self.cards)
+        state = make_state(characters, self.hand_cards, self.table_deck.cards, score, self.ai.horizon)
+        return state, characters
+    
+    def _step_ai(self):
+        """
+        Play the computer player's move once its search is done, then start the next search.
+        
+        Searches run on worker processes; this only polls. A result is
+        dropped if the cards changed while it was being searched.
+        
+        Returns:
+            True if a move was made
+        """
+        if self.input_handler.dragged_card is not None or self.lifted_cards:
+            return False
+        ai = self.ai
+        move = ai.poll()
+        if move is not None:
+            state, characters = self._ai_state()
+            if state != ai.state:
+                return False
+            self._apply_ai_move(move, characters)
+            self._next_ai_move = time.monotonic() + self.ai_move_delay
+            return True
+        if not ai.thinking() and time.monotonic() >= self._next_ai_move:
+            if not ai.start(self._ai_state()[0]):
+                self.ai_enabled = False  # Nothing left to play
+        return False
+    
+    def _apply_ai_move(self, move, characters):
+        """
+        Carry out a move of the computer player as a normal, undoable operation.
+        
+        Args:
+            move: Move from AIPlayer
+            characters: Character rows the move's indices refer to
+        """
+        if move[0] == "draw":
+            self._draw_to_hand()
             return
-        card_width = self.hand_cards[0].width
-        card_height = self.hand_cards[0].height
-        available_width = self.hand_width - 20
-        count = len(self.hand_cards)
-        if count == 1:
-            gap = 0
+        card = next(card for card in self.hand_cards if profile(card) == move[1])
+        before = self._card_states([card])
+        if move[0] == "play":
+            x, y = self._free_table_spot(card)
         else:
-            gap = (available_width - count * card_width) / (count - 1)
-            gap = max(10, min(30, gap))
-        total_width = count * card_width + (count - 1) * gap
-        start_x = self.hand_x + (self.hand_width - total_width) / 2
-        y = self.hand_y + (self.hand_height - card_height) / 2
-        for idx, card in enumerate(self.hand_cards):
-            if card.dragging:
-                # Skip positioning dragged cards
-                continue
-            x = start_x + idx * (card_width + gap)
-            card.set_position(int(x), int(y))
+            # Upgrades and resolved Plans/Skills are tucked onto their Character
+            _, character, stacked = characters[move[2]]
+            x, y = character.x, character.y + ATTACH_OFFSET * (stacked % ATTACH_ROWS + 1)
+        self.hand_cards.remove(card)
+        card.set_position(x, y)
+        self._add_to_table(card)
+        self.hand_layout.invalidate()
+        self._record_op("move", before)
+    
+    def _free_table_spot(self, card):
+        """Find a visible table position where a card and the cards stacked on it overlap nothing."""
+        view_x, view_y, view_width, view_height = self.camera.visible_world_rect()
+        height = card.height + ATTACH_OFFSET * ATTACH_ROWS
+        y = view_y + 20
+        while y + height <= view_y + view_height:
+            x = view_x + 20
+            while x + card.width <= view_x + view_width:
+                if not self.table_index.query_rect(x, y, card.width, height):
+                    return int(x), int(y)
+                x += card.width + 20
+            y += height + 20
+        return int(view_x + (view_width - card.width) / 2), int(view_y + (view_height - card.height) / 2)
+    
+    def _layout_hand(self):
+        """Arrange cards in the player's hand neatly centered along the hand area."""
+        # Cheap when the hand is unchanged; cards then tween into their slots
+        if self.hand_layout.update(self.hand_cards):
+            self.needs_redraw = True
     
     def render(self):
         """Render the game."""
+        profiler = self.profiler
+        renderer = self.renderer
+        profiler.start("render")
+        renderer.begin_frame()
+        profiler.start("render.areas")
         # Clear screen
         self.screen.fill((40, 40, 40))
         
@@ -418,134 +1362,95 @@ class Game:
         
         # Render the hand area (background)
         self.renderer.render_hand_area(self.hand_x, self.hand_y, self.hand_width, self.hand_height)
+        profiler.stop("render.areas")
 
-        # Render all cards
-        for card in self.cards:
-            self.renderer.render_card(card)
+        # Render table cards inside the viewport, culled through the spatial index
+        profiler.start("render.cards")
+        camera = self.camera
+        self.screen.set_clip(camera.viewport)
+        # Each card layer is submitted as a single Surface.blits() call
+        renderer.begin_batch()
+        for card in self.table_index.query_rect(*camera.visible_world_rect()):
+            sx, sy = camera.world_to_screen(card.x, card.y)
+            renderer.render_card_at(card, int(sx), int(sy), camera.zoom)
+        renderer.flush()
+        if self.rubber_band is not None:
+            x0, y0 = self.rubber_band
+            x1, y1 = self.input_handler.mouse_x, self.input_handler.mouse_y
+            pygame.draw.rect(self.screen, (255, 200, 0),
+                             (min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0)), 1)
+        self.screen.set_clip(None)
+        profiler.stop("render.cards")
         # Render hand cards on top of hand area
+        profiler.start("render.hand")
+        renderer.begin_batch()
         for card in self.hand_cards:
-            self.renderer.render_card(card)
+            if not card.dragging:
+                renderer.render_card(card)
+        renderer.flush()
+        profiler.stop("render.hand")
         
+        profiler.start("render.ui")
+        # UI labels are queued and drawn above their boxes when the layer flushes
+        renderer.begin_batch()
         # Render the deck pile
         self.renderer.render_deck_pile(self.table_deck, self.deck_x, self.deck_y,
                                        self.deck_width, self.deck_height)
-        # Render draw button under deck
-        self.renderer.render_button(
-            self.draw_btn_x, self.draw_btn_y, self.draw_btn_width, self.draw_btn_height,
-            "Draw", enabled=not self.table_deck.is_empty()
-        )
-        
-        # Render Card Creator panel
-        visible_fields = self._get_visible_fields()
-        panel_x = self.card_name_input_x - 8
-        panel_y = self.card_name_input_y - 8
-        panel_w = self.card_name_input_width + 16
-        # Bottom = submit button top + button height + padding
-        panel_h = (self.card_name_input_y + len(visible_fields) * self.spacing + 32 + 12) - panel_y
-        self.renderer.render_panel_with_title(panel_x, panel_y, panel_w, panel_h, "Card Creator")
-
-        # Render card type selector
-        type_selector_y = self._get_field_y_position('type_selector')
-        if type_selector_y is not None:
-            self.renderer.render_button(
-                self.card_name_input_x,
-                type_selector_y,
-                self.card_name_input_width,
-                32,
-                f"Type: {CARD_TYPES[self.card_type_index]}",
-                enabled=True
-            )
+        # Running deck statistics beside the pile (the deck viewer takes this spot when open)
+        if not (self.view_deck_debug or self.show_card_browser or self.table_deck.is_empty()):
+            self.renderer.render_deck_stats(self.table_deck.stats,
+                                            self.deck_x + self.deck_width + 12, self.deck_y)
+        # Draw button and Card Creator
+        self.ui.render(renderer)
         
-        # Render fields based on card type
-        field_labels = {
-            'name': 'Card Name',
-            'level': 'Level',
-            'class': 'Class',
-            'strength': 'Strength',
-            'agility': 'Agility',
-            'intelligence': 'Intelligence',
-            'wisdom': 'Wisdom',
-            'strength_mod': 'Strength Mod',
-            'agility_mod': 'Agility Mod',
-            'intelligence_mod': 'Intelligence Mod',
-            'wisdom_mod': 'Wisdom Mod',
-            'strength_req': 'Strength Req',
-            'agility_req': 'Agility Req',
-            'intelligence_req': 'Intelligence Req',
-            'wisdom_req': 'Wisdom Req',
-            'strength_def': 'Strength Def',
-            'agility_def': 'Agility Def',
-            'intelligence_def': 'Intelligence Def',
-            'wisdom_def': 'Wisdom Def',
-            'hit_points': 'Hit Points',
-            'special_rules': 'Special Rules',
-        }
+        renderer.flush()
         
-        field_values = {
-            'name': self.card_name_input,
-            'level': self.level_input,
-            'class': self.class_input,
-            'strength': self.strength_input,
-            'agility': self.agility_input,
-            'intelligence': self.intelligence_input,
-            'wisdom': self.wisdom_input,
-            'strength_mod': self.strength_mod_input,
-            'agility_mod': self.agility_mod_input,
-            'intelligence_mod': self.intelligence_mod_input,
-            'wisdom_mod': self.wisdom_mod_input,
-            'strength_req': self.strength_req_input,
-            'agility_req': self.agility_req_input,
-            'intelligence_req': self.intelligence_req_input,
-            'wisdom_req': self.wisdom_req_input,
-            'strength_def': self.strength_def_input,
-            'agility_def': self.agility_def_input,
-            'intelligence_def': self.intelligence_def_input,
-            'wisdom_def': self.wisdom_def_input,
-            'hit_points': self.hit_points_input,
-            'special_rules': self.special_rules_input,
-        }
+        # Dragged cards are drawn above everything else, unclipped, at the
+        # group's translation: the rest of the group in its stacking order
+        # (bottom first), then the grabbed card on top
+        handler = self.input_handler
+        if handler.dragged_card is not None:
+            dx, dy = handler.drag_dx, handler.drag_dy
+            renderer.begin_batch()
+            for card in handler.drag_group[1:] + handler.drag_group[:1]:
+                if card in self.lifted_cards:
+                    sx, sy = camera.world_to_screen(card.x + dx, card.y + dy)
+                    renderer.render_card_at(card, int(sx), int(sy), camera.zoom)
+                else:
+                    renderer.render_card_at(card, card.x + dx, card.y + dy, 1.0)
+            renderer.flush()
+        profiler.stop("render.ui")
         
-        for field_name in visible_fields:
-            if field_name == 'type_selector':
-                continue
-            field_y = self._get_field_y_position(field_name)
-            if field_y is not None:
-                label = field_labels.get(field_name, field_name)
-                value = field_values.get(field_name, "")
-                self.renderer.render_text_input(
-                    self.card_name_input_x,
-                    field_y,
-                    self.card_name_input_width,
-                    self.card_name_input_height,
-                    label,
-                    value,
-                    self.input_focus == field_name
-                )
-        
-        # Render Submit button
-        submit_y = self.card_name_input_y + len(visible_fields) * self.spacing
-        self.renderer.render_button(
-            self.card_name_input_x,
-            submit_y,
-            self.card_name_input_width,
-            32,
-            "Submit",
-            enabled=True
-        )
-        
-        # Render debug list if hovering deck and V is held
+        # Render deck contents viewer when open
         if self.view_deck_debug:
-            mx, my = pygame.mouse.get_pos()
-            if (self.deck_x <= mx <= self.deck_x + self.deck_width and
-                self.deck_y <= my <= self.deck_y + self.deck_height):
-                self.renderer.render_deck_debug_list(
-                    self.table_deck,
-                    self.deck_x + self.deck_width + 12,
-                    self.deck_y
-                )
+            profiler.start("render.debug")
+            self.renderer.render_deck_debug_list(
+                self.table_deck,
+                self.deck_x + self.deck_width + 12,
+                self.deck_y,
+                self.deck_view
+            )
+            profiler.stop("render.debug")
+        
+        # Render the card browser when open
+        if self.show_card_browser:
+            self.renderer.render_card_browser(self.card_browser, self.card_browser_x, self.card_browser_y)
+            self._render_card_preview()
+        
+        # Render profiler overlay last so it sits above everything
+        if profiler.show_overlay:
+            self.renderer.render_profiler_overlay(profiler, self.hand_x + 8, self.play_area_y + 8)
+        if self.memory.show_overlay:
+            self.renderer.render_memory_overlay(self.memory, self.hand_x + 376, self.play_area_y + 8)
+        
+        profiler.count("blits", renderer.frame_blits)
+        profiler.count("blit_calls", renderer.frame_batches)
+        profiler.stop("render")
         
         # Update display
+        profiler.start("flip")
         pygame.display.flip()
+        profiler.stop("flip")
 
     def _submit_creator_inputs(self):
         """Create a new Card from the upper-right inputs and add to table."""
@@ -555,78 +1460,189 @@ class Game:
             except Exception:
                 return 0
         
-        name = self.card_name_input.strip() or "Card"
+        name = self._creator_value("name").strip() or "Card"
         card_type = CARD_TYPES[self.card_type_index]
         attrs = {}
         
         # Collect attributes based on card type
         if card_type == "Character":
-            attrs["level"] = to_int(self.level_input)
-            attrs["class"] = self.class_input.strip()
-            attrs["strength"] = to_int(self.strength_input)
-            attrs["agility"] = to_int(self.agility_input)
-            attrs["intelligence"] = to_int(self.intelligence_input)
-            attrs["wisdom"] = to_int(self.wisdom_input)
-            attrs["special_rules"] = self.special_rules_input.strip()
+            attrs["level"] = to_int(self._creator_value("level"))
+            attrs["class"] = self._creator_value("class").strip()
+            attrs["strength"] = to_int(self._creator_value("strength"))
+            attrs["agility"] = to_int(self._creator_value("agility"))
+            attrs["intelligence"] = to_int(self._creator_value("intelligence"))
+            attrs["wisdom"] = to_int(self._creator_value("wisdom"))
+            attrs["special_rules"] = self._creator_value("special_rules").strip()
         elif card_type == "Upgrade":
-            attrs["level"] = to_int(self.level_input)
-            attrs["strength_mod"] = to_int(self.strength_mod_input)
-            attrs["agility_mod"] = to_int(self.agility_mod_input)
-            attrs["intelligence_mod"] = to_int(self.intelligence_mod_input)
-            attrs["wisdom_mod"] = to_int(self.wisdom_mod_input)
-            attrs["special_rules"] = self.special_rules_input.strip()
+            attrs["level"] = to_int(self._creator_value("level"))
+            attrs["strength_mod"] = to_int(self._creator_value("strength_mod"))
+            attrs["agility_mod"] = to_int(self._creator_value("agility_mod"))
+            attrs["intelligence_mod"] = to_int(self._creator_value("intelligence_mod"))
+            attrs["wisdom_mod"] = to_int(self._creator_value("wisdom_mod"))
+            attrs["special_rules"] = self._creator_value("special_rules").strip()
         elif card_type == "Plan":
-            attrs["strength_req"] = to_int(self.strength_req_input)
-            attrs["agility_req"] = to_int(self.agility_req_input)
-            attrs["intelligence_req"] = to_int(self.intelligence_req_input)
-            attrs["wisdom_req"] = to_int(self.wisdom_req_input)
-            attrs["special_rules"] = self.special_rules_input.strip()
+            attrs["strength_req"] = to_int(self._creator_value("strength_req"))
+            attrs["agility_req"] = to_int(self._creator_value("agility_req"))
+            attrs["intelligence_req"] = to_int(self._creator_value("intelligence_req"))
+            attrs["wisdom_req"] = to_int(self._creator_value("wisdom_req"))
+            attrs["special_rules"] = self._creator_value("special_rules").strip()
         elif card_type == "Skill":
-            attrs["strength_req"] = to_int(self.strength_req_input)
-            attrs["agility_req"] = to_int(self.agility_req_input)
-            attrs["intelligence_req"] = to_int(self.intelligence_req_input)
-            attrs["wisdom_req"] = to_int(self.wisdom_req_input)
-            attrs["special_rules"] = self.special_rules_input.strip()
+            attrs["strength_req"] = to_int(self._creator_value("strength_req"))
+            attrs["agility_req"] = to_int(self._creator_value("agility_req"))
+            attrs["intelligence_req"] = to_int(self._creator_value("intelligence_req"))
+            attrs["wisdom_req"] = to_int(self._creator_value("wisdom_req"))
+            attrs["special_rules"] = self._creator_value("special_rules").strip()
         elif card_type == "Location":
-            attrs["level"] = to_int(self.level_input)
-            attrs["strength_def"] = to_int(self.strength_def_input)
-            attrs["agility_def"] = to_int(self.agility_def_input)
-            attrs["intelligence_def"] = to_int(self.intelligence_def_input)
-            attrs["wisdom_def"] = to_int(self.wisdom_def_input)
-            attrs["hit_points"] = to_int(self.hit_points_input)
-            attrs["special_rules"] = self.special_rules_input.strip()
+            attrs["level"] = to_int(self._creator_value("level"))
+            attrs["strength_def"] = to_int(self._creator_value("strength_def"))
+            attrs["agility_def"] = to_int(self._creator_value("agility_def"))
+            attrs["intelligence_def"] = to_int(self._creator_value("intelligence_def"))
+            attrs["wisdom_def"] = to_int(self._creator_value("wisdom_def"))
+            attrs["hit_points"] = to_int(self._creator_value("hit_points"))
+            attrs["special_rules"] = self._creator_value("special_rules").strip()
         elif card_type == "Encounter":
-            attrs["strength_def"] = to_int(self.strength_def_input)
-            attrs["agility_def"] = to_int(self.agility_def_input)
-            attrs["intelligence_def"] = to_int(self.intelligence_def_input)
-            attrs["wisdom_def"] = to_int(self.wisdom_def_input)
-            attrs["hit_points"] = to_int(self.hit_points_input)
-            attrs["special_rules"] = self.special_rules_input.strip()
+            attrs["strength_def"] = to_int(self._creator_value("strength_def"))
+            attrs["agility_def"] = to_int(self._creator_value("agility_def"))
+            attrs["intelligence_def"] = to_int(self._creator_value("intelligence_def"))
+            attrs["wisdom_def"] = to_int(self._creator_value("wisdom_def"))
+            attrs["hit_points"] = to_int(self._creator_value("hit_points"))
+            attrs["special_rules"] = self._creator_value("special_rules").strip()
         
         new_card = Card(name, card_type=card_type, **attrs)
-        # Place to the right of the deck at deck Y
-        place_x = self.deck_x + self.deck_width + 20
-        place_y = self.deck_y
-        new_card.set_position(place_x, place_y)
-        self.cards.append(new_card)
+        # Place near the top-left of the visible play area
+        place_x, place_y = self.camera.screen_to_world(self.play_area_x + 20, self.play_area_y + 40)
+        new_card.set_position(int(place_x), int(place_y))
+        self._add_to_table(new_card)
         
         # Add to persistent created-cards deck and save immediately
         self.created_cards_deck.add_card(new_card)
-        self.deck_manager.save_deck(self.created_cards_deck)
+        self.card_index.add(new_card)
+        if self.persist:
+            self.deck_manager.save_deck(self.created_cards_deck)
+        self._record_op("create", [(new_card, None)])
     
-    def run(self):
-        """Main game loop."""
-        while self.running:
-            self.handle_events()
-            self.update()
+    def _render_card_preview(self):
+        """Show the thumbnail of the card browser row under the cursor beside the panel."""
+        mouse_x, mouse_y = self.input_handler.mouse_x, self.input_handler.mouse_y
+        card = self.card_browser.card_at(self.card_browser_x, self.card_browser_y, mouse_x, mouse_y)
+        if card is None:
+            return
+        thumbnail = self.thumbnails.card_thumbnail(card)
+        if thumbnail is not None:
+            x = self.card_browser_x + self.card_browser.panel_width + 8
+            y = min(mouse_y, self.screen_height - thumbnail.get_height())
+            self.renderer.render_thumbnail(thumbnail, x, y)
+    
+    def is_active(self):
+        """
+        Check whether the loop should keep running at full frame rate.
+        
+        Returns:
+            True while dragging, typing, animating, loading art or faces, showing live stats
+            or while the computer player is on
+        """
+        return (self.input_handler.dragged_card is not None or
+                self.rubber_band is not None or
+                self.panning or
+                self.ui.focus is not None or
+                self.animations_active() or
+                self.prewarmer.busy() or
+                self.assets.busy() or
+                self.thumbnails.busy() or
+                self.ai_enabled or
+                self.profiler.show_overlay or
+                self.memory.show_overlay)
+    
+    def animations_active(self):
+        """Check whether any time-based animation is in progress."""
+        return self.hand_layout.is_animating()
+    
+    def simulate(self, dt):
+        """
+        Advance time-based simulation state by one fixed tick.
+        
+        Args:
+            dt: Tick length in seconds
+        """
+        self.sim_ticks += 1
+        # All hand tweens advance together in one batched pass
+        if self.hand_layout.step(dt):
+            self.needs_redraw = True
+    
+    def step(self):
+        """Run a single frame: events, simulation ticks, update and render if needed."""
+        profiler = self.profiler
+        profiler.start("events")
+        self.handle_events()
+        profiler.stop("events")
+        profiler.start("update")
+        dt = self.scheduler.step_ms / 1000.0
+        for _ in range(self.input_handler.simulation_steps(self.scheduler)):
+            self.simulate(dt)
+        self.update()
+        # Swap in card art and faces finished by the background workers
+        if self.assets.publish():
+            self.needs_redraw = True
+        if self.prewarmer.publish():
+            self.needs_redraw = True
+        if self.thumbnails.publish():
+            self.needs_redraw = True
+        if self.net is not None and self._apply_network():
+            self.needs_redraw = True
+        if self.ai_enabled and self._step_ai():
+            self.needs_redraw = True
+        if self.memory.end_frame():
+            self.needs_redraw = True
+        profiler.stop("update")
+        # Skip drawing entirely when nothing on screen could have changed
+        if self.needs_redraw or self.is_active():
             self.render()
-            self.clock.tick(60)  # Cap at 60 FPS
+            self.needs_redraw = False
+        if self.input_handler.replay_finished():
+            self.running = False
+    
+    def run(self, throttle=True):
+        """
+        Main game loop.
+        
+        Args:
+            throttle: Cap the frame rate and sleep when idle (disable for unthrottled replays)
+        """
+        profiler = self.profiler
+        scheduler = self.scheduler
+        while self.running:
+            if throttle and not self.is_active():
+                # Idle: block until input arrives instead of spinning
+                event = scheduler.wait_for_event()
+                if event is not None:
+                    self.input_handler.pending_events.append(event)
+            profiler.begin_frame()
+            self.step()
+            if throttle:
+                self.clock.tick(scheduler.max_fps)  # Cap at 60 FPS
+            profiler.end_frame()
+        
+        self.save_game("autosave")
+        self.prewarmer.shutdown()
+        self.assets.shutdown()
+        self.thumbnails.shutdown()
+        if self.ai is not None:
+            self.ai.shutdown()
+        if self.net is not None:
+            self.net.close()
+        if self.memory_report:
+            self.memory.dump(self.memory_report)
+        
+        # Write the input recording if one was requested
+        if self.input_handler.recorder is not None:
+            self.input_handler.recorder.save(self.record_path)
         
         # Save created cards before exiting
-        try:
-            self.deck_manager.save_deck(self.created_cards_deck)
-        except Exception:
-            pass
+        if self.persist:
+            try:
+                self.deck_manager.save_deck(self.created_cards_deck)
+            except Exception:
+                pass
         
         pygame.quit()
         sys.exit()
@@ -634,8 +1650,28 @@ class Game:
 
 def main():
     """Entry point."""
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Paper Adventures card game")
+    parser.add_argument("--record", metavar="FILE", help="Record the input stream to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="Replay a recorded input stream")
+    parser.add_argument("--headless", action="store_true",
+                        help="Use the SDL dummy video driver (no window)")
+    parser.add_argument("--seed", type=int, help="RNG seed for the session")
+    parser.add_argument("--connect", metavar="ADDRESS",
+                        help="Join a table server (host:port or unix:/path)")
+    parser.add_argument("--memory-report", metavar="FILE",
+                        help="Track memory for the whole session and write a report to FILE on exit")
+    parser.add_argument("--load", metavar="SLOT",
+                        help="Start from a save slot (e.g. quicksave or autosave)")
+    args = parser.parse_args()
+    
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    game = Game(record_path=args.record, replay_path=args.replay, seed=args.seed,
+                connect=args.connect, memory_report=args.memory_report)
+    if args.load and not game.load_game(args.load):
+        parser.error(f"no save in slot: {args.load}")
+    # Replays run unthrottled so they can double as profiling workloads
+    game.run(throttle=args.replay is None)
 
 
 if __name__ == "__main__":
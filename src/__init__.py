@@ -7,6 +7,7 @@ from .deck import Deck
 from .renderer import CardRenderer
 from .input_handler import InputHandler
 from .deck_manager import DeckManager
+from .profiler import FrameProfiler
 
-__all__ = ['Card', 'Deck', 'CardRenderer', 'InputHandler', 'DeckManager']
+__all__ = ['Card', 'Deck', 'CardRenderer', 'InputHandler', 'DeckManager', 'FrameProfiler']
 
@@ -0,0 +1,442 @@
+"""
+Computer player: Monte Carlo tree search on worker processes.
+
+The table itself enforces no rules, so the AI plays by a small model of
+the game built from the card attributes:
+
+- draw: take the top card of the deck (its order is unknown to the AI)
+- play: put a Character, Location or Encounter from the hand on the table
+- attach: put an Upgrade on a Character; its mods add to the stats
+- resolve: play a Plan or Skill on a Character whose stats meet every
+  requirement, scoring 1 + the sum of the requirements
+
+On the table, an Upgrade (or resolved Plan/Skill) belongs to the Character
+its top-left corner lies on; Plans and Skills on the table count as
+resolved. A move is scored by the points it leads to over the next
+`horizon` moves, points scored sooner counting slightly more.
+
+Search states are plain tuples with cards reduced to what matters (type
+and numbers), so equal cards are interchangeable and the same position
+reached by different move orders is one entry in a transposition table.
+Every worker process searches the same position with its own random
+stream for the move budget (root parallelization) and the visit counts
+are summed, so the game loop only polls for the result.
+
+Usage:
+    python -m src.ai_player MyDeck --moves 20 --budget 0.1
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import time
+from bisect import insort
+from concurrent.futures import ProcessPoolExecutor
+
+from .deck_manager import DeckManager
+
+STATS = ("strength", "agility", "intelligence", "wisdom")
+ATTACH_OFFSET = 24  # Pixels each card stacked on a Character is shifted down
+# Stacked cards cycle through this many offsets, keeping each top-left corner
+# on the Character (read_table counts a card as stacked by that corner)
+ATTACH_ROWS = 4
+HORIZON = 12
+BUDGET = 0.1  # Seconds per move
+EXPLORATION = 1.4
+# Points scored with more moves left count this much more per move, so that
+# with a rolling horizon the AI scores now rather than forever next move
+EARLY_BONUS = 0.02
+TABLE_LIMIT = 200000  # Transposition table entries kept by a worker between moves
+
+_PLAYABLE = ("Character", "Location", "Encounter")
+_RESOLVABLE = ("Plan", "Skill")
+
+# Transposition table of the worker process: state -> [visits, moves, edge visits, edge values]
+_TABLE = {}
+
+
+def _number(value):
+    """Read a numeric attribute that may be missing or malformed as an int."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def profile(card):
+    """
+    Reduce a card to what the rules look at.
+
+    Returns:
+        (card_type, n1, n2, n3, n4) with the stats, mods or requirements in
+        STATS order, or (card_type,) for cards without numbers
+    """
+    attributes = card.attributes
+    card_type = card.card_type
+    if card_type == "Character":
+        suffix = ""
+    elif card_type == "Upgrade":
+        suffix = "_mod"
+    elif card_type in _RESOLVABLE:
+        suffix = "_req"
+    else:
+        return (card_type,)
+    return (card_type,) + tuple(_number(attributes.get(stat + suffix)) for stat in STATS)
+
+
+def points(card_profile):
+    """Get the score for resolving a Plan or Skill."""
+    return 1 + sum(max(0, value) for value in card_profile[1:])
+
+
+def read_table(table_cards):
+    """
+    Work out the Characters on the table and what is stacked on them.
+
+    Args:
+        table_cards: Cards on the table
+
+    Returns:
+        (characters, score): characters is a list of (stats, card, stacked)
+        sorted by stats as in search states, stacked being the number of
+        cards on it; score is the points of the Plans and Skills in play
+    """
+    characters = [card for card in table_cards if card.card_type == "Character"]
+    stats = {card: list(profile(card)[1:]) for card in characters}
+    stacked = {card: 0 for card in characters}
+    score = 0
+    for card in table_cards:
+        if card.card_type in _RESOLVABLE:
+            score += points(profile(card))
+        if card.card_type not in _RESOLVABLE and card.card_type != "Upgrade":
+            continue
+        for character in characters:
+            if character.is_point_inside(card.x, card.y):
+                stacked[character] += 1
+                if card.card_type == "Upgrade":
+                    mods = profile(card)[1:]
+                    stats[character] = [value + mod for value, mod in zip(stats[character], mods)]
+                break
+    rows = sorted(((tuple(stats[card]), card, stacked[card]) for card in characters),
+                  key=lambda row: (row[0], row[1].card_id))
+    return rows, score
+
+
+def make_state(characters, hand_cards, deck_cards, score=0, horizon=HORIZON):
+    """
+    Build a search state.
+
+    Args:
+        characters: Rows from read_table()
+        hand_cards: Cards in the hand
+        deck_cards: Cards in the deck (only which cards, not their order)
+        score: Points scored so far
+        horizon: Moves left to look ahead
+
+    Returns:
+        Hashable (hand, deck, characters, score, moves_left) tuple
+    """
+    return (tuple(sorted(profile(card) for card in hand_cards)),
+            tuple(sorted(profile(card) for card in deck_cards)),
+            tuple(stats for stats, _, _ in characters),
+            score,
+            horizon)
+
+
+def legal_moves(state):
+    """
+    List the moves possible in a state.
+
+    Returns:
+        List of moves: ("draw",), ("play", card), ("attach", card, index)
+        or ("resolve", card, index), where index is the Character's
+        position in the state; Characters with equal stats are offered once
+    """
+    hand, deck, characters, _, moves_left = state
+    if not moves_left:
+        return []
+    moves = [("draw",)] if deck else []
+    targets = [index for index, stats in enumerate(characters)
+               if index == 0 or stats != characters[index - 1]]
+    previous = None
+    for card in hand:
+        if card == previous:
+            continue
+        previous = card
+        card_type = card[0]
+        if card_type in _PLAYABLE:
+            moves.append(("play", card))
+        elif card_type == "Upgrade":
+            moves.extend(("attach", card, index) for index in targets)
+        elif card_type in _RESOLVABLE:
+            needs = card[1:]
+            moves.extend(("resolve", card, index) for index in targets
+                         if all(have >= need for have, need in zip(characters[index], needs)))
+    return moves
+
+
+def apply_move(state, move, rng):
+    """
+    Get the state after a move; draws take a random card of the deck.
+
+    Returns:
+        New state tuple
+    """
+    hand, deck, characters, score, moves_left = state
+    kind = move[0]
+    if kind == "draw":
+        index = rng.randrange(len(deck))
+        hand = list(hand)
+        insort(hand, deck[index])
+        return (tuple(hand), deck[:index] + deck[index + 1:], characters, score, moves_left - 1)
+    card = move[1]
+    hand = list(hand)
+    hand.remove(card)
+    hand = tuple(hand)
+    if kind == "play":
+        if card[0] == "Character":
+            characters = tuple(sorted(characters + (card[1:],)))
+    elif kind == "attach":
+        changed = list(characters)
+        changed[move[2]] = tuple(value + mod for value, mod in zip(characters[move[2]], card[1:]))
+        characters = tuple(sorted(changed))
+    else:
+        score += points(card)
+    return (hand, deck, characters, score, moves_left - 1)
+
+
+def _reward(state, after):
+    """Get the search value of the points scored by one move."""
+    return (after[3] - state[3]) * (1 + EARLY_BONUS * state[4])
+
+
+def _rollout(state, rng):
+    """Play random moves to the horizon and return the value gained."""
+    gained = 0.0
+    while True:
+        moves = legal_moves(state)
+        if not moves:
+            return gained
+        after = apply_move(state, rng.choice(moves), rng)
+        gained += _reward(state, after)
+        state = after
+
+
+def _iterate(root, rng, table, exploration, scale):
+    """
+    Run one selection, expansion, rollout and backup pass.
+
+    Values are what was gained after each node, so table entries stay
+    valid whatever position they are reached from.
+
+    Returns:
+        Value gained from the root
+    """
+    path = []
+    state = root
+    gained = 0.0
+    while True:
+        entry = table.get(state)
+        if entry is None:
+            moves = legal_moves(state)
+            table[state] = [0, moves, [0] * len(moves), [0.0] * len(moves)]
+            gained += _rollout(state, rng)
+            break
+        visits, moves, edge_visits, edge_values = entry
+        if not moves:
+            break
+        best = 0
+        best_value = -1.0
+        log_visits = math.log(visits + 1)
+        for index, count in enumerate(edge_visits):
+            if not count:
+                best = index
+                break
+            value = edge_values[index] / count / scale + exploration * math.sqrt(log_visits / count)
+            if value > best_value:
+                best = index
+                best_value = value
+        path.append((entry, best, gained))
+        after = apply_move(state, moves[best], rng)
+        gained += _reward(state, after)
+        state = after
+    for entry, index, before in path:
+        entry[0] += 1
+        entry[2][index] += 1
+        entry[3][index] += gained - before
+    return gained
+
+
+def search(state, budget=BUDGET, seed=None, exploration=EXPLORATION, iterations=None):
+    """
+    Search a state in this process (runs on the workers).
+
+    Args:
+        state: State from make_state()
+        budget: Seconds to search
+        seed: Seed of this search's random stream
+        exploration: UCT exploration constant
+        iterations: Stop after this many iterations instead (ignores budget)
+
+    Returns:
+        (edges, iterations): edges is a list of (move, visits, total value)
+        for the state's moves
+    """
+    if len(_TABLE) > TABLE_LIMIT:
+        _TABLE.clear()
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + budget
+    done = 0
+    scale = 1.0
+    while iterations is None or done < iterations:
+        gained = _iterate(state, rng, _TABLE, exploration, scale)
+        # Keep values and exploration on comparable scales
+        scale = max(scale, gained)
+        done += 1
+        if iterations is None and not done % 16 and time.perf_counter() >= deadline:
+            break
+    _, moves, edge_visits, edge_values = _TABLE[state]
+    return list(zip(moves, edge_visits, edge_values)), done
+
+
+def _ready():
+    """Worker start-up task, so the first real search does not pay for it."""
+    return os.getpid()
+
+
+class AIPlayer:
+    """Runs move searches on a process pool; the game starts one and polls for the move."""
+
+    def __init__(self, workers=None, budget=BUDGET, horizon=HORIZON, exploration=EXPLORATION):
+        """
+        Initialize the player and start its worker processes.
+
+        Args:
+            workers: Worker processes searching each move (defaults to the CPU count)
+            budget: Seconds of search per move
+            horizon: Moves looked ahead
+            exploration: UCT exploration constant
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.budget = budget
+        self.horizon = horizon
+        self.exploration = exploration
+        # The game runs worker threads, which makes forking it unsafe
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        for _ in range(self.workers):
+            self._executor.submit(_ready)
+        self._rng = random.Random()
+        self._futures = []
+        self.state = None  # State being searched
+        self.iterations = 0  # Iterations summed over workers for the last move
+
+    def start(self, state):
+        """
+        Start searching a state on every worker.
+
+        Returns:
+            False if the state has no legal move
+        """
+        if not legal_moves(state):
+            return False
+        self.state = state
+        self._futures = [self._executor.submit(search, state, self.budget,
+                                               self._rng.getrandbits(32), self.exploration)
+                         for _ in range(self.workers)]
+        return True
+
+    def thinking(self):
+        """Check whether a search is running."""
+        return bool(self._futures)
+
+    def poll(self):
+        """
+        Get the chosen move once every worker has finished; never blocks.
+
+        Returns:
+            Move, or None while searching (or if nothing was started)
+        """
+        if not self._futures or not all(future.done() for future in self._futures):
+            return None
+        futures = self._futures
+        self._futures = []
+        return self._combine([future.result() for future in futures])
+
+    def choose(self, state):
+        """
+        Search a state and wait for the move (for tools and tests, not the game loop).
+
+        Returns:
+            Move, or None if the state has no legal move
+        """
+        if not self.start(state):
+            return None
+        futures = self._futures
+        self._futures = []
+        return self._combine([future.result() for future in futures])
+
+    def shutdown(self):
+        """Stop the worker processes, dropping any search in progress."""
+        self._futures = []
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _combine(self, results):
+        """Sum visit counts over the workers and pick the most visited move."""
+        visits = {}
+        values = {}
+        self.iterations = 0
+        for edges, iterations in results:
+            self.iterations += iterations
+            for move, count, value in edges:
+                visits[move] = visits.get(move, 0) + count
+                values[move] = values.get(move, 0.0) + value
+        return max(visits, key=lambda move: (visits[move], values[move]))
+
+
+def main(argv=None):
+    """Command-line entry point: the AI plays a shuffled saved deck alone and reports its score."""
+    parser = argparse.ArgumentParser(description="Let the AI play a saved deck")
+    parser.add_argument("deck", help="Saved deck name")
+    parser.add_argument("--data-dir", default="data", help="Directory with saved decks")
+    parser.add_argument("--moves", type=int, default=20, help="Moves to play (default 20)")
+    parser.add_argument("--budget", type=float, default=BUDGET, help="Seconds per move (default 0.1)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, help="Seed for the deck shuffle and draws")
+    args = parser.parse_args(argv)
+
+    deck = DeckManager(args.data_dir).load_deck(args.deck)
+    if deck is None:
+        parser.error(f"deck not found: {args.deck}")
+    rng = random.Random(args.seed)
+    cards = [profile(card) for card in deck.cards]
+    rng.shuffle(cards)
+    # The AI sees which cards the deck holds, never their order
+    state = ((), tuple(sorted(cards)), (), 0, args.moves)
+    player = AIPlayer(workers=args.workers, budget=args.budget, horizon=args.moves)
+    try:
+        while True:
+            start = time.perf_counter()
+            move = player.choose(state)
+            if move is None:
+                break
+            elapsed = (time.perf_counter() - start) * 1000
+            if move[0] == "draw":
+                drawn = cards.pop()
+                hand = list(state[0])
+                insort(hand, drawn)
+                deck_left = list(state[1])
+                deck_left.remove(drawn)
+                state = (tuple(hand), tuple(deck_left), state[2], state[3], state[4] - 1)
+            else:
+                state = apply_move(state, move, rng)
+            print(f"{elapsed:6.1f} ms {player.iterations:7} iterations  score {state[3]:4}  {move}")
+    finally:
+        player.shutdown()
+    print(f"final score {state[3]} after {args.moves - state[4]} moves")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Asynchronous loading of card artwork with a memory-bounded LRU cache.
+"""
+
+import os
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+
+class AssetLoader:
+    """Decodes images on worker threads and keeps display-ready copies in an LRU cache."""
+
+    def __init__(self, asset_dir="assets", max_bytes=64 * 1024 * 1024, workers=2):
+        """
+        Initialize the asset loader.
+
+        Args:
+            asset_dir: Directory image names are resolved against
+            max_bytes: Memory budget for cached images
+            workers: Number of decoding threads
+        """
+        self.asset_dir = asset_dir
+        self.max_bytes = max_bytes
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-load")
+        self._cache = OrderedDict()  # (name, size) -> display-format Surface
+        self._pending = set()
+        self._missing = set()  # Keys that failed to load; never retried
+        self._ready = queue.Queue()  # Decoded images waiting for the main thread
+        self.used_bytes = 0
+        self.evictions = 0
+
+    def get(self, name, size):
+        """
+        Get an image pre-scaled to a size, starting an async load if needed.
+
+        Args:
+            name: File name relative to the asset directory
+            size: (width, height) the image is scaled to
+
+        Returns:
+            Surface, or None while loading or if the image is missing
+        """
+        key = (name, size)
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            return surface
+        if key not in self._pending and key not in self._missing:
+            self._pending.add(key)
+            self._executor.submit(self._load, key)
+        return None
+
+    def peek(self, name, size):
+        """
+        Get a cached image without touching LRU order or starting a load.
+
+        Safe to call from worker threads (e.g. face pre-warming).
+        """
+        return self._cache.get((name, size))
+
+    def is_missing(self, name, size):
+        """Check whether an image failed to load."""
+        return (name, size) in self._missing
+
+    def busy(self):
+        """Check whether any image is still loading or waiting to be published."""
+        return bool(self._pending)
+
+    def publish(self):
+        """
+        Convert decoded images to display format and cache them. Must run on the main thread.
+
+        Returns:
+            Set of image names that became available
+        """
+        published = set()
+        while True:
+            try:
+                key, surface = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(key)
+            if surface is None:
+                self._missing.add(key)
+                continue
+            if pygame.display.get_surface() is not None:
+                if surface.get_flags() & pygame.SRCALPHA:
+                    surface = surface.convert_alpha()
+                else:
+                    surface = surface.convert()
+            self._store(key, surface)
+            published.add(key[0])
+        return published
+
+    def clear(self):
+        """Drop every cached image and forget failed loads."""
+        self._cache.clear()
+        self._missing.clear()
+        self.used_bytes = 0
+
+    def shutdown(self):
+        """Cancel queued loads and wait for running workers to finish."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+
+    def memory_usage(self):
+        """Get (images, bytes) held by the cache."""
+        return len(self._cache), self.used_bytes
+
+    def _store(self, key, surface):
+        """Insert an image and evict least recently used ones over the byte budget."""
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self.used_bytes -= self._surface_bytes(old)
+        self._cache[key] = surface
+        self.used_bytes += self._surface_bytes(surface)
+        while self.used_bytes > self.max_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self.used_bytes -= self._surface_bytes(evicted)
+            self.evictions += 1
+
+    @staticmethod
+    def _surface_bytes(surface):
+        """Get the pixel memory held by a surface."""
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def _load(self, key):
+        """Worker: decode and pre-scale one image, then hand it to the main thread."""
+        name, size = key
+        surface = None
+        try:
+            path = os.path.join(self.asset_dir, name)
+            if os.path.isfile(path):
+                image = pygame.image.load(path)
+                if image.get_size() != size:
+                    if image.get_bitsize() < 24:
+                        # smoothscale needs 24/32-bit surfaces (e.g. paletted PNGs)
+                        expanded = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+                        expanded.blit(image, (0, 0))
+                        image = expanded
+                    image = pygame.transform.smoothscale(image, size)
+                surface = image
+        except (pygame.error, OSError, ValueError):
+            surface = None
+        finally:
+            self._ready.put((key, surface))
@@ -0,0 +1,137 @@
+"""
+Camera mapping the virtual table (world coordinates) onto the on-screen play area.
+"""
+
+# Discrete zoom steps so cached card surfaces can be pre-scaled per level
+ZOOM_LEVELS = [0.25, 0.35, 0.5, 0.7, 1.0, 1.4, 2.0]
+
+
+class Camera:
+    """Pan/zoom view of a large virtual table shown through a screen viewport."""
+
+    def __init__(self, viewport, world_width=8000, world_height=6000):
+        """
+        Initialize the camera.
+
+        World coordinates initially coincide with screen coordinates inside
+        the viewport, so positions saved before the camera existed still
+        show up where they used to.
+
+        Args:
+            viewport: (x, y, width, height) screen rectangle the table is drawn in
+            world_width: Width of the virtual table
+            world_height: Height of the virtual table
+        """
+        self.viewport = viewport
+        self.world_width = world_width
+        self.world_height = world_height
+        self.zoom_index = ZOOM_LEVELS.index(1.0)
+        self.zoom = 1.0
+        # World coordinates shown at the viewport's top-left corner
+        self.offset_x = viewport[0]
+        self.offset_y = viewport[1]
+        # Incremented whenever the view changes so dependents can cache
+        self.version = 0
+
+    def world_to_screen(self, x, y):
+        """Convert a world position to screen coordinates."""
+        vx, vy = self.viewport[0], self.viewport[1]
+        return (vx + (x - self.offset_x) * self.zoom,
+                vy + (y - self.offset_y) * self.zoom)
+
+    def screen_to_world(self, sx, sy):
+        """Convert a screen position to world coordinates."""
+        vx, vy = self.viewport[0], self.viewport[1]
+        return (self.offset_x + (sx - vx) / self.zoom,
+                self.offset_y + (sy - vy) / self.zoom)
+
+    def contains_screen_point(self, sx, sy):
+        """Check whether a screen point lies inside the viewport."""
+        vx, vy, vw, vh = self.viewport
+        return vx <= sx <= vx + vw and vy <= sy <= vy + vh
+
+    def visible_world_rect(self):
+        """
+        Get the area of the world currently visible.
+
+        Returns:
+            (x, y, width, height) in world coordinates
+        """
+        return (self.offset_x, self.offset_y,
+                self.viewport[2] / self.zoom, self.viewport[3] / self.zoom)
+
+    def pan(self, dx, dy):
+        """
+        Move the view by a screen-space distance.
+
+        Args:
+            dx, dy: Distance in screen pixels (positive moves the view right/down)
+        """
+        self.offset_x += dx / self.zoom
+        self.offset_y += dy / self.zoom
+        self._clamp()
+        self.version += 1
+
+    def center_on(self, x, y):
+        """
+        Move the view so a world position is in the middle of the viewport.
+
+        Args:
+            x, y: World position
+        """
+        self.offset_x = x - self.viewport[2] / self.zoom / 2
+        self.offset_y = y - self.viewport[3] / self.zoom / 2
+        self._clamp()
+        self.version += 1
+
+    def get_view(self):
+        """
+        Get the current view for saving.
+
+        Returns:
+            [offset_x, offset_y, zoom_index]
+        """
+        return [self.offset_x, self.offset_y, self.zoom_index]
+
+    def set_view(self, view):
+        """
+        Restore a view returned by get_view().
+
+        Args:
+            view: [offset_x, offset_y, zoom_index]
+        """
+        self.offset_x, self.offset_y, self.zoom_index = view
+        self.zoom = ZOOM_LEVELS[self.zoom_index]
+        self._clamp()
+        self.version += 1
+
+    def zoom_at(self, steps, sx, sy):
+        """
+        Change zoom by a number of levels, keeping a screen point fixed.
+
+        Args:
+            steps: Positive to zoom in, negative to zoom out
+            sx, sy: Screen point that should stay over the same world position
+
+        Returns:
+            True if the zoom level changed
+        """
+        new_index = max(0, min(len(ZOOM_LEVELS) - 1, self.zoom_index + steps))
+        if new_index == self.zoom_index:
+            return False
+        wx, wy = self.screen_to_world(sx, sy)
+        self.zoom_index = new_index
+        self.zoom = ZOOM_LEVELS[new_index]
+        vx, vy = self.viewport[0], self.viewport[1]
+        self.offset_x = wx - (sx - vx) / self.zoom
+        self.offset_y = wy - (sy - vy) / self.zoom
+        self._clamp()
+        self.version += 1
+        return True
+
+    def _clamp(self):
+        """Keep the view inside the world bounds."""
+        view_w = self.viewport[2] / self.zoom
+        view_h = self.viewport[3] / self.zoom
+        self.offset_x = max(0, min(self.offset_x, max(0, self.world_width - view_w)))
+        self.offset_y = max(0, min(self.offset_y, max(0, self.world_height - view_h)))
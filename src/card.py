@@ -9,18 +9,36 @@ CARD_TYPES = ["Character", "Upgrade", "Plan", "Skill", "Location", "Encounter"]
 class Card:
     """Represents a single card with customizable attributes."""
     
-    def __init__(self, name, card_type="Character", **attributes):
+    _next_id = 1  # Next automatically assigned card_id
+    
+    def __init__(self, name, card_type="Character", card_id=None, **attributes):
         """
         Initialize a card.
         
         Args:
             name: The card's identifier/name
             card_type: Type of card (Character, Upgrade, Plan, Skill, Location, Encounter)
+            card_id: Persistent unique id (a new one is assigned if not given)
             **attributes: Custom attributes for the card
         """
+        # The counter is only written when it moves, so cards with lower ids
+        # (such as previews built on worker threads) leave it alone
+        if card_id is None:
+            card_id = Card._next_id
+            Card._next_id = card_id + 1
+        elif card_id >= Card._next_id:
+            Card._next_id = card_id + 1
+        self.card_id = card_id
         self.name = name
         self.card_type = card_type
         self.attributes = attributes
+        # Incremented when displayed content changes so renderers can cache faces
+        self.version = 0
+        # Objects told about attribute changes (e.g. decks keeping running stats),
+        # once per add_observer() call; observers remove themselves when they let
+        # the card go. The list is created on the first add_observer() and kept,
+        # so moving a card in and out of a deck does not reallocate it
+        self.observers = None
         
         # Initialize type-specific attributes with defaults
         self._initialize_type_attributes()
@@ -89,6 +107,11 @@ class Card:
             self.attributes.setdefault("hit_points", 0)
             self.attributes.setdefault("special_rules", "")
     
+    @classmethod
+    def reserve_ids(cls, start):
+        """Make new cards take ids from start upward (e.g. a per-client id range)."""
+        cls._next_id = max(cls._next_id, start)
+    
     def update_rect(self):
         """Update the card's rectangle for collision detection."""
         self.rect = (self.x, self.y, self.width, self.height)
@@ -111,12 +134,30 @@ class Card:
         return self.attributes.get(key, default)
     
     def set_attribute(self, key, value):
-        """Set a custom attribute value."""
+        """Set a custom attribute value and notify observers."""
+        old = self.attributes.get(key)
         self.attributes[key] = value
+        self.version += 1
+        if self.observers:
+            for observer in list(dict.fromkeys(self.observers)):
+                observer.card_attribute_changed(self, key, old, value)
+    
+    def add_observer(self, observer):
+        """Tell an object about attribute changes; an object added twice stays until removed twice."""
+        if self.observers is None:
+            self.observers = [observer]
+        else:
+            self.observers.append(observer)
+    
+    def remove_observer(self, observer):
+        """Undo one add_observer call."""
+        if self.observers and observer in self.observers:
+            self.observers.remove(observer)
     
     def flip(self):
         """Flip the card (face up/down)."""
         self.face_up = not self.face_up
+        self.version += 1
     
     def __str__(self):
         attrs_str = ", ".join(f"{k}={v}" for k, v in self.attributes.items())
@@ -0,0 +1,433 @@
+"""
+In-memory search index over a card collection.
+"""
+
+import re
+from bisect import bisect_left, bisect_right, insort
+
+# Free-text attributes indexed alongside the card name
+TEXT_ATTRIBUTES = ("class", "special_rules")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_RANGE_RE = re.compile(r"^([a-z_]+)(>=|<=|>|<|=|:)(-?[0-9]+(?:\.[0-9]+)?)(?:\.\.(-?[0-9]+(?:\.[0-9]+)?))?$")
+_INF = float("inf")
+
+# Results smaller than 1/SPARSE_RATIO of the index are sorted outright rather than scanned for
+SPARSE_RATIO = 32
+# Search terms matching up to this many times the remaining candidates are intersected with them
+INTERSECT_RATIO = 4
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric search tokens."""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def _number(text):
+    """Parse an int or float query value."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+class SearchResults:
+    """Matching card ids, put in card_id (creation) order only as far as pages are read.
+
+    Results describe the index as it was searched; search again once its
+    version changes.
+    """
+
+    def __init__(self, index, ids):
+        """
+        Initialize the result set.
+
+        Args:
+            index: CardIndex the ids belong to
+            ids: Set of matching card ids
+        """
+        self._index = index
+        self._ids = ids
+        self._head = []  # The first matches in card_id order, extended as pages are read
+        self._scanned = 0  # Position in the index's id order the head was read up to
+
+    def __len__(self):
+        return len(self._ids)
+
+    def page(self, start, count):
+        """
+        Get one page of matching cards.
+
+        Pages already read are sliced from the ordered head, so a view can
+        ask for the same page every frame.
+
+        Args:
+            start: Position of the first result
+            count: Maximum number of results
+
+        Returns:
+            List of Card objects
+        """
+        end = start + count
+        if end > len(self._head) and len(self._head) < len(self._ids):
+            self._extend(end)
+        cards = self._index.cards
+        return [cards[card_id] for card_id in self._head[start:end]]
+
+    def _extend(self, end):
+        """Order at least end matches (or all of them) into the head."""
+        ids = self._ids
+        order = self._index._order
+        if len(ids) * SPARSE_RATIO < len(order):
+            # Few matches: sorting them beats walking the whole id order
+            self._head = sorted(ids)
+            return
+        # Many matches: walk the index's sorted ids, keeping those that match,
+        # in chunks sized to yield about twice what was asked for
+        head = self._head
+        wanted = max(2 * end, 64)
+        while len(head) < wanted and self._scanned < len(order):
+            chunk = (wanted - len(head)) * len(order) // len(ids) + 64
+            head.extend(filter(ids.__contains__, order[self._scanned:self._scanned + chunk]))
+            self._scanned += chunk
+
+
+class CardIndex:
+    """Token, type and numeric-range indexes over cards, kept current as cards change.
+
+    Numeric attributes are kept in sorted (value, card_id) lists both over
+    all cards and per card type, so a type filter combined with a range is
+    a single slice. The index observes each card, so set_attribute
+    re-indexes just that card.
+    """
+
+    def __init__(self, observe=True):
+        """
+        Initialize an empty index.
+
+        Args:
+            observe: Watch indexed cards for attribute changes; a throwaway
+                index must not, since cards hold on to their observers
+        """
+        self.observe = observe
+        self.cards = {}  # card_id -> Card
+        self._order = []  # Sorted card_ids, for paging through results in order
+        self._postings = {}  # token -> set of card_ids
+        self._tokens = []  # Sorted distinct tokens, for prefix lookups
+        self._card_tokens = {}  # card_id -> tokens the card is indexed under
+        self._types = {}  # lowercase card_type -> set of card_ids
+        # attribute or (lowercase card_type, attribute) -> sorted list of (value, card_id)
+        self._numeric = {}
+        self._card_numeric = {}  # card_id -> [(attribute, value)] the card is indexed under
+        # Incremented on every change so views can cache results
+        self.version = 0
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __contains__(self, card):
+        return self.cards.get(card.card_id) is card
+
+    def add(self, card):
+        """Index a card (ignored if it is already indexed)."""
+        if card.card_id in self.cards:
+            return
+        self.cards[card.card_id] = card
+        insort(self._order, card.card_id)
+        self._index(card)
+        if self.observe:
+            card.add_observer(self)
+        self.version += 1
+
+    def add_cards(self, cards):
+        """Index several cards, sorting the ids, tokens and each numeric index once at the end."""
+        touched = set()
+        for card in cards:
+            if card.card_id in self.cards:
+                continue
+            self.cards[card.card_id] = card
+            self._order.append(card.card_id)
+            self._index(card, touched)
+            if self.observe:
+                card.add_observer(self)
+        # Appended runs are already in order, so these sorts are close to linear
+        self._order.sort()
+        self._tokens.sort()
+        for key in touched:
+            self._numeric[key].sort()
+        self.version += 1
+
+    def remove(self, card):
+        """Stop indexing a card (ignored if it is not indexed)."""
+        if card not in self:
+            return
+        self._unindex(card)
+        del self.cards[card.card_id]
+        del self._order[bisect_left(self._order, card.card_id)]
+        if self.observe:
+            card.remove_observer(self)
+        self.version += 1
+
+    def clear(self):
+        """Remove every card from the index."""
+        if self.observe:
+            for card in self.cards.values():
+                card.remove_observer(self)
+        self.cards = {}
+        self._order = []
+        self._postings = {}
+        self._tokens = []
+        self._card_tokens = {}
+        self._types = {}
+        self._numeric = {}
+        self._card_numeric = {}
+        self.version += 1
+
+    def card_attribute_changed(self, card, key, old, new):
+        """Observer callback from Card.set_attribute: re-index the card."""
+        self._unindex(card)
+        self._index(card)
+        self.version += 1
+
+    def _index(self, card, touched=None):
+        """
+        Add a card's tokens, type and numeric attributes to the indexes.
+
+        Args:
+            card: Card to index
+            touched: If given, new tokens and numeric entries are appended
+                unsorted, and the numeric index keys collected here, for the
+                caller to sort
+        """
+        card_id = card.card_id
+        words = [card.name] + [card.attributes.get(key, "") for key in TEXT_ATTRIBUTES]
+        tokens = set()
+        for word in words:
+            tokens.update(tokenize(word))
+        self._card_tokens[card_id] = tokens
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = set()
+                self._postings[token] = posting
+                if touched is None:
+                    insort(self._tokens, token)
+                else:
+                    self._tokens.append(token)
+            posting.add(card_id)
+        card_type = card.card_type.lower()
+        self._types.setdefault(card_type, set()).add(card_id)
+        numeric = [(key, value) for key, value in card.attributes.items() if _is_number(value)]
+        self._card_numeric[card_id] = numeric
+        for key, value in numeric:
+            for index_key in (key, (card_type, key)):
+                entries = self._numeric.setdefault(index_key, [])
+                if touched is None:
+                    insort(entries, (value, card_id))
+                else:
+                    entries.append((value, card_id))
+                    touched.add(index_key)
+
+    def _unindex(self, card):
+        """Remove a card from the indexes using what it was indexed under."""
+        card_id = card.card_id
+        for token in self._card_tokens.pop(card_id):
+            posting = self._postings[token]
+            posting.discard(card_id)
+            if not posting:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+        card_type = card.card_type.lower()
+        self._types[card_type].discard(card_id)
+        for key, value in self._card_numeric.pop(card_id):
+            for index_key in (key, (card_type, key)):
+                entries = self._numeric[index_key]
+                del entries[bisect_left(entries, (value, card_id))]
+
+    def keyword(self, word):
+        """Get the ids of cards whose name or text contains a whole word."""
+        return self._postings.get(word.lower(), set())
+
+    def prefix(self, prefix):
+        """Get the ids of cards with a word starting with prefix."""
+        postings = self._postings
+        return set().union(*[postings[token] for token in self._tokens_with_prefix(prefix.lower())])
+
+    def of_type(self, card_type):
+        """Get the ids of cards of a type (case-insensitive)."""
+        return self._types.get(card_type.lower(), set())
+
+    def range(self, attribute, low=None, high=None, low_inclusive=True, high_inclusive=True,
+              card_type=None):
+        """
+        Get the ids of cards whose numeric attribute lies in a range.
+
+        Args:
+            attribute: Attribute name, e.g. "level" or "strength"
+            low, high: Bounds (None for unbounded)
+            low_inclusive, high_inclusive: Whether the bounds themselves match
+            card_type: Only consider cards of this type
+
+        Returns:
+            List of card ids in ascending attribute order
+        """
+        entries, start, end = self._range_slice(attribute, card_type,
+                                                (low, low_inclusive, high, high_inclusive))
+        return [card_id for _, card_id in entries[start:end]]
+
+    def _tokens_with_prefix(self, prefix):
+        """Get the slice of sorted tokens starting with prefix."""
+        tokens = self._tokens
+        start = bisect_left(tokens, prefix)
+        # Every token with the prefix sorts before prefix + the highest character
+        end = bisect_left(tokens, prefix + "\uffff", start)
+        return tokens[start:end]
+
+    def _range_slice(self, attribute, card_type, bounds):
+        """Locate a range in a sorted numeric index: (entries, start, end)."""
+        low, low_inclusive, high, high_inclusive = bounds
+        key = attribute if card_type is None else (card_type.lower(), attribute)
+        entries = self._numeric.get(key, [])
+        start = 0
+        end = len(entries)
+        if low is not None:
+            # (value,) sorts before every (value, card_id); (value, inf) after
+            start = (bisect_left(entries, (low,)) if low_inclusive
+                     else bisect_right(entries, (low, _INF)))
+        if high is not None:
+            end = (bisect_right(entries, (high, _INF)) if high_inclusive
+                   else bisect_left(entries, (high,)))
+        return entries, start, max(start, end)
+
+    def search(self, query):
+        """
+        Find cards matching every term of a query.
+
+        Terms are separated by spaces: a plain word must appear in the name,
+        class or special rules; "word*" matches words starting with it;
+        "type:skill" filters by type; "level>=2", "strength<5", "wisdom=3"
+        and "level:1..3" filter by numeric attributes. An empty query
+        matches every card.
+
+        The most selective term is looked up in its index and narrowed by
+        the other terms, intersecting with their ids when those are at hand
+        and otherwise testing each candidate, so cost follows the smallest
+        term rather than the collection size.
+
+        Args:
+            query: Query string
+
+        Returns:
+            SearchResults
+        """
+        type_names, bounds, words, prefixes = self._parse(query)
+        if not (type_names or bounds or words or prefixes):
+            return SearchResults(self, set(self.cards))
+        # With one type filter, ranges are sliced from that type's own indexes
+        scope = type_names[0] if len(type_names) == 1 and bounds else None
+        constraints = [] if scope is not None else [self._set_constraint(self.of_type(name))
+                                                    for name in type_names]
+        constraints += [self._range_constraint(attribute, scope, attribute_bounds)
+                        for attribute, attribute_bounds in bounds.items()]
+        constraints += [self._set_constraint(self.keyword(word)) for word in words]
+        constraints += [self._prefix_constraint(prefix) for prefix in prefixes]
+        constraints.sort(key=lambda constraint: constraint[0])
+        size, candidates, _ = constraints[0]
+        ids = set(candidates()) if size else set()
+        for size, candidates, test in constraints[1:]:
+            if not ids:
+                break
+            if size <= len(ids) * INTERSECT_RATIO:
+                ids.intersection_update(candidates())
+            else:
+                ids = set(filter(test, ids))
+        return SearchResults(self, ids)
+
+    def _parse(self, query):
+        """
+        Split a query into its terms.
+
+        Returns:
+            (type names, {attribute: merged bounds}, keywords, prefixes)
+        """
+        type_names, bounds, words, prefixes = [], {}, [], []
+        for term in query.lower().split():
+            if term.startswith("type:"):
+                type_names.append(term[5:])
+                continue
+            match = _RANGE_RE.match(term)
+            if match:
+                attribute, op, value, upper = match.groups()
+                value = _number(value)
+                if upper is not None:
+                    term_bounds = (value, True, _number(upper), True)
+                elif op in ("=", ":"):
+                    term_bounds = (value, True, value, True)
+                elif op.startswith(">"):
+                    term_bounds = (value, op == ">=", None, True)
+                else:
+                    term_bounds = (None, True, value, op == "<=")
+                bounds[attribute] = _merge_bounds(bounds.get(attribute), term_bounds)
+                continue
+            tokens = tokenize(term)
+            if term.endswith("*") and tokens:
+                words.extend(tokens[:-1])
+                prefixes.append(tokens[-1])
+            else:
+                words.extend(tokens)
+        return type_names, bounds, words, prefixes
+
+    @staticmethod
+    def _set_constraint(ids):
+        """Constraint (size, candidates, test) backed by a set of ids."""
+        return (len(ids), lambda: ids, ids.__contains__)
+
+    def _prefix_constraint(self, prefix):
+        """Constraint matching cards with a word starting with prefix."""
+        tokens = self._tokens_with_prefix(prefix)
+        postings = [self._postings[token] for token in tokens]
+        card_tokens = self._card_tokens
+        token_set = frozenset(tokens)
+
+        def test(card_id):
+            return not token_set.isdisjoint(card_tokens[card_id])
+
+        return (sum(map(len, postings)), lambda: set().union(*postings), test)
+
+    def _range_constraint(self, attribute, card_type, bounds):
+        """Constraint matching cards whose numeric attribute lies within bounds."""
+        entries, start, end = self._range_slice(attribute, card_type, bounds)
+        low, low_inclusive, high, high_inclusive = bounds
+        cards = self.cards
+
+        def test(card_id):
+            value = cards[card_id].attributes.get(attribute)
+            if not _is_number(value):
+                return False
+            if low is not None and (value < low or (value == low and not low_inclusive)):
+                return False
+            return high is None or value < high or (value == high and high_inclusive)
+
+        return (end - start, lambda: [card_id for _, card_id in entries[start:end]], test)
+
+
+def _is_number(value):
+    """Check whether an attribute value is indexed as a number (bools are not)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _merge_bounds(current, new):
+    """Intersect two (low, low_inclusive, high, high_inclusive) ranges."""
+    if current is None:
+        return new
+    low, low_inclusive, high, high_inclusive = current
+    new_low, new_low_inclusive, new_high, new_high_inclusive = new
+    if new_low is not None and (low is None or new_low > low):
+        low, low_inclusive = new_low, new_low_inclusive
+    elif new_low is not None and new_low == low:
+        low_inclusive = low_inclusive and new_low_inclusive
+    if new_high is not None and (high is None or new_high < high):
+        high, high_inclusive = new_high, new_high_inclusive
+    elif new_high is not None and new_high == high:
+        high_inclusive = high_inclusive and new_high_inclusive
+    return (low, low_inclusive, high, high_inclusive)
@@ -4,6 +4,8 @@ Deck class for managing collections of cards.
 
 import random
 
+from .deck_stats import DeckStats
+
 
 class Deck:
     """Manages a collection of cards."""
@@ -17,6 +19,39 @@ class Deck:
         """
         self.name = name
         self.cards = []
+        # Incremented on every change so views can cache derived data
+        self.version = 0
+        # Aggregates kept up to date on every change once track_stats() is called
+        self.stats = None
+    
+    def track_stats(self):
+        """
+        Start keeping running statistics, and watching card attributes for them.
+        
+        Decks nobody shows stats for skip the bookkeeping on every move.
+        
+        Returns:
+            DeckStats object, kept up to date from now on
+        """
+        if self.stats is None:
+            self.stats = DeckStats()
+            for card in self.cards:
+                self._track(card)
+        return self.stats
+    
+    def _track(self, card):
+        """Count a card entering the deck and watch its attributes."""
+        self.stats.add(card)
+        card.add_observer(self)
+    
+    def _untrack(self, card):
+        """Stop counting and watching a card leaving the deck."""
+        self.stats.remove(card)
+        card.remove_observer(self)
+    
+    def card_attribute_changed(self, card, key, old, new):
+        """Observer callback from Card.set_attribute."""
+        self.stats.attribute_changed(key, old, new)
     
     def add_card(self, card):
         """
@@ -26,6 +61,9 @@ class Deck:
             card: Card object to add
         """
         self.cards.append(card)
+        if self.stats is not None:
+            self._track(card)
+        self.version += 1
     
     def add_to_top(self, card):
         """
@@ -36,6 +74,35 @@ class Deck:
             card: Card object to place on top
         """
         self.cards.insert(0, card)
+        if self.stats is not None:
+            self._track(card)
+        self.version += 1
+    
+    def add_cards_to_top(self, cards):
+        """
+        Place several cards on top of the deck as a single change.
+        
+        Args:
+            cards: Card objects; the first one ends up on top
+        """
+        self.cards[0:0] = cards
+        if self.stats is not None:
+            for card in cards:
+                self._track(card)
+        self.version += 1
+    
+    def insert_card(self, index, card):
+        """
+        Insert a card at a position counted from the top of the deck.
+        
+        Args:
+            index: Position (0 is the top)
+            card: Card object to insert
+        """
+        self.cards.insert(index, card)
+        if self.stats is not None:
+            self._track(card)
+        self.version += 1
     
     def remove_card(self, card):
         """
@@ -46,10 +113,43 @@ class Deck:
         """
         if card in self.cards:
             self.cards.remove(card)
+            if self.stats is not None:
+                self._untrack(card)
+            self.version += 1
+    
+    def remove_cards(self, cards):
+        """
+        Remove several cards from the deck as a single change.
+        
+        Args:
+            cards: Set (or other container) of Card objects to remove
+        """
+        remaining = [card for card in self.cards if card not in cards]
+        if len(remaining) != len(self.cards):
+            if self.stats is not None:
+                for card in self.cards:
+                    if card in cards:
+                        self._untrack(card)
+            self.cards = remaining
+            self.version += 1
+    
+    def set_cards(self, cards):
+        """
+        Replace the deck's contents.
+        
+        Args:
+            cards: Card objects, top first
+        """
+        self.clear()
+        self.cards = list(cards)
+        if self.stats is not None:
+            for card in self.cards:
+                self._track(card)
     
     def shuffle(self):
         """Shuffle the cards in the deck."""
         random.shuffle(self.cards)
+        self.version += 1
     
     def draw_card(self):
         """
@@ -59,7 +159,11 @@ class Deck:
             Card object or None if deck is empty
         """
         if self.cards:
-            return self.cards.pop(0)
+            self.version += 1
+            card = self.cards.pop(0)
+            if self.stats is not None:
+                self._untrack(card)
+            return card
         return None
     
     def draw_cards(self, count):
@@ -89,7 +193,12 @@ class Deck:
     
     def clear(self):
         """Remove all cards from the deck."""
+        if self.stats is not None:
+            for card in self.cards:
+                card.remove_observer(self)
+            self.stats.clear()
         self.cards = []
+        self.version += 1
     
     def __str__(self):
         return f"Deck({self.name}, {len(self.cards)} cards)"
@@ -20,6 +20,51 @@ class DeckManager:
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
     
+    @staticmethod
+    def card_to_dict(card):
+        """
+        Serialize a card to a JSON-compatible dict.
+        
+        Args:
+            card: Card object to serialize
+        
+        Returns:
+            Dict of card data
+        """
+        return {
+            "card_id": card.card_id,
+            "name": card.name,
+            "card_type": card.card_type,
+            "attributes": card.attributes,
+            "x": card.x,
+            "y": card.y,
+            "face_up": card.face_up
+        }
+    
+    @staticmethod
+    def card_from_dict(card_data, preview=False):
+        """
+        Build a card from data written by card_to_dict.
+        
+        Args:
+            card_data: Dict of card data
+            preview: Build a display-only card with id 0, which never touches
+                the card id counter, so it is safe off the main thread
+        
+        Returns:
+            Card object
+        """
+        from .card import Card
+        
+        card_type = card_data.get("card_type", "Character")  # Default for backward compatibility
+        # Files written before cards had ids get fresh ones
+        card_id = 0 if preview else card_data.get("card_id")
+        card = Card(card_data["name"], card_type=card_type, card_id=card_id,
+                    **card_data["attributes"])
+        card.set_position(card_data["x"], card_data["y"])
+        card.face_up = card_data.get("face_up", True)
+        return card
+    
     def save_deck(self, deck):
         """
         Save a deck to a JSON file.
@@ -27,25 +72,12 @@ class DeckManager:
         Args:
             deck: Deck object to save
         """
-        from .card import Card
-        
         # Prepare deck data
         deck_data = {
             "name": deck.name,
-            "cards": []
+            "cards": [self.card_to_dict(card) for card in deck.cards]
         }
         
-        for card in deck.cards:
-            card_data = {
-                "name": card.name,
-                "card_type": card.card_type,
-                "attributes": card.attributes,
-                "x": card.x,
-                "y": card.y,
-                "face_up": card.face_up
-            }
-            deck_data["cards"].append(card_data)
-        
         # Save to file
         filename = os.path.join(self.data_dir, f"{deck.name}.json")
         with open(filename, 'w') as f:
@@ -62,7 +94,6 @@ class DeckManager:
             Deck object or None if file not found
         """
         from .deck import Deck
-        from .card import Card
         
         filename = os.path.join(self.data_dir, f"{deck_name}.json")
         
@@ -77,11 +108,7 @@ class DeckManager:
         
         # Add cards
         for card_data in deck_data["cards"]:
-            card_type = card_data.get("card_type", "Character")  # Default for backward compatibility
-            card = Card(card_data["name"], card_type=card_type, **card_data["attributes"])
-            card.set_position(card_data["x"], card_data["y"])
-            card.face_up = card_data.get("face_up", True)
-            deck.add_card(card)
+            deck.add_card(self.card_from_dict(card_data))
         
         return deck
     
@@ -0,0 +1,355 @@
+"""
+Exact draw odds for a deck: hypergeometric and multivariate forms.
+
+Questions like "at least 2 Skills and a Location in the first 5 cards" or
+"expected turn to see a Location" are answered for a freshly shuffled
+deck. Categories are card types, CardIndex queries ("level>=2",
+"type:plan healing") or predicates on cards. Results of the combinatorial
+sums are memoized, so repeating a query (or asking it of another deck with
+the same counts) is a dictionary lookup. Conditions whose exact sum would
+be too large, or arbitrary tests on the drawn cards, are estimated by
+sampling (vectorized with numpy when it is installed).
+
+Usage:
+    python -m src.deck_odds MyDeck --draws 5 --need Skill 2 --need "level>=2" 1
+    python -m src.deck_odds MyDeck --turn Location --opening-hand 5
+"""
+
+import argparse
+import random
+from functools import lru_cache
+from math import comb
+
+from .card import CARD_TYPES
+from .card_index import CardIndex
+from .deck_manager import DeckManager
+
+try:
+    import numpy as np
+except ImportError:  # Sampling falls back to pure Python
+    np = None
+
+# Exact sums larger than this many steps are estimated by sampling instead
+EXACT_LIMIT = 2_000_000
+DEFAULT_TRIALS = 20000
+
+_TYPE_NAMES = {card_type.lower(): card_type for card_type in CARD_TYPES}
+
+
+@lru_cache(maxsize=4096)
+def hypergeometric_pmf(population, successes, draws):
+    """
+    Get the distribution of successes among cards drawn without replacement.
+
+    Args:
+        population: Cards in the deck
+        successes: Cards in the deck that count as a success
+        draws: Cards drawn
+
+    Returns:
+        Tuple whose k-th entry is the probability of exactly k successes
+    """
+    draws = min(draws, population)
+    total = comb(population, draws)
+    hits = _comb_row(successes, draws)
+    misses = _comb_row(population - successes, draws)
+    return tuple(hits[k] * misses[draws - k] / total
+                 if k < len(hits) and draws - k < len(misses) else 0.0
+                 for k in range(draws + 1))
+
+
+@lru_cache(maxsize=4096)
+def _comb_row(n, up_to):
+    """Get comb(n, k) for k = 0 .. min(n, up_to)."""
+    return tuple(comb(n, k) for k in range(min(n, up_to) + 1))
+
+
+@lru_cache(maxsize=4096)
+def _ways_meeting(population, atoms, minimums, draws):
+    """
+    Count the draws that meet every category minimum (multivariate form).
+
+    Cards are grouped into atoms: cards belonging to exactly the same
+    categories. A dynamic program walks the atoms, keeping for each number
+    of cards drawn so far how many of each category were drawn, capped at
+    the minimum (more than the minimum makes no difference).
+
+    Args:
+        population: Cards in the deck
+        atoms: ((size, category_mask), ...) for cards in at least one category
+        minimums: Required count per category
+        draws: Cards drawn
+
+    Returns:
+        Number of draws (as an exact integer) meeting every minimum
+    """
+    states = {(0, (0,) * len(minimums)): 1}
+    in_atoms = 0
+    for size, mask in atoms:
+        in_atoms += size
+        members = [i for i in range(len(minimums)) if mask >> i & 1]
+        choose = _comb_row(size, draws)
+        next_states = {}
+        for (used, counts), ways in states.items():
+            for taken in range(min(size, draws - used) + 1):
+                capped = list(counts)
+                for i in members:
+                    capped[i] = min(minimums[i], capped[i] + taken)
+                key = (used + taken, tuple(capped))
+                next_states[key] = next_states.get(key, 0) + ways * choose[taken]
+        states = next_states
+    rest = population - in_atoms
+    return sum(ways * comb(rest, draws - used)
+               for (used, counts), ways in states.items() if counts == minimums)
+
+
+class DeckOdds:
+    """Draw odds for one deck; category lookups are cached until the deck changes."""
+
+    def __init__(self, deck, opening_hand=5, draws_per_turn=1):
+        """
+        Initialize odds for a deck.
+
+        Args:
+            deck: Deck to analyse (its current contents, shuffled)
+            opening_hand: Cards drawn before the first turn (expected_turn)
+            draws_per_turn: Cards drawn each turn after that (expected_turn)
+
+        Raises:
+            ValueError: If draws_per_turn is less than 1
+        """
+        if draws_per_turn < 1:
+            raise ValueError(f"draws_per_turn must be at least 1, got {draws_per_turn}")
+        self.deck = deck
+        self.opening_hand = opening_hand
+        self.draws_per_turn = draws_per_turn
+        self._version = None
+        self._members = {}  # category -> frozenset of deck positions
+        self._index = None
+
+    @classmethod
+    def from_saved(cls, manager, deck_name, **options):
+        """
+        Get odds for a deck saved by DeckManager.
+
+        Returns:
+            DeckOdds, or None if the deck does not exist
+        """
+        deck = manager.load_deck(deck_name)
+        return cls(deck, **options) if deck is not None else None
+
+    def members(self, category):
+        """
+        Get the deck positions of the cards in a category.
+
+        Args:
+            category: Card type name ("Skill"), CardIndex query ("level>=2",
+                "type:plan heal*") or predicate taking a Card
+
+        Returns:
+            Frozenset of indexes into deck.cards
+        """
+        if self._version != self.deck.version:
+            self._version = self.deck.version
+            self._members = {}
+            self._index = None
+        positions = self._members.get(category)
+        if positions is None:
+            positions = self._match(category)
+            self._members[category] = positions
+        return positions
+
+    def _match(self, category):
+        """Find the cards of a category without the cache."""
+        cards = self.deck.cards
+        if callable(category):
+            return frozenset(i for i, card in enumerate(cards) if category(card))
+        card_type = _TYPE_NAMES.get(category.strip().lower())
+        if card_type is not None:
+            return frozenset(i for i, card in enumerate(cards) if card.card_type == card_type)
+        if self._index is None:
+            # Rebuilt when the deck changes, so it need not watch the cards
+            self._index = CardIndex(observe=False)
+            self._index.add_cards({card.card_id: card for card in cards}.values())
+        results = self._index.search(category)
+        ids = {card.card_id for card in results.page(0, len(results))}
+        return frozenset(i for i, card in enumerate(cards) if card.card_id in ids)
+
+    def count(self, category):
+        """Get the number of cards in a category."""
+        return len(self.members(category))
+
+    def distribution(self, category, draws):
+        """
+        Get the distribution of how many cards of a category are drawn.
+
+        Returns:
+            Tuple whose k-th entry is the probability of drawing exactly k
+        """
+        return hypergeometric_pmf(len(self.deck.cards), self.count(category), draws)
+
+    def at_least(self, category, count, draws):
+        """Get the probability of drawing at least count cards of a category in draws cards."""
+        return self.chance({category: count}, draws)
+
+    def chance(self, requirements, draws, trials=DEFAULT_TRIALS, seed=None):
+        """
+        Get the probability that draws cards meet every minimum.
+
+        Categories may overlap (a card counts toward each category it is
+        in). The answer is exact unless the sum is too large, in which case
+        it is estimated from trials samples.
+
+        Args:
+            requirements: Dict of category -> minimum count
+            draws: Cards drawn from the top of the shuffled deck
+            trials: Samples used if the exact sum is too large
+            seed: RNG seed for sampling
+
+        Returns:
+            Probability as a float
+        """
+        population = len(self.deck.cards)
+        draws = min(draws, population)
+        categories = list(requirements)
+        minimums = tuple(requirements[category] for category in categories)
+        if any(minimum > draws for minimum in minimums):
+            return 0.0
+        member_sets = [self.members(category) for category in categories]
+        if len(categories) == 1:
+            return sum(hypergeometric_pmf(population, len(member_sets[0]), draws)[minimums[0]:])
+        atoms = self._atoms(member_sets)
+        steps = draws + 1
+        for minimum in minimums:
+            steps *= minimum + 1
+        if steps * (draws + 1) * len(atoms) > EXACT_LIMIT:
+            return self.sample_chance(requirements, draws, trials, seed)
+        return _ways_meeting(population, atoms, minimums, draws) / comb(population, draws)
+
+    @staticmethod
+    def _atoms(member_sets):
+        """Group positions by the set of categories they belong to: ((size, mask), ...)."""
+        masks = {}
+        for bit, positions in enumerate(member_sets):
+            for position in positions:
+                masks[position] = masks.get(position, 0) | 1 << bit
+        sizes = {}
+        for mask in masks.values():
+            sizes[mask] = sizes.get(mask, 0) + 1
+        return tuple(sorted((size, mask) for mask, size in sizes.items()))
+
+    def expected_draws(self, category):
+        """
+        Get the expected number of cards drawn up to and including the first of a category.
+
+        Returns:
+            Float, or None if the deck has no such card
+        """
+        successes = self.count(category)
+        if not successes:
+            return None
+        return (len(self.deck.cards) + 1) / (successes + 1)
+
+    def expected_turn(self, category):
+        """
+        Get the expected turn a category's first card is seen.
+
+        Turn 0 is the opening hand; each later turn draws draws_per_turn
+        more cards.
+
+        Returns:
+            Float, or None if the deck has no such card
+        """
+        population = len(self.deck.cards)
+        successes = self.count(category)
+        if not successes:
+            return None
+        expected = 0.0
+        drawn = self.opening_hand
+        # E[T] = sum over t of P(T > t): nothing seen after drawn cards
+        while drawn < population:
+            expected += hypergeometric_pmf(population, successes, drawn)[0]
+            drawn += self.draws_per_turn
+        return expected
+
+    def sample_chance(self, requirements, draws, trials=DEFAULT_TRIALS, seed=None):
+        """
+        Estimate chance() by sampling shuffled draws.
+
+        Returns:
+            Fraction of trials meeting every minimum
+        """
+        population = len(self.deck.cards)
+        draws = min(draws, population)
+        member_sets = [self.members(category) for category in requirements]
+        minimums = list(requirements.values())
+        if not draws:
+            return float(all(minimum <= 0 for minimum in minimums))
+        if np is None:
+            rng = random.Random(seed)
+            met = 0
+            for _ in range(trials):
+                drawn = set(rng.sample(range(population), draws))
+                met += all(len(drawn & positions) >= minimum
+                           for positions, minimum in zip(member_sets, minimums))
+            return met / trials
+        # Only how many cards come from each group of same-category cards matters
+        atoms = self._atoms(member_sets)
+        colors = [size for size, _ in atoms]
+        colors.append(population - sum(colors))
+        membership = np.array([[mask >> i & 1 for i in range(len(minimums))] for _, mask in atoms]
+                              + [[0] * len(minimums)])
+        drawn = np.random.default_rng(seed).multivariate_hypergeometric(colors, draws, size=trials)
+        counts = drawn @ membership
+        return float(np.all(counts >= minimums, axis=1).mean())
+
+    def sample(self, test, draws, trials=DEFAULT_TRIALS, seed=None):
+        """
+        Estimate the chance that drawn cards pass any test.
+
+        Args:
+            test: Function taking the list of drawn Cards and returning a bool
+            draws: Cards drawn from the top of the shuffled deck
+            trials: Number of samples
+            seed: RNG seed
+
+        Returns:
+            Fraction of trials passing the test
+        """
+        cards = self.deck.cards
+        draws = min(draws, len(cards))
+        rng = random.Random(seed)
+        passed = sum(1 for _ in range(trials) if test(rng.sample(cards, draws)))
+        return passed / trials
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Draw odds for a saved deck")
+    parser.add_argument("deck", help="Saved deck name")
+    parser.add_argument("--data-dir", default="data", help="Directory with saved decks")
+    parser.add_argument("--draws", type=int, default=5, help="Cards drawn (default 5)")
+    parser.add_argument("--need", nargs=2, action="append", default=[], metavar=("CATEGORY", "COUNT"),
+                        help="Require at least COUNT cards of CATEGORY (type name or search query)")
+    parser.add_argument("--turn", action="append", default=[], metavar="CATEGORY",
+                        help="Report the expected turn CATEGORY is first seen")
+    parser.add_argument("--opening-hand", type=int, default=5, help="Opening hand size (default 5)")
+    args = parser.parse_args(argv)
+
+    odds = DeckOdds.from_saved(DeckManager(args.data_dir), args.deck, opening_hand=args.opening_hand)
+    if odds is None:
+        parser.error(f"deck not found: {args.deck}")
+    print(f"{args.deck}: {len(odds.deck.cards)} cards")
+    requirements = {category: int(count) for category, count in args.need}
+    for category, count in requirements.items():
+        print(f"  {category}: {odds.count(category)} in deck, "
+              f"P(at least {count} in {args.draws}) = {odds.at_least(category, count, args.draws):.4f}")
+    if len(requirements) > 1:
+        print(f"  P(all of the above in {args.draws}) = {odds.chance(requirements, args.draws):.4f}")
+    for category in args.turn:
+        turn = odds.expected_turn(category)
+        print(f"  {category}: " + ("not in deck" if turn is None else f"expected turn {turn:.2f}"))
+
+
+if __name__ == "__main__":
+    main()
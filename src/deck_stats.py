@@ -0,0 +1,84 @@
+"""
+Running deck statistics updated as cards enter, leave or change.
+"""
+
+from collections import Counter
+
+# Attribute value types counted in totals; exact types, so bools are left out
+_NUMBER_TYPES = (int, float)
+
+
+class DeckStats:
+    """Per-type counts, numeric attribute totals and the level curve of a deck.
+
+    Every update touches only the cards that changed, so reading the
+    numbers costs the same for a deck of ten cards or ten thousand.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.type_counts = Counter()  # card_type -> number of cards
+        self.totals = Counter()  # numeric attribute -> sum over cards having it
+        self.attribute_counts = Counter()  # numeric attribute -> number of cards having it
+        self.level_curve = Counter()  # level -> number of cards
+
+    def _add_attributes(self, items, sign):
+        """Add (sign=1) or remove (sign=-1) (key, value) attribute pairs from the aggregates in one loop."""
+        totals = self.totals
+        attribute_counts = self.attribute_counts
+        for key, value in items:
+            if type(value) in _NUMBER_TYPES:
+                totals[key] += sign * value
+                attribute_counts[key] += sign
+                if key == "level":
+                    self.level_curve[value] += sign
+                    if not self.level_curve[value]:
+                        del self.level_curve[value]
+
+    def add(self, card):
+        """Count a card that entered the deck."""
+        self.count += 1
+        self.type_counts[card.card_type] += 1
+        self._add_attributes(card.attributes.items(), 1)
+
+    def remove(self, card):
+        """Stop counting a card that left the deck."""
+        self.count -= 1
+        self.type_counts[card.card_type] -= 1
+        if not self.type_counts[card.card_type]:
+            del self.type_counts[card.card_type]
+        self._add_attributes(card.attributes.items(), -1)
+
+    def attribute_changed(self, key, old, new):
+        """
+        Update the aggregates after one card attribute changed.
+
+        Args:
+            key: Attribute name
+            old: Previous value (None if it was not set)
+            new: New value
+        """
+        self._add_attributes(((key, old),), -1)
+        self._add_attributes(((key, new),), 1)
+
+    def clear(self):
+        """Reset to an empty deck."""
+        self.count = 0
+        self.type_counts = Counter()
+        self.totals = Counter()
+        self.attribute_counts = Counter()
+        self.level_curve = Counter()
+
+    def total(self, key):
+        """Get the sum of a numeric attribute over the cards that have it."""
+        return self.totals[key]
+
+    def average(self, key):
+        """
+        Get the mean of a numeric attribute over the cards that have it.
+
+        Returns:
+            Float, or None if no card has the attribute
+        """
+        n = self.attribute_counts[key]
+        return self.totals[key] / n if n else None
@@ -0,0 +1,348 @@
+"""
+Parallel validation and migration of the saved decks in a data directory.
+
+Every deck file is checked against the per-type attribute schema that
+Card._initialize_type_attributes gives new cards: missing or unknown card
+types, missing attributes, values of the wrong type, missing card ids and
+deck names that do not match their file. Files are checked on a process
+pool, so large archives are limited by the number of cores rather than
+one interpreter. With --fix, files are rewritten to the current schema,
+each through a temporary file and an atomic rename.
+
+Usage:
+    python -m src.deck_validator                        # report problems
+    python -m src.deck_validator --fix --jobs 8         # also migrate files
+    python -m src.deck_validator --data-dir archive --quiet
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .card import CARD_TYPES, Card
+from .deck_manager import DeckManager
+
+# Attributes (with defaults) that a new card of each type is given
+SCHEMAS = {card_type: dict(Card("", card_type=card_type, card_id=0).attributes)
+           for card_type in CARD_TYPES}
+
+_INVALID = object()
+
+
+def infer_types(attributes):
+    """
+    Guess a card's type from its attribute names.
+
+    Returns:
+        The card types whose schemas share the most attributes with it
+        (several when schemas are alike, e.g. Plan and Skill), or
+        ["Character"] if it shares none, which is how it loads
+    """
+    scores = {}
+    for card_type, schema in SCHEMAS.items():
+        scores[card_type] = sum(1 for key in schema if key in attributes and key != "special_rules")
+    best = max(scores.values())
+    if not best:
+        return ["Character"]
+    return [card_type for card_type, score in scores.items() if score == best]
+
+
+def _coerce(value, default):
+    """
+    Convert an attribute value to the type of its schema default.
+
+    Returns:
+        The converted value (value itself if already right), or _INVALID
+    """
+    if isinstance(default, str):
+        if isinstance(value, str):
+            return value
+        if value is None:
+            return ""
+        if isinstance(value, (int, float)):
+            return str(value)
+        return _INVALID
+    if type(value) is int:
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return _INVALID
+    return _INVALID
+
+
+def migrate_card(card_data):
+    """
+    Check one serialized card and convert it to the current schema.
+
+    Args:
+        card_data: Card as found in a deck file
+
+    Returns:
+        (problems, migrated): problems is a list of (message, fixable)
+        pairs; migrated is the card in DeckManager.card_to_dict form with
+        card_id None if it needs a new one, or None if it cannot be migrated
+    """
+    if not isinstance(card_data, dict):
+        return [("not a JSON object", False)], None
+    problems = []
+    name = card_data.get("name")
+    if not isinstance(name, str):
+        problems.append(("no name", False))
+        return problems, None
+    attributes = card_data.get("attributes", {})
+    if not isinstance(attributes, dict):
+        problems.append(("attributes is not a JSON object", False))
+        return problems, None
+    card_type = card_data.get("card_type")
+    if card_type is None:
+        guesses = infer_types(attributes)
+        if len(guesses) > 1:
+            problems.append((f"no card_type, loads as Character; its attributes fit "
+                             f"{' or '.join(guesses)}", False))
+            return problems, None
+        card_type = guesses[0]
+        note = "" if card_type == "Character" else f"; its attributes match the {card_type} schema"
+        problems.append((f"no card_type, loads as Character{note}", True))
+    elif card_type not in SCHEMAS:
+        problems.append((f"unknown card_type {card_type!r}", False))
+        return problems, None
+    migrated_attributes = dict(attributes)
+    for key, default in SCHEMAS[card_type].items():
+        if key not in attributes:
+            problems.append((f"missing attribute {key!r}", True))
+            migrated_attributes[key] = default
+            continue
+        value = attributes[key]
+        fixed = _coerce(value, default)
+        if fixed is _INVALID:
+            problems.append((f"attribute {key!r} should be {type(default).__name__}, "
+                             f"found {value!r}", False))
+        elif type(fixed) is not type(value):
+            problems.append((f"attribute {key!r} is {type(value).__name__} {value!r}, "
+                             f"expected {type(default).__name__}", True))
+            migrated_attributes[key] = fixed
+    card_id = card_data.get("card_id")
+    if type(card_id) is not int:
+        problems.append(("no card_id, a new one is assigned on every load" if card_id is None
+                         else f"card_id {card_id!r} is not an integer", True))
+        card_id = None
+    position = []
+    for key in ("x", "y"):
+        value = card_data.get(key)
+        if type(value) not in (int, float):
+            problems.append((f"missing or invalid {key}", True))
+            value = 0
+        position.append(value)
+    face_up = card_data.get("face_up", True)
+    if not isinstance(face_up, bool):
+        problems.append((f"face_up {face_up!r} is not a boolean", True))
+        face_up = bool(face_up)
+    return problems, {
+        "card_id": card_id,
+        "name": name,
+        "card_type": card_type,
+        "attributes": migrated_attributes,
+        "x": position[0],
+        "y": position[1],
+        "face_up": face_up,
+    }
+
+
+def migrate_deck(deck_data, deck_name):
+    """
+    Check a parsed deck file and convert it to the current schema.
+
+    Args:
+        deck_data: Parsed JSON of the file
+        deck_name: Name the file is saved under (file name without .json)
+
+    Returns:
+        (problems, migrated): problems as (message, fixable) pairs, each
+        message prefixed with the card it concerns; migrated is the new
+        file content, or None if the deck cannot be migrated
+    """
+    if not isinstance(deck_data, dict) or not isinstance(deck_data.get("cards"), list):
+        return [("not a deck file (no cards list)", False)], None
+    problems = []
+    if deck_data.get("name") != deck_name:
+        problems.append((f"deck name {deck_data.get('name')!r} does not match the file name, "
+                         f"so saving it writes another file", True))
+    cards = []
+    for index, card_data in enumerate(deck_data["cards"]):
+        card_problems, migrated = migrate_card(card_data)
+        label = card_data.get("name") if isinstance(card_data, dict) else None
+        prefix = f"card {index}" + (f" ({label})" if isinstance(label, str) else "")
+        problems.extend((f"{prefix}: {message}", fixable) for message, fixable in card_problems)
+        # Cards that cannot be migrated are kept as they are
+        cards.append(migrated if migrated is not None else card_data)
+    return problems, {"name": deck_name, "cards": cards}
+
+
+def _read_deck(path):
+    """Parse a deck file, returning (data, problem message or None)."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f), None
+    except (OSError, ValueError) as error:
+        return None, f"unreadable: {error}"
+
+
+def _deck_name(path):
+    """Get the deck name a file is saved under."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def check_file(path):
+    """
+    Validate one deck file (runs in a worker process).
+
+    Returns:
+        Report dict: path, cards, problems ((message, fixable) pairs),
+        max_id (largest card_id present), missing_ids (cards needing one)
+        and changed (whether --fix would rewrite the file)
+    """
+    report = {"path": path, "cards": 0, "problems": [], "max_id": 0, "missing_ids": 0,
+              "changed": False}
+    deck_data, error = _read_deck(path)
+    if error is not None:
+        report["problems"].append((error, False))
+        return report
+    problems, migrated = migrate_deck(deck_data, _deck_name(path))
+    report["problems"] = problems
+    if migrated is None:
+        return report
+    report["cards"] = len(migrated["cards"])
+    for card_data in migrated["cards"]:
+        card_id = card_data.get("card_id") if isinstance(card_data, dict) else None
+        if card_id is None:
+            report["missing_ids"] += 1
+        elif type(card_id) is int:
+            report["max_id"] = max(report["max_id"], card_id)
+    report["changed"] = migrated != deck_data
+    return report
+
+
+def fix_file(path, next_id):
+    """
+    Rewrite one deck file to the current schema (runs in a worker process).
+
+    The new content goes to a temporary file in the same directory, which
+    then replaces the original in one rename, so a crash never leaves a
+    half-written deck.
+
+    Args:
+        path: Deck file
+        next_id: First card_id to give cards that have none
+
+    Returns:
+        Number of cards given a new card_id
+    """
+    deck_data, error = _read_deck(path)
+    if error is not None:
+        return 0
+    _, migrated = migrate_deck(deck_data, _deck_name(path))
+    if migrated is None:
+        return 0
+    assigned = 0
+    for card_data in migrated["cards"]:
+        if isinstance(card_data, dict) and card_data.get("card_id") is None:
+            card_data["card_id"] = next_id + assigned
+            assigned += 1
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(migrated, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return assigned
+
+
+def validate(data_dir, jobs=None, fix=False):
+    """
+    Validate (and optionally migrate) every deck in a data directory.
+
+    Card ids for cards without one are handed out by this process after
+    every file was checked, in disjoint ranges per file, so files can be
+    rewritten in parallel without two cards getting the same id.
+
+    Args:
+        data_dir: Directory of saved decks
+        jobs: Worker processes (None for one per core, 1 to run in this process)
+        fix: Rewrite files that need migration
+
+    Returns:
+        List of report dicts from check_file(), in file name order
+    """
+    names = sorted(DeckManager(data_dir).list_decks())
+    paths = [os.path.join(data_dir, f"{name}.json") for name in names]
+    if jobs == 1 or len(paths) < 2:
+        reports = [check_file(path) for path in paths]
+        pool = None
+    else:
+        workers = jobs or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers)
+        reports = list(pool.map(check_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    try:
+        if fix:
+            next_id = max([report["max_id"] for report in reports] + [0]) + 1
+            to_fix = []
+            for report in reports:
+                if report["changed"]:
+                    to_fix.append((report["path"], next_id))
+                    next_id += report["missing_ids"]
+            if pool is None:
+                for path, first_id in to_fix:
+                    fix_file(path, first_id)
+            elif to_fix:
+                list(pool.map(fix_file, *zip(*to_fix)))
+            for report in reports:
+                report["fixed"] = report["changed"]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return reports
+
+
+def main(argv=None):
+    """Command-line entry point; exits with 1 if problems remain."""
+    parser = argparse.ArgumentParser(description="Validate and migrate saved decks")
+    parser.add_argument("--data-dir", default="data", help="Directory with saved decks")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--fix", action="store_true", help="Rewrite decks to the current schema")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    reports = validate(args.data_dir, jobs=args.jobs, fix=args.fix)
+    elapsed = time.perf_counter() - start
+    remaining = 0
+    for report in reports:
+        fixed = report.get("fixed", False)
+        open_problems = [message for message, fixable in report["problems"]
+                         if not (fixed and fixable)]
+        remaining += len(open_problems)
+        if args.quiet or not report["problems"]:
+            continue
+        status = " (rewritten)" if fixed else ""
+        print(f"{report['path']}{status}")
+        for message, fixable in report["problems"]:
+            mark = "fixed" if fixed and fixable else ("fixable" if fixable else "error")
+            print(f"  [{mark}] {message}")
+    cards = sum(report["cards"] for report in reports)
+    rewritten = sum(1 for report in reports if report.get("fixed"))
+    print(f"{len(reports)} decks, {cards} cards checked in {elapsed:.2f}s; "
+          f"{remaining} problems remaining, {rewritten} files rewritten")
+    sys.exit(1 if remaining else 0)
+
+
+if __name__ == "__main__":
+    main()
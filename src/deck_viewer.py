@@ -0,0 +1,207 @@
+"""
+Virtualized, scrollable list views over a deck's contents and card search results.
+"""
+
+from bisect import bisect_left
+from collections import OrderedDict
+
+
+class DeckListView:
+    """Keeps scroll/filter state and cached rows so only visible entries are rendered."""
+
+    def __init__(self, visible_rows=20, row_cache_size=256):
+        """
+        Initialize the list view.
+
+        Args:
+            visible_rows: Maximum number of rows shown at once
+            row_cache_size: Number of rendered row surfaces to keep
+        """
+        self.visible_rows = visible_rows
+        self.row_cache_size = row_cache_size
+        self.scroll = 0  # First visible row in the filtered list
+        self.filter_text = ""
+        self._rows = []  # Deck indices that pass the filter
+        self._rows_key = None
+        self._row_cache = OrderedDict()  # (index, name, color) -> Surface
+
+    def rows(self, deck):
+        """
+        Get the deck indices that pass the current filter.
+
+        Recomputed only when the deck or the filter changes.
+
+        Args:
+            deck: Deck being viewed
+
+        Returns:
+            List of indices into deck.cards (index 0 is top)
+        """
+        key = (id(deck), deck.version, self.filter_text)
+        if key != self._rows_key:
+            needle = self.filter_text.lower()
+            if needle:
+                self._rows = [i for i, card in enumerate(deck.cards) if needle in card.name.lower()]
+            else:
+                self._rows = range(len(deck.cards))
+            self._rows_key = key
+            self._clamp_scroll()
+        return self._rows
+
+    def visible(self, deck):
+        """
+        Get the rows currently scrolled into view.
+
+        Args:
+            deck: Deck being viewed
+
+        Returns:
+            List of (deck_index, card) tuples
+        """
+        rows = self.rows(deck)
+        window = rows[self.scroll:self.scroll + self.visible_rows]
+        return [(index, deck.cards[index]) for index in window]
+
+    def row_surface(self, font, index, name, color):
+        """
+        Get a cached rendered surface for one row.
+
+        Args:
+            font: Font to render with
+            index: Deck index shown in the row
+            name: Card name
+            color: Text color
+
+        Returns:
+            Pygame surface for the row text
+        """
+        key = (index, name, color)
+        surface = self._row_cache.get(key)
+        if surface is not None:
+            self._row_cache.move_to_end(key)
+            return surface
+        surface = font.render(f"{index + 1}. {name}", True, color)
+        self._row_cache[key] = surface
+        if len(self._row_cache) > self.row_cache_size:
+            self._row_cache.popitem(last=False)
+        return surface
+
+    def memory_usage(self):
+        """Get (rows, bytes) held by the row surface cache."""
+        total = 0
+        for surface in self._row_cache.values():
+            width, height = surface.get_size()
+            total += width * height * surface.get_bytesize()
+        return len(self._row_cache), total
+
+    def scroll_by(self, delta):
+        """Scroll by a number of rows (positive moves toward the bottom)."""
+        self.scroll += delta
+        self._clamp_scroll()
+
+    def page(self, direction):
+        """Scroll by one page (direction is +1 or -1)."""
+        self.scroll_by(direction * self.visible_rows)
+
+    def jump_to(self, deck, deck_index):
+        """
+        Scroll so that a deck index is the first visible row.
+
+        Args:
+            deck: Deck being viewed
+            deck_index: Index into deck.cards (0 is top)
+        """
+        # Rows are sorted deck indices; find the first at or after deck_index
+        self.scroll = bisect_left(self.rows(deck), deck_index)
+        self._clamp_scroll()
+
+    def set_filter(self, text):
+        """Filter rows by case-insensitive card name substring."""
+        if text != self.filter_text:
+            self.filter_text = text
+            self.scroll = 0
+
+    def _clamp_scroll(self):
+        """Keep the scroll offset within the filtered list."""
+        max_scroll = max(0, len(self._rows) - self.visible_rows)
+        self.scroll = max(0, min(self.scroll, max_scroll))
+
+
+class CardBrowserView(DeckListView):
+    """List view over card search results; the filter text is the query.
+
+    While the query is being typed its last word is matched as a prefix, so
+    results narrow with every keystroke.
+    """
+
+    panel_width = 300
+    line_height = 22
+    padding = 8
+    header_height = 42
+
+    def __init__(self, index, visible_rows=20, row_cache_size=256):
+        """
+        Initialize the browser view.
+
+        Args:
+            index: CardIndex to search
+            visible_rows: Maximum number of rows shown at once
+            row_cache_size: Number of rendered row surfaces to keep
+        """
+        super().__init__(visible_rows, row_cache_size)
+        self.index = index
+
+    def query(self):
+        """Get the query actually run for the current filter text."""
+        text = self.filter_text
+        words = text.split()
+        if words and not text.endswith(" ") and not words[-1].endswith("*"):
+            last = words[-1]
+            # Only free-text words are completed; filters like "level>2" are used as typed
+            if last.replace("_", "").isalnum():
+                words[-1] = last + "*"
+        return " ".join(words)
+
+    def rows(self, deck=None):
+        """
+        Get the SearchResults for the current query.
+
+        Re-run only when the query or the index changes.
+
+        Returns:
+            SearchResults
+        """
+        key = (self.index.version, self.filter_text)
+        if key != self._rows_key:
+            self._rows = self.index.search(self.query())
+            self._rows_key = key
+            self._clamp_scroll()
+        return self._rows
+
+    def visible(self, deck=None):
+        """
+        Get the results currently scrolled into view; only this page is fetched.
+
+        Returns:
+            List of (result_position, card) tuples
+        """
+        cards = self.rows().page(self.scroll, self.visible_rows)
+        return list(enumerate(cards, self.scroll))
+
+    def card_at(self, x, y, sx, sy):
+        """
+        Find the result row under a screen point.
+
+        Args:
+            x, y: Top-left corner the panel is drawn at
+            sx, sy: Screen point
+
+        Returns:
+            Card, or None
+        """
+        list_y = y + self.padding + self.header_height
+        if not (x <= sx <= x + self.panel_width and sy >= list_y):
+            return None
+        row = int(sy - list_y) // self.line_height
+        visible = self.visible()
+        return visible[row][1] if row < len(visible) else None
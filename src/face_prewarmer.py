@@ -0,0 +1,103 @@
+"""
+Background pre-warming of card face surfaces on a thread pool.
+"""
+
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class FacePrewarmer:
+    """Rasterizes card faces on worker threads and publishes them to the renderer on the main thread."""
+
+    def __init__(self, renderer, workers=None, publish_budget=128):
+        """
+        Initialize the pre-warmer.
+
+        Args:
+            renderer: CardRenderer whose face cache is filled
+            workers: Number of worker threads (defaults to the CPU count, at most 4)
+            publish_budget: Maximum faces copied into the atlas per publish() call
+        """
+        self.renderer = renderer
+        self.publish_budget = publish_budget
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="face-prewarm")
+        self._pending = set()  # (card, scale, state) requests not yet published
+        self._ready = queue.Queue()  # Finished rasters waiting for the main thread
+        self.published = 0
+
+    def prewarm(self, cards, scale=1.0):
+        """
+        Queue faces for a batch of cards, e.g. right after a deck is loaded.
+
+        Args:
+            cards: Iterable of Card objects
+            scale: Zoom factor to rasterize at
+        """
+        renderer = self.renderer
+        for card in cards:
+            if not renderer.has_card_face(card, scale, "normal"):
+                self.request(card, scale, "normal")
+
+    def request(self, card, scale, state):
+        """
+        Queue one face variant unless it is already queued.
+
+        Args:
+            card: Card object
+            scale: Zoom factor
+            state: Border state ("normal", "hovered" or "selected")
+        """
+        key = (card, scale, state)
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        content_key = self.renderer.face_content_key(card)
+        self._executor.submit(self._build, key, content_key)
+
+    def is_pending(self, card, scale, state):
+        """Check whether a face variant is queued or being rasterized."""
+        return (card, scale, state) in self._pending
+
+    def busy(self):
+        """Check whether any face is still queued or waiting to be published."""
+        return bool(self._pending)
+
+    def publish(self):
+        """
+        Copy finished faces into the renderer's atlas. Must run on the main thread.
+
+        Returns:
+            Number of faces published
+        """
+        published = 0
+        while published < self.publish_budget:
+            try:
+                key, content_key, surface = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(key)
+            if surface is None:
+                continue
+            card, scale, state = key
+            if self.renderer.store_card_face(card, scale, state, content_key, surface):
+                published += 1
+        self.published += published
+        return published
+
+    def shutdown(self):
+        """Cancel queued work and wait for running workers to finish."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+
+    def _build(self, key, content_key):
+        """Worker: rasterize one face variant and hand it to the main thread."""
+        surface = None
+        try:
+            card, scale, state = key
+            surface = self.renderer.build_card_variant(card, scale, state)
+        finally:
+            # Always report back so the request never stays pending
+            self._ready.put((key, content_key, surface))
@@ -0,0 +1,66 @@
+"""
+Adaptive frame scheduling: sleep on input when idle, fixed-timestep simulation when active.
+"""
+
+import pygame
+
+
+class FrameScheduler:
+    """Decides when the game loop should block, render and advance the simulation."""
+
+    def __init__(self, tick_rate=60, max_fps=60, idle_timeout_ms=250, max_steps=5):
+        """
+        Initialize the scheduler.
+
+        Args:
+            tick_rate: Simulation ticks per second (fixed timestep)
+            max_fps: Render cap while active
+            idle_timeout_ms: Longest time to block waiting for input when idle
+            max_steps: Cap on simulation ticks run in one frame after a stall
+        """
+        self.tick_rate = tick_rate
+        self.step_ms = 1000.0 / tick_rate
+        self.max_fps = max_fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self._last_ms = None
+
+    def wait_for_event(self):
+        """
+        Block until an event arrives or the idle timeout expires.
+
+        Returns:
+            The event that woke the loop, or None on timeout
+        """
+        event = pygame.event.wait(self.idle_timeout_ms)
+        self.reset()
+        if event.type == pygame.NOEVENT:
+            return None
+        return event
+
+    def reset(self):
+        """Drop accumulated simulation time so an idle period is not replayed."""
+        self.accumulator = 0.0
+        self._last_ms = None
+
+    def steps_due(self):
+        """
+        Get the number of fixed simulation ticks to run this frame.
+
+        Returns:
+            Number of ticks (0 or more)
+        """
+        now = pygame.time.get_ticks()
+        if self._last_ms is None:
+            self._last_ms = now
+            return 1
+        self.accumulator += now - self._last_ms
+        self._last_ms = now
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_ms
+        return steps
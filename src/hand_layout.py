@@ -0,0 +1,141 @@
+"""
+Cached layout of the player's hand with batched tweening toward slot positions.
+"""
+
+from bisect import bisect_left
+
+
+class HandLayout:
+    """Computes hand slot positions only when the hand changes and animates cards into them."""
+
+    def __init__(self, x, y, width, height, tween_rate=18.0):
+        """
+        Initialize the hand layout.
+
+        Args:
+            x, y, width, height: Hand area rectangle
+            tween_rate: Exponential approach rate per second for card movement
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.tween_rate = tween_rate
+        self.slots = []  # (x, y) per hand index
+        self._slot_centers = []
+        self._dirty = True
+        self._count = 0
+        # card -> [current_x, current_y, target_x, target_y] for cards in motion
+        self.tweens = {}
+
+    def invalidate(self):
+        """
+        Mark the layout stale (hand contents, order or drag state changed).
+
+        Tweens stop until the next update(), which restarts them from where
+        the cards are, so a card that just left the hand is never moved again.
+        """
+        self._dirty = True
+        self.tweens.clear()
+
+    def update(self, cards):
+        """
+        Recompute slot positions if the hand changed since the last call.
+
+        Args:
+            cards: Ordered list of hand cards
+
+        Returns:
+            True if the layout was recomputed
+        """
+        if not self._dirty and len(cards) == self._count:
+            return False
+        self._dirty = False
+        self._count = len(cards)
+        self.slots = []
+        self._slot_centers = []
+        if not cards:
+            self.tweens.clear()
+            return True
+        card_width = cards[0].width
+        card_height = cards[0].height
+        available_width = self.width - 20
+        count = len(cards)
+        if count == 1:
+            gap = 0
+        else:
+            gap = (available_width - count * card_width) / (count - 1)
+            gap = max(10, min(30, gap))
+        total_width = count * card_width + (count - 1) * gap
+        start_x = self.x + (self.width - total_width) / 2
+        y = int(self.y + (self.height - card_height) / 2)
+        in_hand = set()
+        for idx, card in enumerate(cards):
+            x = int(start_x + idx * (card_width + gap))
+            self.slots.append((x, y))
+            self._slot_centers.append(x + card_width / 2)
+            in_hand.add(card)
+            if card.dragging:
+                # Skip positioning dragged cards
+                self.tweens.pop(card, None)
+            elif card.x != x or card.y != y:
+                self.tweens[card] = [float(card.x), float(card.y), x, y]
+        # Forget tweens for cards that have left the hand
+        for card in [c for c in self.tweens if c not in in_hand]:
+            del self.tweens[card]
+        return True
+
+    def insertion_index(self, x):
+        """
+        Get the hand index a card dropped at screen x should be inserted at.
+
+        Args:
+            x: Horizontal drop position
+
+        Returns:
+            Index into the hand list
+        """
+        return bisect_left(self._slot_centers, x)
+
+    def step(self, dt):
+        """
+        Advance every active tween by one tick.
+
+        Args:
+            dt: Tick length in seconds
+
+        Returns:
+            True if any card moved
+        """
+        if not self.tweens:
+            return False
+        factor = min(1.0, self.tween_rate * dt)
+        finished = []
+        for card, tween in self.tweens.items():
+            if card.dragging:
+                finished.append(card)
+                continue
+            cur_x, cur_y, target_x, target_y = tween
+            cur_x += (target_x - cur_x) * factor
+            cur_y += (target_y - cur_y) * factor
+            if abs(target_x - cur_x) < 0.5 and abs(target_y - cur_y) < 0.5:
+                card.set_position(target_x, target_y)
+                finished.append(card)
+            else:
+                tween[0] = cur_x
+                tween[1] = cur_y
+                card.set_position(int(round(cur_x)), int(round(cur_y)))
+        for card in finished:
+            del self.tweens[card]
+        return True
+
+    def snap(self):
+        """Move every tweening card straight to its slot."""
+        for card, (_, _, target_x, target_y) in self.tweens.items():
+            if not card.dragging:
+                card.set_position(target_x, target_y)
+        self.tweens.clear()
+
+    def is_animating(self):
+        """Check whether any card is still moving toward its slot."""
+        return bool(self.tweens)
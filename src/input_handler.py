@@ -2,6 +2,22 @@
 Handles mouse and keyboard input for the game.
 """
 
+import pygame
+
+# Event types the game reacts to; everything else is dropped by SDL before
+# it reaches the queue. Expose events only trigger a redraw.
+ALLOWED_EVENTS = [
+    pygame.QUIT,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEWHEEL,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+]
+
 
 class InputHandler:
     """Manages user input and card interaction."""
@@ -12,10 +28,131 @@ class InputHandler:
         self.mouse_y = 0
         self.mouse_clicked = False
         self.mouse_down = False
+        self.shift_down = False
+        # Card grabbed by the cursor, and every card moving with it (grabbed card first)
         self.dragged_card = None
-        self.released_card = None
-        self.drag_offset_x = 0
-        self.drag_offset_y = 0
+        self.drag_group = []
+        self.released_cards = []
+        # Cards stay put while dragging; the group is drawn translated by
+        # (drag_dx, drag_dy) and positions are committed once on release
+        self.drag_start_x = 0
+        self.drag_start_y = 0
+        self.drag_dx = 0
+        self.drag_dy = 0
+        # Maps screen mouse position into the dragged card's coordinate space
+        self.drag_transform = None
+        # Frame counter and optional record/replay hooks
+        self.frame_index = 0
+        self.recorder = None
+        self.replay = None
+        # Events picked up while the loop was blocked waiting for input
+        self.pending_events = []
+        # Motion events merged away by coalescing (for profiling)
+        self.coalesced_events = 0
+        self._updaters = {
+            pygame.KEYDOWN: self._on_key,
+            pygame.KEYUP: self._on_key,
+            pygame.MOUSEMOTION: self._on_motion,
+            pygame.MOUSEBUTTONDOWN: self._on_button_down,
+            pygame.MOUSEBUTTONUP: self._on_button_up,
+        }
+    
+    @staticmethod
+    def install_event_filter():
+        """Block every event type the game does not use. Call after the display is created."""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
+    
+    def poll_events(self):
+        """
+        Collect this frame's events from pygame or from an active replay.
+        
+        The whole queue is drained at once. The raw stream is recorded, then
+        runs of motion events are merged so a high-rate mouse costs no more
+        per frame than a slow one.
+        
+        Returns:
+            List of pygame events for the current frame
+        """
+        if self.replay is not None:
+            events = self.replay.events_for(self.frame_index)
+        else:
+            events = pygame.event.get()
+            if self.pending_events:
+                events = self.pending_events + events
+                self.pending_events = []
+        if self.recorder is not None:
+            self.recorder.record(self.frame_index, events)
+        self.frame_index += 1
+        return self.coalesce(events)
+    
+    def simulation_steps(self, scheduler):
+        """
+        Get the number of fixed simulation ticks to run this frame.
+
+        Live sessions ask the scheduler and record its answer; replays run
+        the recorded count so the simulation sees the same ticks between
+        the same events.
+
+        Args:
+            scheduler: FrameScheduler for live frames
+
+        Returns:
+            Number of ticks (0 or more)
+        """
+        frame_index = self.frame_index - 1
+        if self.replay is not None:
+            return self.replay.steps_for(frame_index)
+        steps = scheduler.steps_due()
+        if self.recorder is not None:
+            self.recorder.record_steps(frame_index, steps)
+        return steps
+    
+    def coalesce(self, events):
+        """
+        Merge consecutive MOUSEMOTION events into one.
+        
+        The merged event has the last position and buttons and the summed
+        relative motion, so both absolute and relative consumers see the same
+        result. Other events keep their order.
+        
+        Args:
+            events: List of pygame events
+        
+        Returns:
+            New list of events
+        """
+        merged = []
+        run_rel_x = run_rel_y = 0
+        last_motion = None
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                if last_motion is not None:
+                    self.coalesced_events += 1
+                last_motion = event
+                run_rel_x += event.rel[0]
+                run_rel_y += event.rel[1]
+                continue
+            if last_motion is not None:
+                merged.append(self._motion(last_motion, run_rel_x, run_rel_y))
+                last_motion = None
+                run_rel_x = run_rel_y = 0
+            merged.append(event)
+        if last_motion is not None:
+            merged.append(self._motion(last_motion, run_rel_x, run_rel_y))
+        return merged
+    
+    @staticmethod
+    def _motion(last, rel_x, rel_y):
+        """Build the merged motion event for a run ending in last."""
+        if last.rel == (rel_x, rel_y):
+            return last
+        return pygame.event.Event(pygame.MOUSEMOTION, pos=last.pos, rel=(rel_x, rel_y),
+                                  buttons=last.buttons)
+    
+    def replay_finished(self):
+        """Check whether an active replay has delivered all of its frames."""
+        return self.replay is not None and self.replay.is_finished(self.frame_index)
     
     def update(self, event):
         """
@@ -24,51 +161,94 @@ class InputHandler:
         Args:
             event: Pygame event to process
         """
-        if event.type == pygame.MOUSEMOTION:
-            self.mouse_x, self.mouse_y = event.pos
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1:  # Left mouse button
-                self.mouse_down = True
-                self.mouse_clicked = True
-        elif event.type == pygame.MOUSEBUTTONUP:
-            if event.button == 1:  # Left mouse button
-                self.mouse_down = False
-                self.end_drag()
-    
-    def start_drag(self, card):
+        updater = self._updaters.get(event.type)
+        if updater is not None:
+            updater(event)
+    
+    def _on_key(self, event):
+        """Track Shift from events (not pygame.key) so recordings replay identically."""
+        if event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
+            self.shift_down = event.type == pygame.KEYDOWN
+    
+    def _on_motion(self, event):
+        """Track the cursor."""
+        self.mouse_x, self.mouse_y = event.pos
+    
+    def _on_button_down(self, event):
+        """Track the cursor and left-button state."""
+        self.mouse_x, self.mouse_y = event.pos
+        if event.button == 1:  # Left mouse button
+            self.mouse_down = True
+            self.mouse_clicked = True
+    
+    def _on_button_up(self, event):
+        """Track the cursor and end a drag on left-button release."""
+        self.mouse_x, self.mouse_y = event.pos
+        if event.button == 1:  # Left mouse button
+            self.mouse_down = False
+            self.end_drag()
+    
+    def start_drag(self, card, transform=None, group=None):
         """
-        Start dragging a card.
+        Start dragging a card, optionally together with other cards.
         
         Args:
-            card: Card to drag
+            card: Card under the cursor
+            transform: Optional function mapping screen (x, y) to the cards'
+                coordinate space, e.g. Camera.screen_to_world for table cards
+            group: Optional iterable of cards that move with it (may include card)
         """
         self.dragged_card = card
-        card.dragging = True
-        card.selected = True
-        self.drag_offset_x = self.mouse_x - card.x
-        self.drag_offset_y = self.mouse_y - card.y
+        self.drag_group = [card]
+        if group is not None:
+            self.drag_group.extend(c for c in group if c is not card)
+        for member in self.drag_group:
+            member.dragging = True
+        self.drag_transform = transform
+        self.drag_start_x, self.drag_start_y = self.drag_position()
+        self.drag_dx = 0
+        self.drag_dy = 0
+    
+    def drag_position(self):
+        """Get the mouse position in the dragged cards' coordinate space."""
+        if self.drag_transform is not None:
+            return self.drag_transform(self.mouse_x, self.mouse_y)
+        return self.mouse_x, self.mouse_y
     
     def update_drag(self):
-        """Update position of card being dragged."""
+        """
+        Update the translation of the dragged group.
+        
+        Costs the same however many cards are dragged.
+        
+        Returns:
+            True if the group moved
+        """
         if self.dragged_card:
-            self.dragged_card.x = self.mouse_x - self.drag_offset_x
-            self.dragged_card.y = self.mouse_y - self.drag_offset_y
-            self.dragged_card.update_rect()
+            mouse_x, mouse_y = self.drag_position()
+            dx = int(mouse_x - self.drag_start_x)
+            dy = int(mouse_y - self.drag_start_y)
+            if dx == self.drag_dx and dy == self.drag_dy:
+                return False
+            self.drag_dx = dx
+            self.drag_dy = dy
+            return True
+        return False
     
     def end_drag(self):
-        """End dragging operation."""
+        """End dragging: commit the group's positions and expose it for drop handling."""
         if self.dragged_card:
-            self.dragged_card.dragging = False
-            self.dragged_card.selected = False
-            # Expose the released card for drop handling
-            self.released_card = self.dragged_card
+            for card in self.drag_group:
+                card.dragging = False
+                card.set_position(card.x + self.drag_dx, card.y + self.drag_dy)
+            # Released cards, grabbed card first
+            self.released_cards = self.drag_group
             self.dragged_card = None
+            self.drag_group = []
+            self.drag_transform = None
+            self.drag_dx = 0
+            self.drag_dy = 0
     
     def reset_click(self):
         """Reset click flag after processing."""
         self.mouse_clicked = False
-
-
-# Need to import pygame at module level
-import pygame
-
@@ -0,0 +1,175 @@
+"""
+Record and replay raw pygame input streams for deterministic sessions.
+"""
+
+import gzip
+import json
+
+import pygame
+
+FORMAT_VERSION = 2
+# Version 1 recordings hold no tick counts; they replay one tick per frame
+SUPPORTED_VERSIONS = (1, 2)
+
+# Event types worth recording, with the attributes needed to rebuild them
+RECORDED_EVENTS = {
+    "quit": (pygame.QUIT, ()),
+    "motion": (pygame.MOUSEMOTION, ("pos", "rel", "buttons")),
+    "down": (pygame.MOUSEBUTTONDOWN, ("pos", "button")),
+    "up": (pygame.MOUSEBUTTONUP, ("pos", "button")),
+    "wheel": (pygame.MOUSEWHEEL, ("x", "y")),
+    "keydown": (pygame.KEYDOWN, ("key", "mod", "unicode", "scancode")),
+    "keyup": (pygame.KEYUP, ("key", "mod", "scancode")),
+}
+_CODES_BY_TYPE = {event_type: code for code, (event_type, _) in RECORDED_EVENTS.items()}
+
+
+class InputRecorder:
+    """Captures the raw event stream and simulation tick counts per frame along with the session seed."""
+
+    def __init__(self, seed, initial_cards=None):
+        """
+        Initialize the recorder.
+
+        Args:
+            seed: RNG seed the session was started with
+            initial_cards: Serialized cards present on the table at start
+        """
+        self.seed = seed
+        self.initial_cards = initial_cards or []
+        self.frames = []  # [frame_index, [[code, attrs], ...]] for frames with input
+        self.steps = []  # Simulation ticks run in each frame, indexed by frame
+
+    def record(self, frame_index, events):
+        """
+        Record the events delivered in a frame.
+
+        Args:
+            frame_index: Index of the frame the events were processed in
+            events: List of pygame events
+        """
+        encoded = []
+        for event in events:
+            code = _CODES_BY_TYPE.get(event.type)
+            if code is None:
+                continue
+            attrs = {}
+            for key in RECORDED_EVENTS[code][1]:
+                value = getattr(event, key, None)
+                if isinstance(value, tuple):
+                    value = list(value)
+                attrs[key] = value
+            encoded.append([code, attrs])
+        if encoded:
+            self.frames.append([frame_index, encoded])
+
+    def record_steps(self, frame_index, steps):
+        """
+        Record how many fixed simulation ticks a frame ran.
+
+        Args:
+            frame_index: Index of the frame
+            steps: Number of ticks run
+        """
+        while len(self.steps) < frame_index:
+            self.steps.append(0)
+        self.steps.append(steps)
+
+    def save(self, path):
+        """
+        Write the recording as gzip-compressed JSON.
+
+        Args:
+            path: Output file path
+        """
+        data = {
+            "version": FORMAT_VERSION,
+            "seed": self.seed,
+            "initial_cards": self.initial_cards,
+            "frames": self.frames,
+            "steps": self.steps,
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+
+class InputReplay:
+    """Feeds a recorded event stream back frame by frame."""
+
+    def __init__(self, seed, initial_cards, frames, steps=None):
+        """
+        Initialize the replay.
+
+        Args:
+            seed: RNG seed to restore before replaying
+            initial_cards: Serialized cards present on the table at start
+            frames: Recorded [frame_index, events] pairs
+            steps: Recorded simulation ticks per frame (None replays one tick per frame)
+        """
+        self.seed = seed
+        self.initial_cards = initial_cards
+        self.frames = {}
+        for frame_index, encoded in frames:
+            self.frames[frame_index] = [self._decode(code, attrs) for code, attrs in encoded]
+        self.steps = steps
+        self.last_frame = max(self.frames) if self.frames else -1
+        if steps:
+            self.last_frame = max(self.last_frame, len(steps) - 1)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a recording written by InputRecorder.save.
+
+        Args:
+            path: Recording file path
+
+        Returns:
+            InputReplay object
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported recording version: {data.get('version')}")
+        return cls(data["seed"], data.get("initial_cards", []), data["frames"], data.get("steps"))
+
+    @staticmethod
+    def _decode(code, attrs):
+        """Rebuild a pygame event from its recorded form."""
+        event_type = RECORDED_EVENTS[code][0]
+        kwargs = {}
+        for key, value in attrs.items():
+            kwargs[key] = tuple(value) if isinstance(value, list) else value
+        return pygame.event.Event(event_type, kwargs)
+
+    def events_for(self, frame_index):
+        """
+        Get the events recorded for a frame.
+
+        Args:
+            frame_index: Frame index to look up
+
+        Returns:
+            List of pygame events (empty if none were recorded)
+        """
+        return self.frames.get(frame_index, [])
+
+    def steps_for(self, frame_index):
+        """
+        Get the number of simulation ticks a frame ran when it was recorded.
+
+        Args:
+            frame_index: Frame index to look up
+
+        Returns:
+            Number of ticks (1 for recordings without tick counts)
+        """
+        if self.steps is None:
+            return 1
+        if frame_index < len(self.steps):
+            return self.steps[frame_index]
+        return 0
+
+    def is_finished(self, frame_index):
+        """Check whether every recorded frame has been replayed."""
+        return frame_index > self.last_frame
@@ -0,0 +1,324 @@
+"""
+Opt-in memory accounting: live object counts per subsystem and tracemalloc growth per module.
+"""
+
+import os
+import sys
+import sysconfig
+import time
+import tracemalloc
+from collections import Counter, deque
+
+import pygame
+
+# Fonts hold their face file in memory; pygame does not report more than that
+_DEFAULT_FONT = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+FONT_BYTES = os.path.getsize(_DEFAULT_FONT) if os.path.exists(_DEFAULT_FONT) else 0
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_LIBRARY_DIRS = sorted({os.path.abspath(path) for key, path in sysconfig.get_paths().items()
+                        if key in ("stdlib", "platstdlib", "purelib", "platlib")}, key=len, reverse=True)
+
+# Allocation sites left out of growth: the tracers themselves and import machinery
+_IGNORED_FILES = {tracemalloc.__file__, __file__, "<unknown>"}
+_IGNORED_PREFIX = "<frozen importlib._bootstrap"
+
+# Cards measured per sample; the rest are extrapolated so a sample stays cheap
+CARD_SAMPLE = 128
+
+
+def module_of(filename):
+    """
+    Attribute an allocation site to a module.
+
+    Returns:
+        Path relative to the project for its own files ("src/renderer.py"),
+        else the top-level package of a library ("json", "pygame")
+    """
+    path = os.path.abspath(filename)
+    if path.startswith(_ROOT + os.sep):
+        return os.path.relpath(path, _ROOT)
+    for directory in _LIBRARY_DIRS:
+        if path.startswith(directory + os.sep):
+            top = os.path.relpath(path, directory).split(os.sep)[0]
+            return top[:-3] if top.endswith(".py") else top
+    return filename
+
+
+def card_bytes(cards, sample=CARD_SAMPLE):
+    """
+    Approximate the memory of cards.
+
+    Args:
+        cards: List of cards
+        sample: Cards measured (evenly spread); the total is scaled up from them
+
+    Returns:
+        (object bytes, attribute bytes): the card objects with their
+        instance dicts, and their attributes dicts with the values
+    """
+    getsizeof = sys.getsizeof
+    step = max(1, len(cards) // sample)
+    measured = cards[::step]
+    objects = 0
+    attributes = 0
+    for card in measured:
+        objects += getsizeof(card) + getsizeof(card.__dict__)
+        attributes += getsizeof(card.attributes)
+        for value in card.attributes.values():
+            attributes += getsizeof(value)
+    if not measured:
+        return 0, 0
+    scale = len(cards) / len(measured)
+    return int(objects * scale), int(attributes * scale)
+
+
+def deck_bytes(decks):
+    """Approximate the memory of decks (their card lists and instance dicts, not the cards)."""
+    getsizeof = sys.getsizeof
+    return sum(getsizeof(deck) + getsizeof(deck.__dict__) + getsizeof(deck.cards) for deck in decks)
+
+
+def zone_usage(cards, decks):
+    """
+    Build the accounting rows for the cards and decks in play.
+
+    Args:
+        cards: List of distinct cards
+        decks: List of decks
+
+    Returns:
+        Dict of row label -> (count, bytes), as returned by a probe
+    """
+    objects, attributes = card_bytes(cards)
+    return {"cards": (len(cards), objects),
+            "card attributes": (len(cards), attributes),
+            "decks": (len(decks), deck_bytes(decks))}
+
+
+class MemoryTracker:
+    """Samples subsystem memory and tracemalloc snapshots between frames or after actions."""
+
+    def __init__(self, interval=1.0, top=8, frames=1, history=600, diff_budget=0.05):
+        """
+        Initialize the tracker (nothing is traced until it is enabled).
+
+        Args:
+            interval: Seconds between samples taken at frame ends
+            top: Number of modules listed by growth
+            frames: Stack frames kept per traced allocation
+            history: Number of samples kept for the report
+            diff_budget: Share of wall time spent on per-module snapshot
+                diffs, whose cost grows with the number of live allocations
+        """
+        self.enabled = False
+        self.show_overlay = False
+        self.interval = interval
+        self.diff_budget = diff_budget
+        self.top = top
+        self.frames = frames
+        self.probes = []  # (name, callable returning (count, bytes))
+        self.rows = []  # Latest accounting: (name, count, bytes)
+        self.growth = []  # Growth over the latest diff: (module, bytes, blocks)
+        self.label = None  # What the latest diff followed ("frames" and/or actions)
+        self.diff_cost = 0.0  # Seconds the latest snapshot diff took
+        self.traced = 0  # Bytes traced by tracemalloc at the latest sample
+        self.peak = 0
+        self.samples = deque(maxlen=history)  # (seconds since enabled, label, traced bytes)
+        self._baseline = None
+        self._previous = None
+        self._pending = None
+        self._since_diff = Counter()  # Sample labels since the latest diff
+        self._last_sample = 0.0
+        self._last_diff = 0.0
+        self._started = 0.0
+        self._owns_tracing = False
+
+    def add_probe(self, name, probe):
+        """
+        Report a subsystem in the accounting.
+
+        Args:
+            name: Row label
+            probe: Callable returning (live count, approximate bytes), or a
+                dict of row label -> (count, bytes) for several rows; a
+                "fonts" row without bytes is estimated from the font file
+        """
+        self.probes.append((name, probe))
+
+    def toggle(self):
+        """Toggle tracing and the on-screen overlay together."""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+            self.show_overlay = True
+
+    def enable(self):
+        """Start tracing allocations and take the baseline sample."""
+        if self.enabled:
+            return
+        self.enabled = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+        self._started = time.perf_counter()
+        self._baseline = None
+        self._previous = None
+        self._since_diff.clear()
+        self.samples.clear()
+        self.sample("start", diff=True)
+
+    def disable(self):
+        """Stop tracing (if this tracker started it) and drop the snapshots."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.show_overlay = False
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        self._baseline = None
+        self._previous = None
+
+    def action(self, label):
+        """Note a user action; the next end_frame() samples what it allocated."""
+        if self.enabled:
+            self._pending = label
+
+    def end_frame(self):
+        """
+        Take a sample after a noted action, or once per interval.
+
+        Returns:
+            True if a sample was taken
+        """
+        if not self.enabled:
+            return False
+        if self._pending is None and time.perf_counter() - self._last_sample < self.interval:
+            return False
+        self.sample(self._pending or "frames")
+        return True
+
+    def sample(self, label, diff=None):
+        """
+        Refresh the accounting, and diff a tracemalloc snapshot against the previous one when due.
+
+        Args:
+            label: What happened since the previous sample
+            diff: True to force the snapshot diff, False to skip it; by
+                default it runs once the interval and the diff budget allow
+        """
+        self._pending = None
+        self.rows = self.accounting()
+        self.traced, self.peak = tracemalloc.get_traced_memory()
+        now = time.perf_counter()
+        self._last_sample = now
+        self.samples.append((now - self._started, label, self.traced))
+        self._since_diff[label] += 1
+        if diff is None:
+            # A diff walks every live allocation: with many of them, diff less often
+            diff = now - self._last_diff >= max(self.interval, self.diff_cost / self.diff_budget)
+        if diff:
+            self._take_diff()
+
+    def _take_diff(self):
+        """Snapshot the traced allocations and group their growth since the previous snapshot by module."""
+        started = time.perf_counter()
+        snapshot = self._snapshot()
+        if self._previous is not None:
+            self.growth = self._diff(snapshot, self._previous)[:self.top]
+        if self._baseline is None:
+            self._baseline = snapshot
+        self._previous = snapshot
+        self.label = ", ".join(label if count == 1 else f"{label} x{count}"
+                               for label, count in self._since_diff.items())
+        self._since_diff.clear()
+        self._last_diff = time.perf_counter()
+        self.diff_cost = self._last_diff - started
+
+    def accounting(self):
+        """
+        Count live objects and cached memory per subsystem, as reported by the probes.
+
+        Returns:
+            List of (name, count, bytes) rows
+        """
+        rows = []
+        for name, probe in self.probes:
+            usage = probe()
+            if not isinstance(usage, dict):
+                usage = {name: usage}
+            for label, (count, size) in usage.items():
+                if label == "fonts" and not size:
+                    size = count * FONT_BYTES
+                rows.append((label, count, size))
+        return rows
+
+    def growth_since_start(self):
+        """
+        Get the growth per module since tracing was enabled.
+
+        Returns:
+            List of (module, bytes, blocks), largest growth first
+        """
+        if self._baseline is None or self._previous is None:
+            return []
+        return self._diff(self._previous, self._baseline)
+
+    def report(self):
+        """
+        Build a text report of the latest sample.
+
+        Returns:
+            List of lines
+        """
+        lines = [f"traced {self.traced / 1048576:.1f} MB (peak {self.peak / 1048576:.1f} MB), "
+                 f"{len(self.samples)} samples, last diff took {self.diff_cost * 1000:.0f} ms"]
+        lines.append(f"{'subsystem':<18}{'count':>9}{'MB':>10}")
+        for name, count, size in self.rows:
+            lines.append(f"{name:<18}{count:>9}{size / 1048576:>10.2f}")
+        for title, growth in ((f"growth over last diff ({self.label})", self.growth),
+                              ("growth since start", self.growth_since_start()[:self.top])):
+            lines.append(title)
+            for module, size, blocks in growth:
+                lines.append(f"  {module:<30}{size / 1024:>+10.1f} KB {blocks:>+8} blocks")
+        lines.append("traced memory per sample (s, label, MB)")
+        for elapsed, label, traced in self.samples:
+            lines.append(f"  {elapsed:8.1f}  {label:<12}{traced / 1048576:8.2f}")
+        return lines
+
+    def dump(self, path):
+        """
+        Take a sample and write the report to a text file.
+
+        Returns:
+            Number of lines written
+        """
+        if self.enabled:
+            self.sample(self._pending or "report", diff=True)
+        lines = self.report()
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return len(lines)
+
+    @staticmethod
+    def _snapshot():
+        """Take a snapshot (the tracers' own allocations are skipped when diffing)."""
+        return tracemalloc.take_snapshot()
+
+    @staticmethod
+    def _diff(snapshot, previous):
+        """Group a snapshot comparison by module, largest growth first."""
+        modules = {}
+        # Filtering the few per-file stats is far cheaper than filtering every trace
+        for stat in snapshot.compare_to(previous, "filename"):
+            filename = stat.traceback[0].filename
+            if filename in _IGNORED_FILES or filename.startswith(_IGNORED_PREFIX):
+                continue
+            module = module_of(filename)
+            size, blocks = modules.get(module, (0, 0))
+            modules[module] = (size + stat.size_diff, blocks + stat.count_diff)
+        growth = [(module, size, blocks) for module, (size, blocks) in modules.items() if size or blocks]
+        growth.sort(key=lambda item: item[1], reverse=True)
+        return growth
@@ -0,0 +1,69 @@
+"""
+Wire format and transport helpers shared by the table server and client.
+
+Messages are JSON objects, one per line. Card states travel as
+[zone, position, x, y, face_up] lists (or null for "not in play"), where
+zone is "table", "deck" or "hand:<seat>"; position is the index in the
+deck or hand, and x/y are only used on the table.
+"""
+
+import asyncio
+import json
+
+# Most messages are a few hundred bytes; a full-state welcome can be large
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+def encode(message):
+    """Encode a message dict as one line of compact JSON."""
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode(line):
+    """Decode a line written by encode()."""
+    return json.loads(line)
+
+
+async def read_message(reader):
+    """
+    Read the next message from a stream.
+
+    Returns:
+        Message dict, or None when the connection closed
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    return decode(line)
+
+
+def parse_address(address):
+    """
+    Parse a server address.
+
+    Args:
+        address: "host:port" for TCP or "unix:/path/to/socket"
+
+    Returns:
+        ("unix", path) or ("tcp", (host, port))
+    """
+    if address.startswith("unix:"):
+        return ("unix", address[5:])
+    host, _, port = address.rpartition(":")
+    return ("tcp", (host or "127.0.0.1", int(port)))
+
+
+async def open_connection(address):
+    """Connect to a server address, returning (reader, writer)."""
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(target, limit=MAX_MESSAGE_BYTES)
+    return await asyncio.open_connection(*target, limit=MAX_MESSAGE_BYTES)
+
+
+async def start_server(handler, address):
+    """Listen on a server address, calling handler(reader, writer) per connection."""
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return await asyncio.start_unix_server(handler, target, limit=MAX_MESSAGE_BYTES)
+    return await asyncio.start_server(handler, *target, limit=MAX_MESSAGE_BYTES)
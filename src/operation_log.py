@@ -0,0 +1,135 @@
+"""
+Bounded operation log with undo/redo and periodic snapshots.
+"""
+
+from collections import deque
+
+
+class OperationLog:
+    """Keeps recent state-changing operations as small deltas, plus occasional full snapshots.
+
+    Positions count operations applied since the session started. Each
+    operation is a dict holding enough before/after data to be undone and
+    redone by the owner; the log only decides which operations to step
+    through and when a snapshot is the cheaper way to get somewhere.
+    """
+
+    def __init__(self, history=1000, snapshot_interval=250, snapshot_cost=50):
+        """
+        Initialize the log.
+
+        Args:
+            history: Maximum number of operations kept for undo/redo
+            snapshot_interval: Take a snapshot every this many operations
+            snapshot_cost: Estimated cost of restoring a snapshot, in operations;
+                seek() restores one when that beats stepping through deltas
+        """
+        self.history = history
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_cost = snapshot_cost
+        self.ops = deque()  # Operations at positions base .. base + len(ops) - 1
+        self.base = 0
+        self.position = 0  # Operations before this position are applied
+        self.snapshots = {}  # position -> state snapshot taken at that position
+
+    def __len__(self):
+        return len(self.ops)
+
+    def record(self, op):
+        """
+        Append an operation that has just been applied.
+
+        Discards anything that could have been redone, then trims the
+        history window.
+
+        Args:
+            op: Operation dict
+        """
+        while self.base + len(self.ops) > self.position:
+            self.ops.pop()
+        for position in [p for p in self.snapshots if p > self.position]:
+            del self.snapshots[position]
+        self.ops.append(op)
+        self.position += 1
+        while len(self.ops) > self.history:
+            self.ops.popleft()
+            self.base += 1
+        for position in [p for p in self.snapshots if p < self.base]:
+            del self.snapshots[position]
+
+    def wants_snapshot(self):
+        """Check whether a snapshot should be taken at the current position."""
+        return self.position % self.snapshot_interval == 0 and self.position not in self.snapshots
+
+    def add_snapshot(self, snapshot):
+        """Store a snapshot of the state at the current position."""
+        self.snapshots[self.position] = snapshot
+
+    def can_undo(self):
+        """Check whether an operation can be undone."""
+        return self.position > self.base
+
+    def can_redo(self):
+        """Check whether an undone operation can be redone."""
+        return self.position < self.base + len(self.ops)
+
+    def undo(self):
+        """
+        Step back one operation.
+
+        Returns:
+            The operation to revert, or None if there is nothing to undo
+        """
+        if not self.can_undo():
+            return None
+        self.position -= 1
+        return self.ops[self.position - self.base]
+
+    def redo(self):
+        """
+        Step forward one operation.
+
+        Returns:
+            The operation to re-apply, or None if there is nothing to redo
+        """
+        if not self.can_redo():
+            return None
+        op = self.ops[self.position - self.base]
+        self.position += 1
+        return op
+
+    def seek(self, target, revert, apply, restore):
+        """
+        Move to any position in the window along the cheapest route.
+
+        Either steps through deltas from the current position, or restores
+        the nearest snapshot and steps from there.
+
+        Args:
+            target: Position to reach (clamped to the window)
+            revert: Callable undoing one operation
+            apply: Callable re-applying one operation
+            restore: Callable restoring a snapshot
+
+        Returns:
+            Number of operations stepped through
+        """
+        target = max(self.base, min(target, self.base + len(self.ops)))
+        best_cost = abs(self.position - target)
+        best_snapshot = None
+        for position in self.snapshots:
+            cost = self.snapshot_cost + abs(position - target)
+            if cost < best_cost:
+                best_cost = cost
+                best_snapshot = position
+        if best_snapshot is not None:
+            restore(self.snapshots[best_snapshot])
+            self.position = best_snapshot
+        steps = 0
+        while self.position > target:
+            revert(self.undo())
+            steps += 1
+        while self.position < target:
+            apply(self.redo())
+            steps += 1
+        return steps
@@ -0,0 +1,165 @@
+"""
+Frame-phase profiler for measuring where time goes in the game loop.
+"""
+
+import json
+import time
+from collections import deque
+
+
+class FrameProfiler:
+    """Times named phases of each frame and keeps rolling statistics."""
+
+    def __init__(self, window=300, trace_limit=10000):
+        """
+        Initialize the profiler.
+
+        Args:
+            window: Number of recent frames used for rolling percentiles
+            trace_limit: Maximum number of per-frame traces kept for dumping
+        """
+        self.enabled = False
+        self.show_overlay = False
+        self.window = window
+        self.frame_count = 0
+        self.samples = {}  # phase name -> deque of durations in ms
+        self.counters = {}  # counter name -> value recorded this frame
+        self.frame_times = deque(maxlen=window)
+        self.traces = deque(maxlen=trace_limit)
+        self._timer = time.perf_counter
+        self._starts = {}
+        self._current = {}
+        self._frame_start = None
+
+    def toggle(self):
+        """Toggle profiling and the on-screen overlay together."""
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self._frame_start = None
+        self._starts.clear()
+        self._current = {}
+
+    def begin_frame(self):
+        """Mark the start of a frame."""
+        if not self.enabled:
+            return
+        self._frame_start = self._timer()
+        self._current = {}
+
+    def start(self, phase):
+        """
+        Start timing a phase within the current frame.
+
+        Args:
+            phase: Phase name, e.g. "update" or "render.cards"
+        """
+        if not self.enabled:
+            return
+        self._starts[phase] = self._timer()
+
+    def stop(self, phase):
+        """
+        Stop timing a phase and accumulate its duration for this frame.
+
+        Args:
+            phase: Phase name passed to start()
+        """
+        if not self.enabled:
+            return
+        started = self._starts.pop(phase, None)
+        if started is None:
+            return
+        elapsed = (self._timer() - started) * 1000.0
+        self._current[phase] = self._current.get(phase, 0.0) + elapsed
+
+    def count(self, name, value):
+        """
+        Record a per-frame counter (e.g. blit count) in the frame trace.
+
+        Args:
+            name: Counter name
+            value: Counter value for this frame
+        """
+        if not self.enabled:
+            return
+        self.counters[name] = value
+
+    def end_frame(self):
+        """Finish the current frame and fold its timings into the rolling window."""
+        if not self.enabled or self._frame_start is None:
+            return
+        frame_ms = (self._timer() - self._frame_start) * 1000.0
+        self.frame_times.append(frame_ms)
+        for phase, elapsed in self._current.items():
+            history = self.samples.get(phase)
+            if history is None:
+                history = deque(maxlen=self.window)
+                self.samples[phase] = history
+            history.append(elapsed)
+        trace = dict(self._current)
+        if self.counters:
+            trace["counters"] = self.counters
+            self.counters = {}
+        trace["frame"] = self.frame_count
+        trace["total"] = frame_ms
+        self.traces.append(trace)
+        self.frame_count += 1
+        self._frame_start = None
+
+    def fps(self):
+        """
+        Get the average frames per second over the rolling window.
+
+        Returns:
+            Frames per second, or 0.0 if no frames were recorded
+        """
+        if not self.frame_times:
+            return 0.0
+        mean = sum(self.frame_times) / len(self.frame_times)
+        return 1000.0 / mean if mean > 0 else 0.0
+
+    def percentiles(self, phase, pcts=(50, 95, 99)):
+        """
+        Get rolling percentiles for a phase.
+
+        Args:
+            phase: Phase name, or "total" for whole-frame time
+            pcts: Percentiles to compute
+
+        Returns:
+            Tuple of durations in ms (zeros if the phase has no samples)
+        """
+        history = self.frame_times if phase == "total" else self.samples.get(phase)
+        if not history:
+            return tuple(0.0 for _ in pcts)
+        ordered = sorted(history)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(round(p / 100.0 * last)))] for p in pcts)
+
+    def summary(self):
+        """
+        Get percentile rows for every phase seen so far.
+
+        Returns:
+            List of (phase, p50, p95, p99) tuples in ms, sorted by phase name
+        """
+        rows = []
+        for phase in sorted(self.samples):
+            rows.append((phase,) + self.percentiles(phase))
+        rows.append(("total",) + self.percentiles("total"))
+        return rows
+
+    def dump_trace(self, path):
+        """
+        Write the recorded per-frame traces to a JSON-lines file.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Number of frames written
+        """
+        with open(path, 'w') as f:
+            for trace in self.traces:
+                f.write(json.dumps(trace) + "\n")
+        return len(self.traces)
@@ -2,8 +2,48 @@
 Rendering system for drawing cards and visual elements.
 """
 
+import threading
+import weakref
+
 import pygame
 
+from .text_layout import TextLayout
+from .texture_atlas import TextureAtlas
+
+# Bump when the look of card faces changes, so persisted renders (thumbnails) are redone
+FACE_VERSION = 1
+
+# Below this zoom, card faces are drawn without text (level of detail)
+LOD_TEXT_SCALE = 0.7
+
+# Minimum height of the rules text box at the bottom of a card face
+RULES_MIN_HEIGHT = 14
+
+# Elevation effects (sizes in pixels at zoom 1.0)
+SHADOW_RADIUS = 8  # Blur radius of the drag shadow
+SHADOW_OFFSET = 6  # How far the shadow falls below-right of a lifted card
+SHADOW_ALPHA = 110
+GLOW_RADIUS = 8
+GLOW_STYLES = {
+    # state -> (color, alpha) of the halo drawn under the card
+    "selected": ((255, 200, 0), 230),
+    "hovered": ((255, 255, 255), 140),
+}
+
+# Header stripe colors used for simplified low-zoom faces
+TYPE_COLORS = {
+    "Character": (70, 120, 200),
+    "Upgrade": (80, 170, 90),
+    "Plan": (200, 160, 60),
+    "Skill": (160, 90, 190),
+    "Location": (120, 100, 70),
+    "Encounter": (190, 70, 70),
+}
+
+# Attribute averages shown in the deck stats summary: (label, attribute)
+STATS_AVERAGES = (("STR", "strength"), ("AGI", "agility"), ("INT", "intelligence"),
+                  ("WIS", "wisdom"), ("HP", "hit_points"))
+
 
 class CardRenderer:
     """Handles rendering of cards with different visual states."""
@@ -18,6 +58,96 @@ class CardRenderer:
         self.screen = screen
         self.font = pygame.font.Font(None, 24)
         self.title_font = pygame.font.Font(None, 28)
+        # Fonts are not thread-safe; face pre-warm workers each get their own
+        self._thread_fonts = threading.local()
+        self._thread_fonts.font = self.font
+        self.fonts_created = 2
+        # Wrapped, size-to-fit special rules blocks (cached per text and box)
+        self.text_layout = TextLayout(font_sizes=(18, 16, 14, 12, 11))
+        # Optional FacePrewarmer; when set, missing faces are rasterized in the
+        # background and a placeholder is drawn until they are ready
+        self.prewarmer = None
+        self._placeholder_regions = {}
+        # card -> (content key, faces) replaced by a content change, shown
+        # instead of a placeholder while the new face is being built
+        self._stale_faces = weakref.WeakKeyDictionary()
+        # Optional AssetLoader providing card art ("art" attribute)
+        self.assets = None
+        # Cached card faces live in an opaque atlas; labels, glows and
+        # shadows in an alpha atlas, so each layer can go out in one blits() call
+        self.face_atlas = TextureAtlas()
+        self.overlay_atlas = TextureAtlas(page_size=1024, alpha=True)
+        # Queued blits may point at a page about to be recycled; draw them first
+        self.face_atlas.on_evict = self._submit_batch
+        self.overlay_atlas.on_evict = self._submit_batch
+        # card -> (content key, {(scale, state): atlas region}); entries vanish with their cards
+        self._face_cache = weakref.WeakKeyDictionary()
+        self._overlay_regions = {}
+        self._text_regions = {}
+        # Layer batching and per-frame blit statistics
+        self._batch = None
+        self.frame_blits = 0
+        self.frame_batches = 0
+        self.last_frame_blits = 0
+        self.last_frame_batches = 0
+    
+    def begin_frame(self):
+        """Reset per-frame blit statistics, keeping the previous frame's totals."""
+        self.last_frame_blits = self.frame_blits
+        self.last_frame_batches = self.frame_batches
+        self.frame_blits = 0
+        self.frame_batches = 0
+    
+    def begin_batch(self):
+        """Start queuing blits so a whole layer is submitted with one Surface.blits call."""
+        self._batch = []
+    
+    def flush(self):
+        """Submit the queued layer to the screen and stop batching."""
+        self._submit_batch()
+        self._batch = None
+    
+    def _submit_batch(self):
+        """Draw the blits queued so far, keeping the batch open."""
+        batch = self._batch
+        if batch:
+            self.screen.blits(batch, doreturn=False)
+            self.frame_batches += 1
+            self._batch = []
+    
+    def _blit(self, source, dest, area=None):
+        """Blit now, or queue the blit when a batch is open."""
+        self.frame_blits += 1
+        if self._batch is not None:
+            self._batch.append((source, dest, area))
+        else:
+            self.screen.blit(source, dest, area)
+            self.frame_batches += 1
+    
+    def _blit_text(self, font, text, color, pos=None, center=None):
+        """
+        Blit a text label from the glyph atlas, rendering it on first use.
+        
+        Args:
+            font: Font to render with
+            text: Label text
+            color: Text color
+            pos: Top-left position, or
+            center: Center position
+        """
+        if not text:
+            return
+        key = (id(font), text, color)
+        region = self._text_regions.get(key)
+        if not self.overlay_atlas.is_valid(region):
+            if len(self._text_regions) > 4096:
+                self._text_regions.clear()
+            region = self.overlay_atlas.add(font.render(text, True, color))
+            self._text_regions[key] = region
+        page, rect, _ = region
+        if center is not None:
+            pos = (center[0] - rect.width // 2, center[1] - rect.height // 2)
+        self._blit(page, pos, rect)
     
     def render_card(self, card):
         """
@@ -28,150 +158,409 @@ class CardRenderer:
         """
         if not card.rect:
             card.update_rect()
+        self.render_card_at(card, card.x, card.y, 1.0)
+    
+    def render_card_at(self, card, x, y, scale):
+        """
+        Render a card at a screen position and zoom level using cached atlas regions.
         
-        # Draw card background (face or back)
-        if card.face_up:
-            color = card.face_color
+        Args:
+            card: Card object to render
+            x, y: Screen position of the card's top-left corner
+            scale: Zoom factor (one of the camera's zoom levels)
+        """
+        width = int(card.width * scale)
+        height = int(card.height * scale)
+        
+        if card.selected:
+            state = "selected"
+        elif card.hovered:
+            state = "hovered"
         else:
-            color = card.back_color
+            state = "normal"
         
-        # Add elevation effect when dragging
+        # Elevation layers are pre-blurred alpha surfaces shared by all cards of a size
         if card.dragging:
-            # Draw shadow
-            shadow_rect = (card.x + 3, card.y + 3, card.width, card.height)
-            pygame.draw.rect(self.screen, (0, 0, 0, 50), shadow_rect)
-            card_x = card.x + 2
-            card_y = card.y + 2
-        else:
-            card_x = card.x
-            card_y = card.y
+            radius = max(2, int(SHADOW_RADIUS * scale))
+            offset = int(SHADOW_OFFSET * scale)
+            page, rect, _ = self._overlay_region(
+                ("shadow", width, height, radius, (0, 0, 0), SHADOW_ALPHA), self._build_halo)
+            self._blit(page, (x + offset - radius, y + offset - radius), rect)
+            # Lift the card up-left, away from its shadow
+            x -= 2
+            y -= 2
+        elif state in GLOW_STYLES:
+            radius = max(2, int(GLOW_RADIUS * scale))
+            color, alpha = GLOW_STYLES[state]
+            page, rect, _ = self._overlay_region(
+                ("glow", width, height, radius, color, alpha), self._build_halo)
+            self._blit(page, (x - radius, y - radius), rect)
         
-        # Draw card body
-        pygame.draw.rect(self.screen, color, 
-                        (card_x, card_y, card.width, card.height))
+        # Card body, content and border come from one cached atlas region
+        page, rect, _ = self._card_face_region(card, scale, state)
+        self._blit(page, (x, y), rect)
+    
+    def get_card_face(self, card, scale=1.0):
+        """
+        Get the card's rendered face (or back) at a zoom level, building it on first use.
         
-        # Draw border
-        if card.selected:
-            border_color = (255, 200, 0)
-            border_width = 3
-        elif card.hovered:
-            border_color = (255, 255, 255)
-            border_width = 2
-        else:
-            border_color = card.border_color
-            border_width = 1
+        Args:
+            card: Card object
+            scale: Zoom factor
+        
+        Returns:
+            Pygame surface of the card body without border (a view into the atlas)
+        """
+        page, rect, _ = self._card_face_region(card, scale, None)
+        return page.subsurface(rect)
+    
+    def _card_face_region(self, card, scale, state):
+        """
+        Get the atlas region holding a card's face at a zoom level.
+        
+        Regions are tracked per card, zoom level and border state (None for
+        no border), dropped when the card's content changes, and rebuilt if
+        their atlas page was recycled. The border is baked into each variant
+        so a card is drawn with a single opaque blit. With a prewarmer set,
+        missing text faces are queued and a placeholder is returned.
+        """
+        faces = self._card_faces(card)
+        region = faces.get((scale, state))
+        if not self.face_atlas.is_valid(region):
+            if (self.prewarmer is not None and state is not None and
+                    scale >= LOD_TEXT_SCALE):
+                self.prewarmer.request(card, scale, state)
+                return self._fallback_region(card, scale, state)
+            region = self.face_atlas.add(self.build_card_variant(card, scale, state))
+            faces[(scale, state)] = region
+        return region
+    
+    def _card_faces(self, card):
+        """Get the {(scale, state): region} dict for a card's current content."""
+        content_key = self.face_content_key(card)
+        entry = self._face_cache.get(card)
+        if entry is None or entry[0] != content_key:
+            if entry is not None:
+                self._stale_faces[card] = entry
+            entry = (content_key, {})
+            self._face_cache[card] = entry
+        return entry[1]
+    
+    def face_content_key(self, card):
+        """Get the key that changes whenever a card's face needs re-rasterizing."""
+        art = card.attributes.get("art")
+        art_ready = False
+        if art and self.assets is not None:
+            # Starts loading the art on first use; the face is rebuilt once it arrives
+            art_ready = self.assets.get(art, (card.width, card.height)) is not None
+        return (card.version, card.face_up, card.name, card.card_type, art_ready)
+    
+    def memory_usage(self):
+        """
+        Get what the renderer's caches hold.
+        
+        Returns:
+            Dict of cache name -> (entries, bytes); fonts are counted but
+            their size is left to the caller (pygame does not expose it)
+        """
+        return {
+            "face atlas": self.face_atlas.memory_usage(),
+            "overlay atlas": self.overlay_atlas.memory_usage(),
+            "rules text": self.text_layout.memory_usage(),
+            "fonts": (self.fonts_created + self.text_layout.fonts_created, 0),
+        }
+    
+    def has_card_face(self, card, scale, state):
+        """Check whether a face variant is already in the atlas."""
+        return self.face_atlas.is_valid(self._card_faces(card).get((scale, state)))
+    
+    def store_card_face(self, card, scale, state, content_key, surface):
+        """
+        Publish a face variant rasterized elsewhere (e.g. by a pre-warm worker).
+        
+        Args:
+            card: Card object
+            scale: Zoom factor
+            state: Border state
+            content_key: face_content_key(card) when rasterizing started
+            surface: Rasterized face
+        
+        Returns:
+            True if stored, False if the card changed in the meantime
+        """
+        if content_key != self.face_content_key(card):
+            return False
+        self._card_faces(card)[(scale, state)] = self.face_atlas.add(surface)
+        return True
+    
+    def build_card_variant(self, card, scale, state):
+        """
+        Rasterize a face with its border state baked in. Safe to call off the main thread.
+        
+        Args:
+            card: Card object
+            scale: Zoom factor
+            state: Border state, or None for no border
+        
+        Returns:
+            New pygame surface
+        """
+        surface = self.build_card_face(card, scale)
+        if state is not None:
+            color, border_width = self._border_style(card, state)
+            pygame.draw.rect(surface, color, surface.get_rect(), border_width)
+        return surface
+    
+    def _fallback_region(self, card, scale, state):
+        """
+        Get what to draw while a face is being built, closest match first.
+        
+        The previous look after a content change, then the card's face in
+        another border state at this zoom (the glow still shows the state),
+        then a face at another zoom rescaled and kept until the real one is
+        published. Only a card never drawn with text gets a placeholder.
+        """
+        stale = self._stale_faces.get(card)
+        if stale is not None:
+            # Same side and type: the old face is a closer match than a placeholder
+            key = stale[0]
+            if key[1] == card.face_up and key[3] == card.card_type:
+                region = stale[1].get((scale, state))
+                if self.face_atlas.is_valid(region):
+                    return region
+        faces = self._card_faces(card)
+        for other_state in ("normal", "hovered", "selected"):
+            region = faces.get((scale, other_state))
+            if self.face_atlas.is_valid(region):
+                return region
+        for (other_scale, _), region in list(faces.items()):
+            if other_scale >= LOD_TEXT_SCALE and self.face_atlas.is_valid(region):
+                page, rect, _ = region
+                size = (int(card.width * scale), int(card.height * scale))
+                surface = pygame.transform.smoothscale(page.subsurface(rect), size)
+                color, border_width = self._border_style(card, state)
+                pygame.draw.rect(surface, color, surface.get_rect(), border_width)
+                region = self.face_atlas.add(surface)
+                faces[(scale, state)] = region
+                return region
+        return self._placeholder_region(card, scale, state)
+    
+    def _placeholder_region(self, card, scale, state):
+        """Get a shared text-free face shown while the real one is being built."""
+        key = (scale, state, card.face_up, card.card_type,
+               card.face_color, card.back_color, card.border_color)
+        region = self._placeholder_regions.get(key)
+        if not self.face_atlas.is_valid(region):
+            surface = self._build_simple_face(card, scale)
+            color, border_width = self._border_style(card, state)
+            pygame.draw.rect(surface, color, surface.get_rect(), border_width)
+            region = self.face_atlas.add(surface)
+            self._placeholder_regions[key] = region
+        return region
+    
+    def _border_style(self, card, state):
+        """Get (color, width) of a card border for a highlight state."""
+        if state == "selected":
+            return (255, 200, 0), 3
+        if state == "hovered":
+            return (255, 255, 255), 2
+        return card.border_color, 1
+    
+    def build_card_face(self, card, scale=1.0):
+        """
+        Rasterize a card face at a zoom level without touching any cache.
+        
+        Args:
+            card: Card object
+            scale: Zoom factor
         
-        pygame.draw.rect(self.screen, border_color,
-                        (card_x, card_y, card.width, card.height), border_width)
+        Returns:
+            New pygame surface
+        """
+        if scale < LOD_TEXT_SCALE:
+            return self._build_simple_face(card, scale)
+        full = self._build_card_face(card)
+        if scale == 1.0:
+            return full
+        size = (int(card.width * scale), int(card.height * scale))
+        return pygame.transform.smoothscale(full, size)
+    
+    def _overlay_region(self, key, builder):
+        """Get a shared overlay (shadow, glow) region, building it with builder(key) if needed."""
+        region = self._overlay_regions.get(key)
+        if not self.overlay_atlas.is_valid(region):
+            region = self.overlay_atlas.add(builder(key))
+            self._overlay_regions[key] = region
+        return region
+    
+    def _build_halo(self, key):
+        """
+        Build a soft shadow or glow: a translucent card-sized rect blurred outward.
+        
+        Args:
+            key: (kind, width, height, radius, color, alpha) overlay key
         
-        # Draw card content if face up
+        Returns:
+            SRCALPHA surface padded by radius on every side
+        """
+        _, width, height, radius, color, alpha = key
+        size = (width + 2 * radius, height + 2 * radius)
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, color + (alpha,), (radius, radius, width, height),
+                         border_radius=radius)
+        # Cheap blur: shrink and scale back up with filtering, twice
+        factor = max(2, radius // 2)
+        small = (max(1, size[0] // factor), max(1, size[1] // factor))
+        for _ in range(2):
+            surface = pygame.transform.smoothscale(pygame.transform.smoothscale(surface, small), size)
+        return surface
+    
+    def _build_card_face(self, card):
+        """Rasterize a card's full face (or back) at native size."""
+        surface = pygame.Surface((card.width, card.height))
+        surface.fill(card.face_color if card.face_up else card.back_color)
         if card.face_up:
-            # Draw card name and type
-            name_text = self.font.render(card.name, True, card.text_color)
-            name_rect = name_text.get_rect(center=(card_x + card.width // 2, 
-                                                   card_y + 15))
-            self.screen.blit(name_text, name_rect)
-            
-            # Draw card type
-            type_text = self.font.render(f"({card.card_type})", True, card.text_color)
-            type_rect = type_text.get_rect(center=(card_x + card.width // 2, 
-                                                    card_y + 35))
-            self.screen.blit(type_text, type_rect)
-            
-            # Draw type-specific attributes
-            y_offset = 55
-            card_type = card.card_type
-            
-            if card_type == "Character":
-                if card.attributes.get("level", 0):
-                    self._render_attribute(card_x, card_y, card.width, y_offset, "Lvl", card.attributes.get("level", 0), card.text_color)
-                    y_offset += 20
-                if card.attributes.get("class"):
-                    self._render_attribute(card_x, card_y, card.width, y_offset, "Class", card.attributes.get("class"), card.text_color)
-                    y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "STR", card.attributes.get("strength", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "AGI", card.attributes.get("agility", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "INT", card.attributes.get("intelligence", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "WIS", card.attributes.get("wisdom", 0), card.text_color)
-                y_offset += 20
-            elif card_type == "Upgrade":
-                if card.attributes.get("level", 0):
-                    self._render_attribute(card_x, card_y, card.width, y_offset, "Lvl", card.attributes.get("level", 0), card.text_color)
-                    y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "STR+", card.attributes.get("strength_mod", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "AGI+", card.attributes.get("agility_mod", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "INT+", card.attributes.get("intelligence_mod", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "WIS+", card.attributes.get("wisdom_mod", 0), card.text_color)
-                y_offset += 20
-            elif card_type == "Plan":
-                self._render_attribute(card_x, card_y, card.width, y_offset, "STR Req", card.attributes.get("strength_req", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "AGI Req", card.attributes.get("agility_req", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "INT Req", card.attributes.get("intelligence_req", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "WIS Req", card.attributes.get("wisdom_req", 0), card.text_color)
-                y_offset += 20
-            elif card_type == "Skill":
-                self._render_attribute(card_x, card_y, card.width, y_offset, "STR Req", card.attributes.get("strength_req", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "AGI Req", card.attributes.get("agility_req", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "INT Req", card.attributes.get("intelligence_req", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "WIS Req", card.attributes.get("wisdom_req", 0), card.text_color)
-                y_offset += 20
-            elif card_type == "Location":
-                if card.attributes.get("level", 0):
-                    self._render_attribute(card_x, card_y, card.width, y_offset, "Lvl", card.attributes.get("level", 0), card.text_color)
-                    y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "STR Def", card.attributes.get("strength_def", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "AGI Def", card.attributes.get("agility_def", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "INT Def", card.attributes.get("intelligence_def", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "WIS Def", card.attributes.get("wisdom_def", 0), card.text_color)
-                y_offset += 20
-                if card.attributes.get("hit_points", 0):
-                    self._render_attribute(card_x, card_y, card.width, y_offset, "HP", card.attributes.get("hit_points", 0), card.text_color)
-                    y_offset += 20
-            elif card_type == "Encounter":
-                self._render_attribute(card_x, card_y, card.width, y_offset, "STR Def", card.attributes.get("strength_def", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "AGI Def", card.attributes.get("agility_def", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "INT Def", card.attributes.get("intelligence_def", 0), card.text_color)
-                y_offset += 20
-                self._render_attribute(card_x, card_y, card.width, y_offset, "WIS Def", card.attributes.get("wisdom_def", 0), card.text_color)
-                y_offset += 20
-                if card.attributes.get("hit_points", 0):
-                    self._render_attribute(card_x, card_y, card.width, y_offset, "HP", card.attributes.get("hit_points", 0), card.text_color)
-                    y_offset += 20
-            
-            # Draw special rules if present
-            special_rules = card.attributes.get("special_rules", "")
-            if special_rules:
-                # Truncate if too long for card
-                rules_text = special_rules[:20] + "..." if len(special_rules) > 20 else special_rules
-                rules_surface = self.font.render(rules_text, True, card.text_color)
-                rules_rect = rules_surface.get_rect(center=(card_x + card.width // 2, 
-                                                             card_y + card.height - 15))
-                self.screen.blit(rules_surface, rules_rect)
+            art = self._card_art(card)
+            if art is not None:
+                surface.blit(art, (0, 0))
+            self._draw_card_content(surface, card)
+        return surface
+    
+    def _card_art(self, card):
+        """Get a card's loaded artwork at card size, or None (never starts a load)."""
+        art = card.attributes.get("art")
+        if not art or self.assets is None:
+            return None
+        return self.assets.peek(art, (card.width, card.height))
+    
+    def _build_simple_face(self, card, scale):
+        """Rasterize a low-zoom face: body color and a type stripe, no text."""
+        width = max(1, int(card.width * scale))
+        height = max(1, int(card.height * scale))
+        surface = pygame.Surface((width, height))
+        if not card.face_up:
+            surface.fill(card.back_color)
+            return surface
+        surface.fill(card.face_color)
+        stripe_color = TYPE_COLORS.get(card.card_type, card.border_color)
+        pygame.draw.rect(surface, stripe_color, (0, 0, width, max(2, height // 5)))
+        return surface
     
-    def _render_attribute(self, card_x, card_y, card_width, y_offset, label, value, color):
-        """Render a single attribute line on a card."""
+    def _face_font(self):
+        """Get the face text font owned by the calling thread."""
+        font = getattr(self._thread_fonts, "font", None)
+        if font is None:
+            font = pygame.font.Font(None, 24)
+            self._thread_fonts.font = font
+            self.fonts_created += 1
+        return font
+    
+    def _draw_card_content(self, target, card):
+        """Draw name, type, attributes and rules text onto a face surface."""
+        font = self._face_font()
+        # Draw card name and type
+        name_text = font.render(card.name, True, card.text_color)
+        name_rect = name_text.get_rect(center=(card.width // 2, 15))
+        target.blit(name_text, name_rect)
+        
+        # Draw card type
+        type_text = font.render(f"({card.card_type})", True, card.text_color)
+        type_rect = type_text.get_rect(center=(card.width // 2, 35))
+        target.blit(type_text, type_rect)
+        
+        # Draw type-specific attributes, tighter when rules text needs room
+        special_rules = card.attributes.get("special_rules", "")
+        step = 16 if special_rules else 20
+        y_offset = 55
+        card_type = card.card_type
+        
+        if card_type == "Character":
+            if card.attributes.get("level", 0):
+                self._render_attribute(target, card.width, y_offset, "Lvl", card.attributes.get("level", 0), card.text_color)
+                y_offset += step
+            if card.attributes.get("class"):
+                self._render_attribute(target, card.width, y_offset, "Class", card.attributes.get("class"), card.text_color)
+                y_offset += step
+            self._render_attribute(target, card.width, y_offset, "STR", card.attributes.get("strength", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "AGI", card.attributes.get("agility", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "INT", card.attributes.get("intelligence", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "WIS", card.attributes.get("wisdom", 0), card.text_color)
+            y_offset += step
+        elif card_type == "Upgrade":
+            if card.attributes.get("level", 0):
+                self._render_attribute(target, card.width, y_offset, "Lvl", card.attributes.get("level", 0), card.text_color)
+                y_offset += step
+            self._render_attribute(target, card.width, y_offset, "STR+", card.attributes.get("strength_mod", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "AGI+", card.attributes.get("agility_mod", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "INT+", card.attributes.get("intelligence_mod", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "WIS+", card.attributes.get("wisdom_mod", 0), card.text_color)
+            y_offset += step
+        elif card_type == "Plan":
+            self._render_attribute(target, card.width, y_offset, "STR Req", card.attributes.get("strength_req", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "AGI Req", card.attributes.get("agility_req", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "INT Req", card.attributes.get("intelligence_req", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "WIS Req", card.attributes.get("wisdom_req", 0), card.text_color)
+            y_offset += step
+        elif card_type == "Skill":
+            self._render_attribute(target, card.width, y_offset, "STR Req", card.attributes.get("strength_req", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "AGI Req", card.attributes.get("agility_req", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "INT Req", card.attributes.get("intelligence_req", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "WIS Req", card.attributes.get("wisdom_req", 0), card.text_color)
+            y_offset += step
+        elif card_type == "Location":
+            if card.attributes.get("level", 0):
+                self._render_attribute(target, card.width, y_offset, "Lvl", card.attributes.get("level", 0), card.text_color)
+                y_offset += step
+            self._render_attribute(target, card.width, y_offset, "STR Def", card.attributes.get("strength_def", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "AGI Def", card.attributes.get("agility_def", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "INT Def", card.attributes.get("intelligence_def", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "WIS Def", card.attributes.get("wisdom_def", 0), card.text_color)
+            y_offset += step
+            if card.attributes.get("hit_points", 0):
+                self._render_attribute(target, card.width, y_offset, "HP", card.attributes.get("hit_points", 0), card.text_color)
+                y_offset += step
+        elif card_type == "Encounter":
+            self._render_attribute(target, card.width, y_offset, "STR Def", card.attributes.get("strength_def", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "AGI Def", card.attributes.get("agility_def", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "INT Def", card.attributes.get("intelligence_def", 0), card.text_color)
+            y_offset += step
+            self._render_attribute(target, card.width, y_offset, "WIS Def", card.attributes.get("wisdom_def", 0), card.text_color)
+            y_offset += step
+            if card.attributes.get("hit_points", 0):
+                self._render_attribute(target, card.width, y_offset, "HP", card.attributes.get("hit_points", 0), card.text_color)
+                y_offset += step
+        
+        # Draw special rules wrapped and sized to fit the space left below the attributes
+        if special_rules:
+            top = min(y_offset - 8, card.height - RULES_MIN_HEIGHT - 2)
+            box_width = card.width - 8
+            box_height = card.height - 2 - top
+            block = self.text_layout.render(special_rules, box_width, box_height, card.text_color)
+            target.blit(block, (4, top))
+
+    def _render_attribute(self, target, card_width, y_offset, label, value, color):
+        """Render a single attribute line on a card face."""
         attr_text = f"{label}: {value}"
-        text = self.font.render(attr_text, True, color)
-        text_rect = text.get_rect(center=(card_x + card_width // 2, 
-                                         card_y + y_offset))
-        self.screen.blit(text, text_rect)
+        text = self._face_font().render(attr_text, True, color)
+        text_rect = text.get_rect(center=(card_width // 2, y_offset))
+        target.blit(text, text_rect)
 
     def render_deck_pile(self, deck, x, y, width=100, height=140):
         """Render a deck pile at a fixed position with count label."""
@@ -183,23 +572,60 @@ class CardRenderer:
         border_color = (200, 200, 200) if has_cards else (90, 90, 90)
         pygame.draw.rect(self.screen, border_color, (x, y, width, height), 2)
         # Count label
-        count_text = self.title_font.render(f"Deck: {deck.size()}", True, (230, 230, 230))
-        count_rect = count_text.get_rect(center=(x + width // 2, y + height + 14))
-        self.screen.blit(count_text, count_rect)
+        self._blit_text(self.title_font, f"Deck: {deck.size()}", (230, 230, 230),
+                        center=(x + width // 2, y + height + 14))
+
+    def render_deck_stats(self, stats, x, y):
+        """
+        Render a compact summary of a deck's running statistics.
+        
+        Shows per-type counts, attribute averages and the level curve; all
+        numbers come straight from the DeckStats aggregates.
+        
+        Args:
+            stats: DeckStats of the deck
+            x, y: Top-left corner of the panel
+        """
+        width, height = 320, 144
+        line_height = 18
+        pygame.draw.rect(self.screen, (25, 25, 25), (x, y, width, height))
+        pygame.draw.rect(self.screen, (120, 120, 120), (x, y, width, height), 1)
+        self._blit_text(self.title_font, f"Deck Stats: {stats.count} cards", (230, 230, 230),
+                        pos=(x + 8, y + 6))
+        top = y + 30
+        # Per-type counts
+        for row, (card_type, count) in enumerate(sorted(stats.type_counts.items())):
+            color = TYPE_COLORS.get(card_type, (200, 200, 200))
+            self._blit_text(self.font, f"{card_type}: {count}", color,
+                            pos=(x + 8, top + row * line_height))
+        # Averages over the cards that have each attribute
+        for row, (label, key) in enumerate(STATS_AVERAGES):
+            average = stats.average(key)
+            text = f"{label} {average:.1f}" if average is not None else f"{label} -"
+            self._blit_text(self.font, text, (200, 200, 200), pos=(x + 120, top + row * line_height))
+        # Level curve as bars, lowest level first
+        levels = sorted(stats.level_curve.items())[:8]
+        if levels:
+            peak = max(count for _, count in levels)
+            bar_bottom = y + height - 22
+            bar_space = height - 60
+            for col, (level, count) in enumerate(levels):
+                bar_x = x + 200 + col * 14
+                bar_h = max(1, bar_space * count // peak)
+                pygame.draw.rect(self.screen, (0, 180, 120), (bar_x, bar_bottom - bar_h, 10, bar_h))
+                self._blit_text(self.font, str(level), (160, 160, 160), center=(bar_x + 5, bar_bottom + 10))
 
     def render_play_area(self, x, y, width, height):
         """Render the in-play area background and label."""
         pygame.draw.rect(self.screen, (30, 30, 30), (x, y, width, height))
         pygame.draw.rect(self.screen, (120, 120, 120), (x, y, width, height), 2)
-        label = self.title_font.render("In-Play Area", True, (220, 220, 220))
-        self.screen.blit(label, (x + 8, y + 6))
+        self._blit_text(self.title_font, "In-Play Area", (220, 220, 220), pos=(x + 8, y + 6))
 
     def render_hand_area(self, x, y, width, height):
         """Render the player's hand area background and label."""
         pygame.draw.rect(self.screen, (30, 30, 30), (x, y, width, height))
         pygame.draw.rect(self.screen, (120, 120, 120), (x, y, width, height), 2)
-        label = self.title_font.render("Hand", True, (220, 220, 220))
-        self.screen.blit(label, (x + 8, y + 6))
+        self._blit_text(self.title_font, "Hand", (220, 220, 220), pos=(x + 8, y + 6))
 
     def render_button(self, x, y, width, height, text, enabled=True):
         """Render a simple button."""
@@ -208,52 +634,160 @@ class CardRenderer:
         fg = (240, 240, 240) if enabled else (160, 160, 160)
         pygame.draw.rect(self.screen, bg, (x, y, width, height), border_radius=4)
         pygame.draw.rect(self.screen, border, (x, y, width, height), 2, border_radius=4)
-        label = self.title_font.render(text, True, fg)
-        label_rect = label.get_rect(center=(x + width // 2, y + height // 2))
-        self.screen.blit(label, label_rect)
+        self._blit_text(self.title_font, text, fg, center=(x + width // 2, y + height // 2))
 
     def render_text_input(self, x, y, width, height, label_text, value_text, focused=False):
         """Render a labeled text input box."""
         # Label
-        label_surface = self.font.render(label_text, True, (220, 220, 220))
-        self.screen.blit(label_surface, (x, y))
+        self._blit_text(self.font, label_text, (220, 220, 220), pos=(x, y))
         # Input box
         box_y = y + 18
         border_color = (255, 200, 0) if focused else (150, 150, 150)
         pygame.draw.rect(self.screen, (35, 35, 35), (x, box_y, width, height))
         pygame.draw.rect(self.screen, border_color, (x, box_y, width, height), 2)
         # Text
-        text_surface = self.font.render(value_text, True, (230, 230, 230))
-        self.screen.blit(text_surface, (x + 8, box_y + (height - text_surface.get_height()) // 2))
+        if value_text:
+            self._blit_text(self.font, value_text, (230, 230, 230),
+                            pos=(x + 8, box_y + (height - self.font.get_height()) // 2))
 
     def render_panel_with_title(self, x, y, width, height, title):
         """Render a simple panel with a border and title text."""
         pygame.draw.rect(self.screen, (25, 25, 25), (x, y, width, height))
         pygame.draw.rect(self.screen, (120, 120, 120), (x, y, width, height), 2)
-        title_surface = self.title_font.render(title, True, (230, 230, 230))
-        self.screen.blit(title_surface, (x + 8, y + 8))
+        self._blit_text(self.title_font, title, (230, 230, 230), pos=(x + 8, y + 8))
 
-    def render_deck_debug_list(self, deck, x, y):
-        """Render a simple list of card names from top to bottom for debugging."""
+    def render_deck_debug_list(self, deck, x, y, view):
+        """
+        Render a scrollable list of card names from top to bottom for debugging.
+        
+        Only the rows visible at the view's scroll offset are drawn, so the
+        cost does not depend on deck size.
+        
+        Args:
+            deck: Deck to list
+            x, y: Top-left corner of the panel
+            view: DeckListView holding scroll/filter state and row cache
+        """
         # Panel metrics
-        panel_width = 220
+        panel_width = 240
         line_height = 22
         padding = 8
-        items = [card.name for card in deck.cards]  # index 0 is top
-        panel_height = padding * 2 + max(1, len(items)) * line_height
+        header_height = 42
+        rows = view.rows(deck)
+        visible = view.visible(deck)
+        list_height = max(1, min(view.visible_rows, len(rows))) * line_height
+        panel_height = padding * 2 + header_height + list_height
         # Background panel
         pygame.draw.rect(self.screen, (25, 25, 25), (x, y, panel_width, panel_height))
         pygame.draw.rect(self.screen, (180, 180, 180), (x, y, panel_width, panel_height), 1)
-        # Title
+        # Title and status line
         title_text = self.title_font.render("Deck (top -> bottom)", True, (230, 230, 230))
         self.screen.blit(title_text, (x + padding, y + padding - 2))
+        if view.filter_text:
+            status = f"filter: {view.filter_text}  ({len(rows)}/{deck.size()})"
+        elif rows:
+            status = f"{view.scroll + 1}-{view.scroll + len(visible)} of {len(rows)}"
+        else:
+            status = ""
+        status_text = self.font.render(status, True, (160, 160, 160))
+        self.screen.blit(status_text, (x + padding, y + padding + 20))
         # Items
-        list_y = y + padding + 20
-        if not items:
+        list_y = y + padding + header_height
+        if not visible:
             empty_text = self.font.render("<empty>", True, (200, 200, 200))
             self.screen.blit(empty_text, (x + padding, list_y))
             return
-        for idx, name in enumerate(items):
-            item_text = self.font.render(f"{idx+1}. {name}", True, (200, 200, 200))
-            self.screen.blit(item_text, (x + padding, list_y + idx * line_height))
+        for row, (index, card) in enumerate(visible):
+            item_text = view.row_surface(self.font, index, card.name, (200, 200, 200))
+            self.screen.blit(item_text, (x + padding, list_y + row * line_height))
+        # Scrollbar when the list does not fit
+        if len(rows) > view.visible_rows:
+            track_x = x + panel_width - 6
+            thumb_h = max(12, list_height * view.visible_rows // len(rows))
+            thumb_y = list_y + (list_height - thumb_h) * view.scroll // (len(rows) - view.visible_rows)
+            pygame.draw.rect(self.screen, (60, 60, 60), (track_x, list_y, 4, list_height))
+            pygame.draw.rect(self.screen, (180, 180, 180), (track_x, thumb_y, 4, thumb_h))
+
+    def render_card_browser(self, view, x, y):
+        """
+        Render the card browser: query line, match count and one page of results.
+        
+        Args:
+            view: CardBrowserView holding the query, scroll state and row cache
+            x, y: Top-left corner of the panel
+        """
+        padding = view.padding
+        line_height = view.line_height
+        results = view.rows()
+        visible = view.visible()
+        list_height = max(1, min(view.visible_rows, len(results))) * line_height
+        panel_height = padding * 2 + view.header_height + list_height
+        pygame.draw.rect(self.screen, (25, 25, 25), (x, y, view.panel_width, panel_height))
+        pygame.draw.rect(self.screen, (180, 180, 180), (x, y, view.panel_width, panel_height), 1)
+        title_text = self.title_font.render(f"Find: {view.filter_text}_", True, (230, 230, 230))
+        self.screen.blit(title_text, (x + padding, y + padding - 2))
+        status_text = self.font.render(f"{len(results)} of {len(view.index)} cards", True, (160, 160, 160))
+        self.screen.blit(status_text, (x + padding, y + padding + 20))
+        list_y = y + padding + view.header_height
+        if not visible:
+            empty_text = self.font.render("<no matches>", True, (200, 200, 200))
+            self.screen.blit(empty_text, (x + padding, list_y))
+            return
+        for row, (position, card) in enumerate(visible):
+            row_y = list_y + row * line_height
+            color = TYPE_COLORS.get(card.card_type, (200, 200, 200))
+            pygame.draw.rect(self.screen, color, (x + padding, row_y + 3, 4, line_height - 8))
+            item_text = view.row_surface(self.font, position, card.name, (200, 200, 200))
+            self.screen.blit(item_text, (x + padding + 10, row_y))
+        if len(results) > view.visible_rows:
+            track_x = x + view.panel_width - 6
+            thumb_h = max(12, list_height * view.visible_rows // len(results))
+            thumb_y = list_y + (list_height - thumb_h) * view.scroll // (len(results) - view.visible_rows)
+            pygame.draw.rect(self.screen, (60, 60, 60), (track_x, list_y, 4, list_height))
+            pygame.draw.rect(self.screen, (180, 180, 180), (track_x, thumb_y, 4, thumb_h))
+
+    def render_thumbnail(self, thumbnail, x, y):
+        """Render a card or deck thumbnail with a thin frame."""
+        self.screen.blit(thumbnail, (x, y))
+        pygame.draw.rect(self.screen, (180, 180, 180), thumbnail.get_rect(topleft=(x, y)), 1)
 
+    def render_memory_overlay(self, tracker, x, y):
+        """Render subsystem memory and per-module growth from a MemoryTracker."""
+        line_height = 18
+        padding = 8
+        panel_width = 360
+        rows = tracker.rows
+        growth = tracker.growth
+        panel_height = padding * 2 + (len(rows) + len(growth) + 3) * line_height
+        pygame.draw.rect(self.screen, (15, 15, 15), (x, y, panel_width, panel_height))
+        pygame.draw.rect(self.screen, (200, 120, 0), (x, y, panel_width, panel_height), 1)
+        lines = [(f"Memory: {tracker.traced / 1048576:.1f} MB traced, peak {tracker.peak / 1048576:.1f}",
+                  (240, 160, 40))]
+        lines.append(("subsystem          count       MB", (180, 180, 180)))
+        for name, count, size in rows:
+            lines.append((f"{name:<16} {count:7} {size / 1048576:8.2f}", (220, 220, 220)))
+        lines.append((f"growth after {tracker.label}            KB", (180, 180, 180)))
+        for module, size, _ in growth:
+            lines.append((f"{module[-24:]:<24} {size / 1024:+8.1f}", (220, 220, 220)))
+        for idx, (line, color) in enumerate(lines):
+            self.screen.blit(self.font.render(line, True, color), (x + padding, y + padding + idx * line_height))
+
+    def render_profiler_overlay(self, profiler, x, y):
+        """Render FPS and per-phase frame timings from a FrameProfiler."""
+        rows = profiler.summary()
+        line_height = 18
+        padding = 8
+        panel_width = 360
+        panel_height = padding * 2 + (len(rows) + 2) * line_height
+        pygame.draw.rect(self.screen, (15, 15, 15), (x, y, panel_width, panel_height))
+        pygame.draw.rect(self.screen, (0, 200, 120), (x, y, panel_width, panel_height), 1)
+        header = self.font.render(
+            f"FPS: {profiler.fps():.1f}   blits: {self.last_frame_blits} in {self.last_frame_batches} calls",
+            True, (0, 230, 140))
+        self.screen.blit(header, (x + padding, y + padding))
+        columns = self.font.render("phase            p50    p95    p99 ms", True, (180, 180, 180))
+        self.screen.blit(columns, (x + padding, y + padding + line_height))
+        for idx, (phase, p50, p95, p99) in enumerate(rows):
+            line = f"{phase:<16} {p50:6.2f} {p95:6.2f} {p99:6.2f}"
+            text = self.font.render(line, True, (220, 220, 220))
+            self.screen.blit(text, (x + padding, y + padding + (idx + 2) * line_height))
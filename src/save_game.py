@@ -0,0 +1,215 @@
+"""
+Save-games of the whole table: a base snapshot followed by delta frames.
+
+A save file holds one JSON object per line. The first line is the base:
+every card in play with its zone. Each later line is a frame holding only
+the cards whose state changed since the previous save, so a quicksave
+costs the same however many cards are on the table. Once the frames add
+up to more than the base, the next save writes a fresh base instead.
+"""
+
+import json
+import os
+
+from .deck_manager import DeckManager
+
+SAVE_VERSION = 1
+
+
+class SaveGame:
+    """One save slot on disk and the card changes not yet written to it."""
+
+    def __init__(self, path, compact_ratio=1.0):
+        """
+        Initialize a save slot (nothing is read or written yet).
+
+        Args:
+            path: Save file path
+            compact_ratio: Rewrite the base once the frames exceed this fraction of its size
+        """
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.full = True  # Next save must write a base
+        self.dirty = set()  # Cards whose state changed since the last save
+        self.saved_ids = set()  # Cards whose data is already in the file
+        self.camera = None  # Camera view as of the last save
+        self.base_bytes = 0
+        self.journal_bytes = 0
+        self.frames = 0
+
+    def mark(self, cards):
+        """Note cards whose zone, position or face changed."""
+        if not self.full:
+            self.dirty.update(cards)
+
+    def mark_all(self):
+        """Note a change too broad to track per card; the next save writes a base."""
+        self.full = True
+        self.dirty = set()
+
+    def needs_base(self):
+        """Check whether the next save should write a new base instead of a frame."""
+        return self.full or self.journal_bytes > self.base_bytes * self.compact_ratio
+
+    def write_base(self, table, hand, deck, camera):
+        """
+        Replace the file with a base snapshot, atomically.
+
+        Args:
+            table: (card, stacking stamp) pairs of the table cards
+            hand: Hand cards in order
+            deck: Deck cards in order, top first
+            camera: Camera view as returned by Camera.get_view()
+        """
+        cards = [card for card, _ in table]
+        cards.extend(hand)
+        cards.extend(deck)
+        base = {
+            "version": SAVE_VERSION,
+            "camera": camera,
+            "cards": [DeckManager.card_to_dict(card) for card in cards],
+            "table": [[card.card_id, stamp] for card, stamp in table],
+            "hand": [card.card_id for card in hand],
+            "deck": [card.card_id for card in deck],
+        }
+        data = json.dumps(base, separators=(",", ":")) + "\n"
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+        self.full = False
+        self.dirty = set()
+        self.saved_ids = {card.card_id for card in cards}
+        self.camera = camera
+        self.base_bytes = len(data)
+        self.journal_bytes = 0
+        self.frames = 0
+
+    def append_frame(self, states, camera):
+        """
+        Append the changes since the last save.
+
+        Args:
+            states: (card, state) pairs as produced by Game._card_states()
+            camera: Camera view as returned by Camera.get_view()
+
+        Returns:
+            True if a frame was written (False when nothing changed)
+        """
+        if not states and camera == self.camera:
+            return False
+        new_cards = [DeckManager.card_to_dict(card) for card, state in states
+                     if state is not None and card.card_id not in self.saved_ids]
+        frame = {
+            "camera": camera,
+            "cards": new_cards,
+            "states": [[card.card_id, state] for card, state in states],
+        }
+        data = json.dumps(frame, separators=(",", ":")) + "\n"
+        with open(self.path, "a") as f:
+            f.write(data)
+        self.saved_ids.update(card_data["card_id"] for card_data in new_cards)
+        self.dirty = set()
+        self.camera = camera
+        self.journal_bytes += len(data)
+        self.frames += 1
+        return True
+
+    def read(self):
+        """
+        Read the file; later saves to this slot continue it with new frames.
+
+        A frame cut short by a crash while appending is ignored along with
+        anything after it.
+
+        Returns:
+            (base, frames) dicts, or None if the file does not exist
+
+        Raises:
+            ValueError: If the file is not a save of this version
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            lines = f.readlines()
+        try:
+            base = json.loads(lines[0])
+        except (IndexError, ValueError):
+            raise ValueError(f"not a save file: {self.path}")
+        if base.get("version") != SAVE_VERSION:
+            raise ValueError(f"unsupported save version {base.get('version')}: {self.path}")
+        frames = []
+        journal_bytes = 0
+        torn = False
+        for line in lines[1:]:
+            try:
+                frames.append(json.loads(line))
+            except ValueError:
+                torn = True
+                break
+            journal_bytes += len(line)
+            torn = not line.endswith("\n")
+        # Never append after a torn frame; the next save writes a new base
+        self.full = torn
+        self.dirty = set()
+        self.saved_ids = {card_data["card_id"] for card_data in base["cards"]}
+        for frame in frames:
+            self.saved_ids.update(card_data["card_id"] for card_data in frame["cards"])
+        self.camera = frames[-1]["camera"] if frames else base["camera"]
+        self.base_bytes = len(lines[0])
+        self.journal_bytes = journal_bytes
+        self.frames = len(frames)
+        return base, frames
+
+
+def fold(base, frames):
+    """
+    Apply a save's frames to its base on plain card ids.
+
+    The frames are folded before any Card is touched, so the game can build
+    its zones in one pass however many frames the save has.
+
+    Args:
+        base: Base snapshot as returned by SaveGame.read()
+        frames: Frames as returned by SaveGame.read()
+
+    Returns:
+        Dict with "cards" (card_id -> card data), "states" (card_id -> state
+        of every card in play; table positions are stacking stamps), "hand"
+        and "deck" (card_ids in order) and "camera"
+    """
+    cards = {}
+    states = {}
+    for card_data in base["cards"]:
+        card_id = card_data["card_id"]
+        cards[card_id] = card_data
+        states[card_id] = (None, None, card_data["x"], card_data["y"], card_data["face_up"])
+    for card_id, stamp in base["table"]:
+        states[card_id] = ("table", stamp) + states[card_id][2:]
+    hand = list(base["hand"])
+    deck = list(base["deck"])
+    for index, card_id in enumerate(hand):
+        states[card_id] = ("hand", index) + states[card_id][2:]
+    for index, card_id in enumerate(deck):
+        states[card_id] = ("deck", index) + states[card_id][2:]
+    camera = base["camera"]
+    for frame in frames:
+        for card_data in frame["cards"]:
+            cards[card_data["card_id"]] = card_data
+        moving = {card_id for card_id, _ in frame["states"]}
+        left = {states.pop(card_id, (None,))[0] for card_id in moving}
+        if "hand" in left:
+            hand = [card_id for card_id in hand if card_id not in moving]
+        if "deck" in left:
+            deck = [card_id for card_id in deck if card_id not in moving]
+        # Same ascending order Game._apply_card_states uses, so indices line up
+        placed = sorted(((card_id, tuple(state)) for card_id, state in frame["states"] if state),
+                        key=lambda item: item[1][:2])
+        for card_id, state in placed:
+            states[card_id] = state
+            if state[0] == "hand":
+                hand.insert(state[1], card_id)
+            elif state[0] == "deck":
+                deck.insert(state[1], card_id)
+        camera = frame["camera"]
+    return {"cards": cards, "states": states, "hand": hand, "deck": deck, "camera": camera}
@@ -0,0 +1,159 @@
+"""
+Uniform-grid spatial hash for fast viewport culling and hit testing of table cards.
+"""
+
+
+class SpatialHash:
+    """Buckets cards by grid cell and remembers their stacking order."""
+
+    def __init__(self, cell_size=256):
+        """
+        Initialize the spatial hash.
+
+        Args:
+            cell_size: Width/height of a grid cell in world units
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> set of cards
+        self._card_cells = {}  # card -> (cx0, cy0, cx1, cy1) it is indexed under
+        self._order = {}  # card -> stacking stamp (higher is drawn later)
+        self._next_stamp = 0
+
+    def __len__(self):
+        return len(self._card_cells)
+
+    def __contains__(self, card):
+        return card in self._card_cells
+
+    def _cell_range(self, x, y, width, height):
+        """Get the inclusive cell range covered by a rectangle."""
+        size = self.cell_size
+        return (int(x // size), int(y // size),
+                int((x + width) // size), int((y + height) // size))
+
+    def insert(self, card, stamp=None):
+        """
+        Add a card on top of the stacking order.
+
+        Args:
+            card: Card to index (uses its current x/y/width/height)
+            stamp: Optional stacking stamp from stamp_of(), to put a card back
+                at its earlier depth (e.g. when undoing a move)
+        """
+        if stamp is None:
+            stamp = self._next_stamp
+        self._order[card] = stamp
+        self._next_stamp = max(self._next_stamp, stamp + 1)
+        self._index(card, self._cell_range(card.x, card.y, card.width, card.height))
+
+    def remove(self, card):
+        """
+        Remove a card from the index.
+
+        Args:
+            card: Card to remove (ignored if not indexed)
+        """
+        cell_range = self._card_cells.pop(card, None)
+        if cell_range is None:
+            return
+        self._order.pop(card, None)
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(card)
+                    if not bucket:
+                        del self.cells[(cx, cy)]
+
+    def stamp_of(self, card):
+        """Get an indexed card's stacking stamp, or None if it is not indexed."""
+        return self._order.get(card)
+
+    def update(self, card):
+        """
+        Re-index a card after it moved; cheap when it stays in the same cells.
+
+        Args:
+            card: Indexed card whose position changed
+        """
+        old_range = self._card_cells.get(card)
+        if old_range is None:
+            return
+        new_range = self._cell_range(card.x, card.y, card.width, card.height)
+        if new_range == old_range:
+            return
+        stamp = self._order[card]
+        self.remove(card)
+        self._order[card] = stamp
+        self._index(card, new_range)
+
+    def _index(self, card, cell_range):
+        """Add a card to every bucket in a cell range."""
+        self._card_cells[card] = cell_range
+        cx0, cy0, cx1, cy1 = cell_range
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = set()
+                    cells[(cx, cy)] = bucket
+                bucket.add(card)
+
+    def query_rect(self, x, y, width, height):
+        """
+        Get cards overlapping a rectangle, bottom-most first.
+
+        Args:
+            x, y, width, height: Query rectangle in world coordinates
+
+        Returns:
+            List of cards in stacking order
+        """
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, width, height)
+        found = set()
+        cells = self.cells
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+            # Query covers more cells than exist; scan occupied cells instead
+            for (cx, cy), bucket in cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found.update(bucket)
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket:
+                        found.update(bucket)
+        right = x + width
+        bottom = y + height
+        hits = [card for card in found
+                if card.x < right and card.x + card.width > x and
+                card.y < bottom and card.y + card.height > y]
+        order = self._order
+        hits.sort(key=order.__getitem__)
+        return hits
+
+    def query_point(self, x, y):
+        """
+        Get cards containing a point, bottom-most first.
+
+        Args:
+            x, y: Point in world coordinates
+
+        Returns:
+            List of cards in stacking order
+        """
+        size = self.cell_size
+        bucket = self.cells.get((int(x // size), int(y // size)))
+        if not bucket:
+            return []
+        hits = [card for card in bucket if card.is_point_inside(x, y)]
+        hits.sort(key=self._order.__getitem__)
+        return hits
+
+    def clear(self):
+        """Remove every card from the index."""
+        self.cells.clear()
+        self._card_cells.clear()
+        self._order.clear()
@@ -0,0 +1,200 @@
+"""
+Client side of the table server connection.
+
+The connection runs on a background asyncio thread; the game thread sends
+through thread-safe calls and picks up received messages once per frame,
+the same way it publishes background-loaded art and card faces.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+
+import pygame
+
+from .net_protocol import encode, open_connection, read_message
+
+# Posted when messages arrive so an idle game loop wakes up to apply them
+NETWORK_EVENT = pygame.event.custom_type()
+
+
+class TableClient:
+    """Connection to a TableServer with prediction bookkeeping and send throttling."""
+
+    def __init__(self, address, drag_interval=0.05, view_interval=0.1):
+        """
+        Initialize the client (call start() to connect).
+
+        Args:
+            address: "host:port" or "unix:/path" of the server
+            drag_interval: Minimum seconds between drag previews sent
+            view_interval: Minimum seconds between view rectangle updates sent
+        """
+        self.address = address
+        self.drag_interval = drag_interval
+        self.view_interval = view_interval
+        self.seat = None
+        self.seats = []
+        self.connected = False
+        # Operations applied locally but not yet confirmed: seq -> card_ids
+        self.pending = {}
+        self._next_seq = 1
+        self._incoming = queue.Queue()
+        self._loop = None
+        self._outgoing = None
+        self._writer = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+        self._wake_posted = False
+        self._last_drag = (0.0, None)  # (time sent, (ids, dx, dy))
+        self._last_view = (0.0, None)
+
+    def start(self, timeout=5.0):
+        """
+        Connect to the server on a background thread.
+
+        Raises:
+            ConnectionError: If the server cannot be reached
+        """
+        self._thread = threading.Thread(target=self._run, name="table-client", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise ConnectionError(f"timed out connecting to {self.address}")
+        if self._error is not None:
+            raise ConnectionError(f"cannot connect to {self.address}: {self._error}")
+
+    def _run(self):
+        """Thread body: run the connection's event loop."""
+        asyncio.run(self._main())
+
+    async def _main(self):
+        """Connect, then read messages into the incoming queue until the connection closes."""
+        try:
+            reader, self._writer = await open_connection(self.address)
+        except OSError as error:
+            self._error = error
+            self._ready.set()
+            return
+        self._loop = asyncio.get_running_loop()
+        self._outgoing = asyncio.Queue()
+        self.connected = True
+        self._ready.set()
+        write_task = asyncio.create_task(self._write_loop())
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                self._incoming.put(message)
+                self._wake()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            write_task.cancel()
+            self.connected = False
+            self._writer.close()
+            self._incoming.put({"t": "closed"})
+            self._wake()
+
+    async def _write_loop(self):
+        """Write queued messages, batching whatever piled up since the last write."""
+        writer = self._writer
+        while True:
+            data = [await self._outgoing.get()]
+            while not self._outgoing.empty():
+                data.append(self._outgoing.get_nowait())
+            if writer.is_closing():
+                return
+            writer.writelines(data)
+            await writer.drain()
+
+    def _wake(self):
+        """Post one NETWORK_EVENT per batch of received messages."""
+        if self._wake_posted:
+            return
+        self._wake_posted = True
+        try:
+            pygame.event.post(pygame.event.Event(NETWORK_EVENT))
+        except pygame.error:
+            pass  # No display yet; the next frame polls anyway
+
+    def send(self, message):
+        """Queue a message for the server (safe to call from the game thread)."""
+        if self.connected:
+            self._loop.call_soon_threadsafe(self._outgoing.put_nowait, encode(message))
+
+    def poll(self):
+        """
+        Get every message received since the last call. Call from the game thread.
+
+        Returns:
+            List of message dicts
+        """
+        self._wake_posted = False
+        messages = []
+        while True:
+            try:
+                messages.append(self._incoming.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def send_op(self, kind, changes, cards=()):
+        """
+        Send an operation the game has already applied locally.
+
+        Args:
+            kind: Operation name ("move", "draw", "flip", "create")
+            changes: [[card_id, before, after], ...] wire states
+            cards: Serialized cards the operation brings into play
+
+        Returns:
+            Sequence number the server's answer will carry
+        """
+        seq = self._next_seq
+        self._next_seq += 1
+        self.pending[seq] = {card_id for card_id, _, _ in changes}
+        self.send({"t": "op", "seq": seq, "kind": kind, "changes": changes, "cards": list(cards)})
+        return seq
+
+    def confirm(self, seq):
+        """
+        Mark a sent operation as answered by the server.
+
+        Returns:
+            True if a later operation still waiting for its answer touches
+            the same cards, i.e. the local prediction is already ahead
+        """
+        card_ids = self.pending.pop(seq, set())
+        return any(later > seq and card_ids & ids for later, ids in self.pending.items())
+
+    def send_drag(self, card_ids, dx, dy, end=False):
+        """
+        Send a drag preview of table cards, throttled to drag_interval.
+
+        Unchanged translations are not resent; the end of a drag always is.
+        """
+        now = time.monotonic()
+        last_time, last = self._last_drag
+        current = (card_ids, dx, dy)
+        if not end and (current == last or now - last_time < self.drag_interval):
+            return
+        self._last_drag = (now, None if end else current)
+        self.send({"t": "drag", "ids": card_ids, "dx": dx, "dy": dy, "end": end})
+
+    def send_view(self, rect):
+        """Send the visible world rectangle when it changed, throttled to view_interval."""
+        now = time.monotonic()
+        last_time, last = self._last_view
+        if rect == last or now - last_time < self.view_interval:
+            return
+        self._last_view = (now, rect)
+        self.send({"t": "view", "rect": list(rect)})
+
+    def close(self):
+        """Close the connection and wait briefly for the thread to finish."""
+        if self.connected:
+            self._loop.call_soon_threadsafe(self._writer.close)
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
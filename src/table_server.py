@@ -0,0 +1,419 @@
+"""
+Asyncio table server holding the authoritative state of a shared table.
+
+Clients send the operations they have already applied locally; the server
+validates them against its own state, applies them and broadcasts the
+resulting per-card deltas. Full state is only sent once, when a client
+joins. Drag previews are rate-limited per sender and only relayed to
+clients whose view overlaps the dragged cards.
+
+Usage:
+    python -m src.table_server --listen 127.0.0.1:8765
+    python -m src.table_server --listen unix:/tmp/table.sock --deck MyDeck
+"""
+
+import argparse
+import asyncio
+import time
+
+from .deck_manager import DeckManager
+from .net_protocol import encode, read_message, start_server
+
+# Cards have a fixed size on the table; used for drag interest tests
+CARD_WIDTH = 100
+CARD_HEIGHT = 140
+
+
+def _numbers(values, count):
+    """Check that a message field is a list of count numbers."""
+    return (isinstance(values, list) and len(values) == count
+            and all(isinstance(value, (int, float)) for value in values))
+
+
+def _hidden(state, seat):
+    """Check whether a card in a zone is hidden from a seat (it is in another seat's hand)."""
+    return state[0].startswith("hand:") and state[0] != f"hand:{seat}"
+
+
+class TableState:
+    """Authoritative zones of every card at the table; plain data, no pygame."""
+
+    def __init__(self):
+        self.cards = {}  # card_id -> serialized card (DeckManager.card_to_dict form)
+        self.zones = {}  # card_id -> wire state; cards not in play have no entry
+        self.piles = {"deck": []}  # "deck" / "hand:<seat>" -> card_ids in order
+
+    def add_cards(self, card_dicts, zone="deck"):
+        """
+        Put serialized cards into play, appended to a pile or on the table.
+
+        Args:
+            card_dicts: Cards as written by DeckManager.card_to_dict
+            zone: "deck", "hand:<seat>" or "table"
+        """
+        for card_data in card_dicts:
+            card_id = card_data["card_id"]
+            self.cards[card_id] = card_data
+            face_up = card_data.get("face_up", True)
+            if zone == "table":
+                self.zones[card_id] = ["table", None, card_data["x"], card_data["y"], face_up]
+            else:
+                pile = self.piles.setdefault(zone, [])
+                self.zones[card_id] = [zone, len(pile), None, None, face_up]
+                pile.append(card_id)
+
+    def snapshot(self, seat=None):
+        """
+        Get every card in play with its zone, for a joining client.
+
+        Args:
+            seat: Seat of the client; cards in other seats' hands are listed
+                by id and zone only, without their contents
+
+        Returns:
+            (card dicts, [[card_id, state], ...]) with piles listed in order
+        """
+        in_play = [card_id for card_id, state in self.zones.items() if state[0] == "table"]
+        for pile in self.piles.values():
+            in_play.extend(pile)
+        return ([self.cards[card_id] for card_id in in_play if not _hidden(self.zones[card_id], seat)],
+                [[card_id, self.zones[card_id]] for card_id in in_play])
+
+    def states(self, card_ids):
+        """Get the current wire states of cards."""
+        return [[card_id, self.zones.get(card_id)] for card_id in card_ids]
+
+    @staticmethod
+    def _well_formed(changes, new_cards):
+        """Check the shape of an operation so applying it cannot fail halfway."""
+        if not isinstance(changes, list) or not isinstance(new_cards, list):
+            return False
+        card_ids = set()
+        for change in changes:
+            if not isinstance(change, list) or len(change) != 3 or not isinstance(change[0], int):
+                return False
+            card_ids.add(change[0])
+            for state in change[1:]:
+                if state is None:
+                    continue
+                if not isinstance(state, list) or len(state) != 5 or not isinstance(state[0], str):
+                    return False
+                if state[0] == "table":
+                    if not all(isinstance(value, (int, float)) for value in state[2:4]):
+                        return False
+                elif not isinstance(state[1], (int, type(None))):
+                    return False
+        if len(card_ids) != len(changes):
+            return False
+        return all(isinstance(card_data, dict) and isinstance(card_data.get("card_id"), int)
+                   for card_data in new_cards)
+
+    def _check(self, seat, changes, new_cards):
+        """Check that an operation starts from the current state and only touches allowed zones."""
+        own_hand = f"hand:{seat}"
+        for card_id, before, after in changes:
+            current = self.zones.get(card_id)
+            if before is None:
+                if current is not None or (card_id not in self.cards and card_id not in new_cards):
+                    return False
+            elif current is None or current[0] != before[0]:
+                return False
+            for state in (before, after):
+                if state is not None and state[0] not in ("table", "deck", own_hand):
+                    return False
+        return True
+
+    def apply(self, seat, changes, new_cards=()):
+        """
+        Validate and apply one client operation.
+
+        Args:
+            seat: Seat of the client sending it (it may only use its own hand)
+            changes: [[card_id, before, after], ...] wire states
+            new_cards: Serialized cards the operation brings into play
+
+        Returns:
+            [[card_id, after], ...] as applied (pile indices clamped), or None
+            if the operation does not match the current state
+
+        Raises:
+            ValueError: If the operation is malformed (nothing is applied)
+        """
+        new_cards = list(new_cards)
+        if not self._well_formed(changes, new_cards):
+            raise ValueError("Malformed operation")
+        new_cards = {card_data["card_id"]: card_data for card_data in new_cards}
+        if not self._check(seat, changes, new_cards):
+            return None
+        for card_id, _, _ in changes:
+            current = self.zones.pop(card_id, None)
+            if current is not None and current[0] != "table":
+                self.piles[current[0]].remove(card_id)
+            if card_id in new_cards:
+                self.cards[card_id] = new_cards[card_id]
+        # Same ascending order the clients use, so pile indices line up
+        placed = sorted(((card_id, after) for card_id, _, after in changes if after is not None),
+                        key=lambda item: (item[1][0], item[1][1] or 0))
+        applied = {}
+        for card_id, (zone, position, x, y, face_up) in placed:
+            if zone == "table":
+                state = ["table", None, x, y, face_up]
+            else:
+                pile = self.piles.setdefault(zone, [])
+                position = max(0, min(position or 0, len(pile)))
+                pile.insert(position, card_id)
+                state = [zone, position, None, None, face_up]
+            self.zones[card_id] = state
+            applied[card_id] = state
+        return [[card_id, applied.get(card_id)] for card_id, _, _ in changes]
+
+    def drag_bounds(self, card_ids, dx, dy):
+        """
+        Get the world rectangle covering dragged table cards before and after a translation.
+
+        Returns:
+            (x0, y0, x1, y1), or None if none of the cards is on the table
+        """
+        bounds = None
+        for card_id in card_ids:
+            state = self.zones.get(card_id)
+            if state is None or state[0] != "table":
+                continue
+            x, y = state[2], state[3]
+            box = (min(x, x + dx), min(y, y + dy),
+                   max(x, x + dx) + CARD_WIDTH, max(y, y + dy) + CARD_HEIGHT)
+            if bounds is None:
+                bounds = box
+            else:
+                bounds = (min(bounds[0], box[0]), min(bounds[1], box[1]),
+                          max(bounds[2], box[2]), max(bounds[3], box[3]))
+        return bounds
+
+
+class _Connection:
+    """One connected client: its outgoing queue, view rectangle and drag throttle."""
+
+    def __init__(self, seat, writer, max_queue):
+        self.seat = seat
+        self.writer = writer
+        self.max_queue = max_queue
+        self.outgoing = asyncio.Queue()
+        self.view = None  # (x0, y0, x1, y1) world rectangle the client shows
+        self.last_drag = 0.0  # When this client's last drag was relayed
+        self.pending_drag = None  # Newest drag held back by the rate limit
+        self.drag_timer = None
+
+    def send(self, data, droppable=False):
+        """
+        Queue encoded bytes for this client.
+
+        Droppable messages (drag previews) are skipped while the client is
+        behind, so a slow client cannot make the server buffer without bound.
+        """
+        if self.writer.is_closing():
+            return
+        if droppable and self.outgoing.qsize() >= self.max_queue:
+            return
+        self.outgoing.put_nowait(data)
+
+    def sees(self, bounds):
+        """Check whether the client's view overlaps a world rectangle."""
+        if self.view is None or bounds is None:
+            return True
+        x0, y0, x1, y1 = self.view
+        return bounds[0] < x1 and bounds[2] > x0 and bounds[1] < y1 and bounds[3] > y0
+
+    async def write_loop(self):
+        """Write queued messages, batching whatever piled up since the last write."""
+        writer = self.writer
+        while True:
+            data = [await self.outgoing.get()]
+            while not self.outgoing.empty():
+                data.append(self.outgoing.get_nowait())
+            if writer.is_closing():
+                return
+            writer.writelines(data)
+            await writer.drain()
+
+
+class TableServer:
+    """Serves one table to any number of clients."""
+
+    def __init__(self, state=None, drag_interval=0.05, max_queue=256):
+        """
+        Initialize the server.
+
+        Args:
+            state: TableState to serve (empty table if not given)
+            drag_interval: Minimum seconds between relayed drags per client
+            max_queue: Queued messages per client beyond which drags are dropped
+        """
+        self.state = state or TableState()
+        self.drag_interval = drag_interval
+        self.max_queue = max_queue
+        self.connections = {}  # seat -> _Connection
+        self._next_seat = 1
+        self._server = None
+        self._handlers = {
+            "op": self._on_op,
+            "drag": self._on_drag,
+            "view": self._on_view,
+        }
+
+    async def start(self, address):
+        """Start listening; returns once the socket is bound."""
+        self._server = await start_server(self._serve, address)
+
+    async def serve_forever(self, address):
+        """Listen on an address until cancelled."""
+        await self.start(address)
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening and disconnect every client."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for connection in list(self.connections.values()):
+            connection.writer.close()
+
+    def _broadcast(self, message, exclude=None):
+        """Send a message to every client except one seat."""
+        data = encode(message)
+        for seat, connection in self.connections.items():
+            if seat != exclude:
+                connection.send(data)
+
+    async def _serve(self, reader, writer):
+        """Run one client connection: welcome, then handle its messages until it leaves."""
+        seat = self._next_seat
+        self._next_seat += 1
+        connection = _Connection(seat, writer, self.max_queue)
+        cards, zones = self.state.snapshot(seat)
+        connection.send(encode({"t": "welcome", "seat": seat, "cards": cards, "zones": zones}))
+        self.connections[seat] = connection
+        self._broadcast({"t": "seats", "seats": sorted(self.connections)})
+        write_task = asyncio.create_task(connection.write_loop())
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                # Handlers validate their fields and drop what they cannot use
+                handler = self._handlers.get(message.get("t")) if isinstance(message, dict) else None
+                if handler is not None:
+                    handler(connection, message)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            write_task.cancel()
+            if connection.drag_timer is not None:
+                connection.drag_timer.cancel()
+            del self.connections[seat]
+            writer.close()
+            self._broadcast({"t": "seats", "seats": sorted(self.connections)})
+
+    def _on_op(self, connection, message):
+        """Apply a client's operation and broadcast the result, or send it the real state."""
+        changes = message.get("changes")
+        new_cards = message.get("cards", [])
+        seq = message.get("seq")
+        if not isinstance(seq, int) or not TableState._well_formed(changes, new_cards):
+            # Malformed: refused before applying anything, so there is no state to correct
+            connection.send(encode({"t": "reject", "seq": seq if isinstance(seq, int) else None,
+                                    "states": []}))
+            return
+        applied = self.state.apply(connection.seat, changes, new_cards)
+        if applied is None:
+            states = self.state.states([card_id for card_id, _, _ in changes])
+            connection.send(encode({"t": "reject", "seq": seq, "states": states}))
+            return
+        # A drop supersedes any drag preview still held back
+        connection.pending_drag = None
+        # Other seats get the contents of cards that become visible to them:
+        # new cards and cards leaving the sender's hand, unless they go to it
+        own_hand = f"hand:{connection.seat}"
+        revealed = [self.state.cards[card_id]
+                    for (card_id, before, _), (_, after) in zip(changes, applied)
+                    if after is not None and after[0] != own_hand
+                    and (before is None or before[0] == own_hand)]
+        delta = {"t": "op", "seat": connection.seat, "kind": message.get("kind"),
+                 "changes": applied, "cards": revealed}
+        self._broadcast(delta, exclude=connection.seat)
+        delta["seq"] = seq
+        connection.send(encode(delta))
+
+    def _on_view(self, connection, message):
+        """Remember which part of the table a client shows (malformed views are dropped)."""
+        rect = message.get("rect")
+        if not _numbers(rect, 4):
+            return
+        x, y, width, height = rect
+        connection.view = (x, y, x + width, y + height)
+
+    def _on_drag(self, connection, message):
+        """Relay a drag preview, at most once per drag_interval per client (malformed drags are dropped)."""
+        card_ids = message.get("ids")
+        translation = [message.get("dx"), message.get("dy")]
+        if not (isinstance(card_ids, list) and all(isinstance(card_id, int) for card_id in card_ids)
+                and _numbers(translation, 2)):
+            return
+        # Relay only the known fields, so other clients get what they expect
+        message = {"t": "drag", "ids": card_ids, "dx": translation[0], "dy": translation[1],
+                   "end": bool(message.get("end"))}
+        now = time.monotonic()
+        if message["end"] or now - connection.last_drag >= self.drag_interval:
+            connection.pending_drag = None
+            self._relay_drag(connection, message, now)
+            return
+        connection.pending_drag = message
+        if connection.drag_timer is None:
+            delay = connection.last_drag + self.drag_interval - now
+            connection.drag_timer = asyncio.get_running_loop().call_later(
+                delay, self._flush_drag, connection)
+
+    def _flush_drag(self, connection):
+        """Relay the newest held-back drag once the rate limit allows it."""
+        connection.drag_timer = None
+        message = connection.pending_drag
+        if message is not None and connection.seat in self.connections:
+            connection.pending_drag = None
+            self._relay_drag(connection, message, time.monotonic())
+
+    def _relay_drag(self, connection, message, now):
+        """Send a drag preview to the other clients that can see the dragged cards."""
+        connection.last_drag = now
+        message["seat"] = connection.seat
+        data = encode(message)
+        end = message["end"]
+        bounds = None if end else self.state.drag_bounds(message["ids"], message["dx"], message["dy"])
+        for seat, other in self.connections.items():
+            if seat != connection.seat and (end or other.sees(bounds)):
+                other.send(data, droppable=not end)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Paper Adventures table server")
+    parser.add_argument("--listen", default="127.0.0.1:8765",
+                        help="host:port or unix:/path to listen on")
+    parser.add_argument("--data-dir", default="data", help="Directory with saved decks")
+    parser.add_argument("--deck", help="Saved deck to put on the table as the draw pile")
+    args = parser.parse_args(argv)
+
+    state = TableState()
+    if args.deck:
+        deck = DeckManager(args.data_dir).load_deck(args.deck)
+        if deck is None:
+            parser.error(f"deck not found: {args.deck}")
+        state.add_cards([DeckManager.card_to_dict(card) for card in deck.cards])
+    print(f"Serving table on {args.listen}")
+    try:
+        asyncio.run(TableServer(state).serve_forever(args.listen))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Word-wrapping text layout with size-to-fit and cached rendered blocks.
+"""
+
+import threading
+from collections import OrderedDict
+
+import pygame
+
+
+class TextLayout:
+    """Lays out multi-line text inside a box, shrinking the font until it fits."""
+
+    def __init__(self, font_sizes=(20, 18, 16, 14, 12), line_gap=0, cache_size=512):
+        """
+        Initialize the layout engine.
+
+        Args:
+            font_sizes: Candidate font sizes, largest first
+            line_gap: Extra pixels between lines
+            cache_size: Number of laid-out and rendered blocks to keep
+        """
+        self.font_sizes = tuple(font_sizes)
+        self.line_gap = line_gap
+        self.cache_size = cache_size
+        self._layouts = OrderedDict()  # (text, width, height) -> (size, lines)
+        self._blocks = OrderedDict()  # (text, width, height, color, align) -> Surface
+        # Faces are built on worker threads too: guard the caches, and give
+        # each thread its own fonts since fonts are not thread-safe
+        self._lock = threading.Lock()
+        self._fonts = threading.local()
+        self.fonts_created = 0
+
+    def font(self, size):
+        """Get the calling thread's font at a size."""
+        fonts = getattr(self._fonts, "by_size", None)
+        if fonts is None:
+            fonts = {}
+            self._fonts.by_size = fonts
+        font = fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            fonts[size] = font
+            self.fonts_created += 1
+        return font
+
+    def wrap(self, font, text, width):
+        """
+        Break text into lines no wider than width.
+
+        Explicit newlines start new paragraphs; words longer than a line are
+        split between characters.
+
+        Args:
+            font: Font used for measuring
+            text: Text to wrap
+            width: Maximum line width in pixels
+
+        Returns:
+            List of line strings
+        """
+        lines = []
+        for paragraph in text.split("\n"):
+            current = ""
+            for word in paragraph.split():
+                candidate = f"{current} {word}" if current else word
+                if font.size(candidate)[0] <= width:
+                    current = candidate
+                    continue
+                if current:
+                    lines.append(current)
+                current = ""
+                while font.size(word)[0] > width and len(word) > 1:
+                    # Split an over-long word at the longest prefix that fits
+                    cut = len(word) - 1
+                    while cut > 1 and font.size(word[:cut])[0] > width:
+                        cut -= 1
+                    lines.append(word[:cut])
+                    word = word[cut:]
+                current = word
+            lines.append(current)
+        return lines
+
+    def fit(self, text, width, height):
+        """
+        Find the largest font size whose wrapped text fits a box.
+
+        If even the smallest size overflows, the lines that fit are kept and
+        the last one is ended with "...".
+
+        Args:
+            text: Text to lay out
+            width, height: Box size in pixels
+
+        Returns:
+            (font_size, lines) tuple
+        """
+        key = (text, width, height)
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is not None:
+                self._layouts.move_to_end(key)
+                return layout
+        layout = self._compute_fit(text, width, height)
+        with self._lock:
+            self._remember(self._layouts, key, layout)
+        return layout
+
+    def render(self, text, width, height, color, align="center"):
+        """
+        Render text laid out inside a box.
+
+        Args:
+            text: Text to render
+            width, height: Box size in pixels
+            color: Text color
+            align: "left" or "center"
+
+        Returns:
+            Transparent surface of the box size with the text drawn on it
+        """
+        key = (text, width, height, color, align)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                return block
+        size, lines = self.fit(text, width, height)
+        font = self.font(size)
+        line_height = font.get_linesize() + self.line_gap
+        block = pygame.Surface((width, height), pygame.SRCALPHA)
+        # Center the block vertically in the box
+        y = max(0, (height - line_height * len(lines)) // 2)
+        for line in lines:
+            if line:
+                surface = font.render(line, True, color)
+                x = 0 if align == "left" else (width - surface.get_width()) // 2
+                block.blit(surface, (x, y))
+            y += line_height
+        with self._lock:
+            self._remember(self._blocks, key, block)
+        return block
+
+    def clear(self):
+        """Drop every cached layout and rendered block."""
+        with self._lock:
+            self._layouts.clear()
+            self._blocks.clear()
+
+    def memory_usage(self):
+        """Get (blocks, bytes) held by the rendered block cache."""
+        with self._lock:
+            blocks = list(self._blocks.values())
+        total = 0
+        for block in blocks:
+            width, height = block.get_size()
+            total += width * height * block.get_bytesize()
+        return len(blocks), total
+
+    def _compute_fit(self, text, width, height):
+        """Try each font size from largest to smallest."""
+        for size in self.font_sizes:
+            font = self.font(size)
+            lines = self.wrap(font, text, width)
+            line_height = font.get_linesize() + self.line_gap
+            if line_height * len(lines) <= height:
+                return (size, lines)
+        # Nothing fits: keep what fits at the smallest size and mark the cut
+        size = self.font_sizes[-1]
+        font = self.font(size)
+        lines = self.wrap(font, text, width)
+        max_lines = max(1, height // (font.get_linesize() + self.line_gap))
+        if len(lines) > max_lines:
+            lines = lines[:max_lines]
+            last = lines[-1]
+            while last and font.size(last + "...")[0] > width:
+                last = last[:-1]
+            lines[-1] = last.rstrip() + "..."
+        return (size, lines)
+
+    def _remember(self, cache, key, value):
+        """Insert into an LRU cache, evicting the oldest entry when full."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
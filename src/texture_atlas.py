@@ -0,0 +1,153 @@
+"""
+Texture atlas packing many small cached surfaces into a few large pages.
+"""
+
+import pygame
+
+
+class TextureAtlas:
+    """Shelf-packs surfaces into fixed-size pages so they can be blitted in batches.
+
+    When every page is full the oldest page is cleared and reused, so memory
+    stays bounded and only regions on that page need rebuilding.
+    """
+
+    def __init__(self, page_size=2048, max_pages=4, alpha=False, padding=1):
+        """
+        Initialize the atlas.
+
+        Args:
+            page_size: Width and height of each page surface
+            max_pages: Pages allocated before the oldest page is recycled
+            alpha: Whether pages keep per-pixel alpha (text, borders, shadows)
+            padding: Gap left between packed regions
+        """
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.alpha = alpha
+        self.padding = padding
+        self.pages = []
+        self._shelves = []  # Per page: list of [y, height, next_x]
+        self._next_y = []  # Per page: top of the unused area below the shelves
+        # Each page lifetime gets a token; regions holding a dead token are invalid
+        self._tokens = []
+        self._live_tokens = set()
+        self._next_token = 0
+        self._evict_next = 0
+        self.evictions = 0
+        # Optional callable run before a page is recycled, e.g. to submit
+        # queued blits that still read from it
+        self.on_evict = None
+
+    def add(self, surface):
+        """
+        Copy a surface into the atlas.
+
+        Args:
+            surface: Surface to pack
+
+        Returns:
+            Region tuple (page_surface, rect, token), or None if the
+            surface is larger than a page
+        """
+        width, height = surface.get_size()
+        if width > self.page_size or height > self.page_size:
+            return None
+        for page_index in range(len(self.pages)):
+            rect = self._pack(page_index, width, height)
+            if rect is not None:
+                return self._store(page_index, rect, surface)
+        if len(self.pages) < self.max_pages:
+            page_index = self._new_page()
+        else:
+            # Atlas is full: recycle the oldest page; callers re-add what they still use
+            page_index = self._evict_next
+            self._evict_next = (self._evict_next + 1) % self.max_pages
+            if self.on_evict is not None:
+                self.on_evict()
+            self._clear_page(page_index)
+            self.evictions += 1
+        rect = self._pack(page_index, width, height)
+        return self._store(page_index, rect, surface)
+
+    def is_valid(self, region):
+        """Check whether a region returned by add() is still backed by the atlas."""
+        return region is not None and region[2] in self._live_tokens
+
+    def reset(self):
+        """Drop every page, invalidating all regions."""
+        self.pages = []
+        self._shelves = []
+        self._next_y = []
+        self._tokens = []
+        self._live_tokens.clear()
+        self._evict_next = 0
+
+    def used_bytes(self):
+        """Get the memory held by atlas pages in bytes."""
+        return sum(page.get_bytesize() * self.page_size * self.page_size for page in self.pages)
+
+    def memory_usage(self):
+        """Get (pages, bytes) held by the atlas."""
+        return len(self.pages), self.used_bytes()
+
+    def _new_page(self):
+        """Allocate an empty page and return its index."""
+        size = (self.page_size, self.page_size)
+        if self.alpha:
+            page = pygame.Surface(size, pygame.SRCALPHA)
+            if pygame.display.get_surface() is not None:
+                page = page.convert_alpha()
+            page.fill((0, 0, 0, 0))
+        else:
+            page = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                page = page.convert()
+        self.pages.append(page)
+        self._shelves.append([])
+        self._next_y.append(0)
+        self._tokens.append(self._issue_token())
+        return len(self.pages) - 1
+
+    def _clear_page(self, page_index):
+        """Empty a page so it can be packed again."""
+        self._live_tokens.discard(self._tokens[page_index])
+        self._tokens[page_index] = self._issue_token()
+        self._shelves[page_index] = []
+        self._next_y[page_index] = 0
+        if self.alpha:
+            self.pages[page_index].fill((0, 0, 0, 0))
+
+    def _issue_token(self):
+        """Create a new live page token."""
+        token = self._next_token
+        self._next_token += 1
+        self._live_tokens.add(token)
+        return token
+
+    def _pack(self, page_index, width, height):
+        """Find space for a rectangle on a page using shelf packing."""
+        pad = self.padding
+        shelves = self._shelves[page_index]
+        for shelf in shelves:
+            shelf_y, shelf_h, next_x = shelf
+            if height <= shelf_h and next_x + width <= self.page_size:
+                shelf[2] = next_x + width + pad
+                return pygame.Rect(next_x, shelf_y, width, height)
+        next_y = self._next_y[page_index]
+        if next_y + height > self.page_size or width > self.page_size:
+            return None
+        shelves.append([next_y, height, width + pad])
+        self._next_y[page_index] = next_y + height + pad
+        return pygame.Rect(0, next_y, width, height)
+
+    def _store(self, page_index, rect, surface):
+        """Copy a surface into a packed rectangle and build its region."""
+        page = self.pages[page_index]
+        if self.alpha:
+            # Replace rather than blend so stale pixels never show through
+            page.fill((0, 0, 0, 0), rect)
+            page.blit(surface, rect, special_flags=pygame.BLEND_RGBA_ADD)
+        else:
+            page.blit(surface, rect)
+        return (page, rect, self._tokens[page_index])
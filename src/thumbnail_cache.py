@@ -0,0 +1,366 @@
+"""
+Persistent cache of card and deck thumbnails, stored as PNGs on disk.
+
+Thumbnails are keyed by a hash of everything that affects how they look:
+the card (or saved deck file) data, the thumbnail size and
+renderer.FACE_VERSION. Changing a card or the face layout simply makes new
+keys, so stale files are never served. Missing thumbnails are rendered on
+worker threads and written to the cache directory; on later runs they are
+read back instead of rendered. The directory is kept under a byte budget
+by deleting the least recently used files.
+
+Usage:
+    python -m src.thumbnail_cache                 # pre-render every saved deck
+    python -m src.thumbnail_cache --size 90 126 --data-dir archive
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from .deck_manager import DeckManager
+from .renderer import FACE_VERSION, CardRenderer
+
+DECK_SIZE = (120, 100)  # Default deck preview: the top cards fanned out
+CARD_SIZE = (75, 105)  # Default card preview
+DECK_FAN = 3  # Top cards shown in a deck preview
+
+
+class ThumbnailCache:
+    """Serves thumbnails from memory or disk and renders missing ones on worker threads."""
+
+    def __init__(self, renderer, cache_dir="data/thumbnails", max_disk_bytes=64 * 1024 * 1024,
+                 max_bytes=16 * 1024 * 1024, workers=2):
+        """
+        Initialize the cache (the directory is scanned on first use, by a worker).
+
+        Args:
+            renderer: CardRenderer used to rasterize card faces
+            cache_dir: Directory the PNG files are kept in
+            max_disk_bytes: Size budget of the cache directory
+            max_bytes: Memory budget for thumbnails kept in display format
+            workers: Number of rendering threads
+        """
+        self.renderer = renderer
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_bytes = max_bytes
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+        self._cache = OrderedDict()  # request key -> display-format Surface
+        self._pending = set()
+        self._failed = set()  # Request keys that could not be produced; never retried
+        self._ready = queue.Queue()  # Finished thumbnails waiting for the main thread
+        self._card_keys = weakref.WeakKeyDictionary()  # card -> (state, size, digest)
+        self._disk_lock = threading.Lock()
+        self._disk_files = None  # file name -> bytes, least recently used first
+        self.disk_bytes = 0
+        self.used_bytes = 0
+        self.disk_hits = 0
+        self.rendered = 0
+        self.evictions = 0
+
+    def card_thumbnail(self, card, size=CARD_SIZE):
+        """
+        Get a card's thumbnail, starting to load or render it if needed.
+
+        Args:
+            card: Card object
+            size: (width, height) of the thumbnail
+
+        Returns:
+            Surface, or None while it is being produced
+        """
+        if not self._art_ready(card):
+            return None
+        digest = self._card_digest(card, size)
+        return self._get(("card", digest), digest, self._render_card, card, size)
+
+    def deck_thumbnail(self, deck, size=DECK_SIZE):
+        """
+        Get a preview of a deck: its top cards fanned out.
+
+        Args:
+            deck: Deck object
+            size: (width, height) of the thumbnail
+
+        Returns:
+            Surface, or None while it is being produced
+        """
+        cards = deck.cards[:DECK_FAN]
+        if not all(self._art_ready(card) for card in cards):
+            return None
+        parts = [self._card_digest(card, size) for card in cards]
+        digest = self._digest(["deck", size, parts])
+        return self._get(("deck", digest), digest, self._render_deck, cards, size)
+
+    def saved_deck_thumbnail(self, deck_name, size=DECK_SIZE, data_dir="data"):
+        """
+        Get a preview of a saved deck without loading it on the main thread.
+
+        The file is read and hashed by a worker; it is only parsed if its
+        thumbnail is not on disk yet.
+
+        Args:
+            deck_name: Name as returned by DeckManager.list_decks()
+            size: (width, height) of the thumbnail
+            data_dir: Directory with saved decks
+
+        Returns:
+            Surface, or None while it is being produced or if the deck is missing
+        """
+        path = os.path.join(data_dir, f"{deck_name}.json")
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = ("saved", path, stat.st_mtime_ns, stat.st_size, size)
+        return self._get(key, None, self._render_saved_deck, path, size)
+
+    def busy(self):
+        """Check whether any thumbnail is still being produced or waiting to be published."""
+        return bool(self._pending)
+
+    def publish(self):
+        """
+        Convert finished thumbnails to display format and cache them. Must run on the main thread.
+
+        Returns:
+            Number of thumbnails that became available
+        """
+        published = 0
+        while True:
+            try:
+                key, surface = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(key)
+            if surface is None:
+                self._failed.add(key)
+                continue
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self._store(key, surface)
+            published += 1
+        return published
+
+    def shutdown(self):
+        """Cancel queued work and wait for running workers to finish."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+
+    def memory_usage(self):
+        """Get (thumbnails, bytes) held in memory."""
+        return len(self._cache), self.used_bytes
+
+    def _get(self, key, digest, render, *args):
+        """Get a thumbnail from memory, or queue it to be loaded from disk or rendered."""
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            return surface
+        if key not in self._pending and key not in self._failed:
+            self._pending.add(key)
+            self._executor.submit(self._produce, key, digest, render, args)
+        return None
+
+    def _store(self, key, surface):
+        """Insert a thumbnail and evict least recently used ones over the memory budget."""
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self.used_bytes -= self._surface_bytes(old)
+        self._cache[key] = surface
+        self.used_bytes += self._surface_bytes(surface)
+        while self.used_bytes > self.max_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self.used_bytes -= self._surface_bytes(evicted)
+
+    @staticmethod
+    def _surface_bytes(surface):
+        """Get the pixel memory held by a surface."""
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def _art_ready(self, card):
+        """Check that a card's art is loaded (or missing for good), so its thumbnail is final."""
+        art = card.attributes.get("art")
+        assets = self.renderer.assets
+        if not art or assets is None:
+            return True
+        size = (card.width, card.height)
+        return assets.get(art, size) is not None or assets.is_missing(art, size)
+
+    def _card_digest(self, card, size):
+        """Get the content hash of a card thumbnail, memoized until the card changes."""
+        state = (card.version, card.face_up, card.name, card.card_type)
+        entry = self._card_keys.get(card)
+        if entry is not None and entry[0] == state and entry[1] == size:
+            return entry[2]
+        art = card.attributes.get("art")
+        assets = self.renderer.assets
+        art_loaded = bool(art) and assets is not None and not assets.is_missing(art, (card.width, card.height))
+        digest = self._digest(["card", size, card.name, card.card_type, card.attributes, card.face_up,
+                               card.width, card.height, card.face_color, card.back_color,
+                               card.border_color, card.text_color, art_loaded])
+        self._card_keys[card] = (state, size, digest)
+        return digest
+
+    @staticmethod
+    def _digest(content):
+        """Hash thumbnail content together with the face layout version."""
+        data = json.dumps([FACE_VERSION, content], sort_keys=True, default=str)
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    def _produce(self, key, digest, render, args):
+        """Worker: read a thumbnail from disk or render and save it, then hand it to the main thread."""
+        surface = None
+        try:
+            if digest is None:
+                # Saved decks: the key depends on the file content, read here
+                digest, args = self._hash_saved_deck(*args)
+            surface = self._read_file(digest)
+            if surface is None:
+                surface = render(*args)
+                self.rendered += 1
+                self._write_file(digest, surface)
+            else:
+                self.disk_hits += 1
+        except (OSError, ValueError, KeyError, TypeError, pygame.error):
+            surface = None
+        finally:
+            # Always report back so the request never stays pending
+            self._ready.put((key, surface))
+
+    def _render_card(self, card, size):
+        """Worker: rasterize a card face and scale it to thumbnail size."""
+        face = self.renderer.build_card_face(card, 1.0)
+        thumbnail = pygame.Surface(size, pygame.SRCALPHA)
+        thumbnail.blit(pygame.transform.smoothscale(face, size), (0, 0))
+        return thumbnail
+
+    def _render_deck(self, cards, size):
+        """Worker: fan the top cards out, the top card in front on the left."""
+        thumbnail = pygame.Surface(size, pygame.SRCALPHA)
+        width, height = size
+        # Card proportions, leaving at least a quarter of the width for the fan
+        card_w = max(1, min(height * 100 // 140, width * 3 // 4))
+        card_h = max(1, card_w * 140 // 100)
+        top = (height - card_h) // 2
+        if not cards:
+            pygame.draw.rect(thumbnail, (120, 120, 120), (0, top, card_w, card_h), 1)
+            return thumbnail
+        step = (width - card_w) // (len(cards) - 1) if len(cards) > 1 else 0
+        for index in range(len(cards) - 1, -1, -1):
+            face = self._render_card(cards[index], (card_w, card_h))
+            thumbnail.blit(face, (index * step, top))
+        return thumbnail
+
+    def _hash_saved_deck(self, path, size):
+        """Worker: read a saved deck file; returns (digest, render args) for its preview."""
+        with open(path, "rb") as f:
+            data = f.read()
+        return self._digest(["saved", size, hashlib.sha1(data).hexdigest()]), (data, size)
+
+    def _render_saved_deck(self, data, size):
+        """Worker: parse the top cards of a saved deck file and fan them out."""
+        cards = [DeckManager.card_from_dict(card_data, preview=True)
+                 for card_data in json.loads(data)["cards"][:DECK_FAN]]
+        return self._render_deck(cards, size)
+
+    def _file_path(self, digest):
+        """Get the PNG path of a thumbnail."""
+        return os.path.join(self.cache_dir, f"{digest}.png")
+
+    def _scan(self):
+        """Index the cache directory, least recently used first (call with _disk_lock held)."""
+        if self._disk_files is not None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".png") and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        entries.sort()
+        self._disk_files = OrderedDict((name, size) for _, name, size in entries)
+        self.disk_bytes = sum(self._disk_files.values())
+
+    def _read_file(self, digest):
+        """Load a thumbnail from disk and mark it recently used, or return None."""
+        name = f"{digest}.png"
+        with self._disk_lock:
+            self._scan()
+            if name not in self._disk_files:
+                return None
+            self._disk_files.move_to_end(name)
+        path = self._file_path(digest)
+        try:
+            surface = pygame.image.load(path)
+            # The file's age is what orders eviction on the next run
+            os.utime(path)
+        except (OSError, pygame.error):
+            with self._disk_lock:
+                self.disk_bytes -= self._disk_files.pop(name, 0)
+            return None
+        return surface
+
+    def _write_file(self, digest, surface):
+        """Save a thumbnail atomically and evict old files over the disk budget."""
+        name = f"{digest}.png"
+        path = self._file_path(digest)
+        temp_path = f"{path}.{threading.get_ident()}.tmp.png"
+        pygame.image.save(surface, temp_path)
+        os.replace(temp_path, path)
+        size = os.path.getsize(path)
+        evicted = []
+        with self._disk_lock:
+            self._scan()
+            self.disk_bytes += size - self._disk_files.pop(name, 0)
+            self._disk_files[name] = size
+            while self.disk_bytes > self.max_disk_bytes and len(self._disk_files) > 1:
+                old_name, old_size = self._disk_files.popitem(last=False)
+                self.disk_bytes -= old_size
+                evicted.append(old_name)
+        for old_name in evicted:
+            try:
+                os.remove(os.path.join(self.cache_dir, old_name))
+            except OSError:
+                pass
+            self.evictions += 1
+
+
+def main(argv=None):
+    """Command-line entry point: render (or confirm) every saved deck's thumbnail."""
+    parser = argparse.ArgumentParser(description="Pre-render thumbnails of saved decks")
+    parser.add_argument("--data-dir", default="data", help="Directory with saved decks")
+    parser.add_argument("--size", type=int, nargs=2, default=list(DECK_SIZE), metavar=("W", "H"),
+                        help="Thumbnail size (default %d %d)" % DECK_SIZE)
+    args = parser.parse_args(argv)
+
+    pygame.font.init()
+    renderer = CardRenderer(pygame.Surface((1, 1)))
+    cache = ThumbnailCache(renderer, os.path.join(args.data_dir, "thumbnails"))
+    names = sorted(DeckManager(args.data_dir).list_decks())
+    size = tuple(args.size)
+    start = time.perf_counter()
+    for name in names:
+        cache.saved_deck_thumbnail(name, size, args.data_dir)
+    while cache.busy():
+        time.sleep(0.01)
+        cache.publish()
+    cache.shutdown()
+    elapsed = time.perf_counter() - start
+    print(f"{len(names)} decks in {elapsed:.2f}s: {cache.disk_hits} from disk, "
+          f"{cache.rendered} rendered; cache holds {cache.disk_bytes // 1024} KiB")
+
+
+if __name__ == "__main__":
+    main()
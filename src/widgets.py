@@ -0,0 +1,261 @@
+"""
+Retained-mode UI widgets with cached layout and region-indexed event dispatch.
+"""
+
+import pygame
+
+from .spatial_index import SpatialHash
+
+
+class Widget:
+    """Base class for a rectangular UI element that draws and handles its own events."""
+
+    focusable = False
+    hit_testable = True
+
+    def __init__(self, x=0, y=0, width=0, height=0):
+        """
+        Initialize the widget.
+
+        Args:
+            x, y: Screen position of the widget's interactive area
+            width, height: Size of the interactive area
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.visible = True
+        self.focused = False
+
+    def set_rect(self, x, y, width, height):
+        """Move/resize the widget."""
+        self.x, self.y, self.width, self.height = x, y, width, height
+
+    def is_point_inside(self, x, y):
+        """Check whether a screen point is inside the interactive area."""
+        return self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
+
+    def handle_event(self, event):
+        """
+        Handle an event routed to this widget.
+
+        Args:
+            event: Pygame event
+
+        Returns:
+            True if the event was consumed
+        """
+        return False
+
+    def render(self, renderer):
+        """Draw the widget with a CardRenderer."""
+
+
+class Panel(Widget):
+    """Titled background panel; purely decorative, clicks pass through it."""
+
+    hit_testable = False
+
+    def __init__(self, title, x=0, y=0, width=0, height=0):
+        super().__init__(x, y, width, height)
+        self.title = title
+
+    def render(self, renderer):
+        renderer.render_panel_with_title(self.x, self.y, self.width, self.height, self.title)
+
+
+class Button(Widget):
+    """Clickable button calling on_click when pressed."""
+
+    def __init__(self, text, on_click, enabled=True, x=0, y=0, width=0, height=32):
+        """
+        Initialize the button.
+
+        Args:
+            text: Button label
+            on_click: Callable run on left click
+            enabled: Bool, or a callable returning whether the button looks enabled
+        """
+        super().__init__(x, y, width, height)
+        self.text = text
+        self.on_click = on_click
+        self.enabled = enabled
+
+    def is_enabled(self):
+        """Check whether the button is drawn as enabled."""
+        return self.enabled() if callable(self.enabled) else self.enabled
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.on_click()
+            return True
+        return False
+
+    def render(self, renderer):
+        renderer.render_button(self.x, self.y, self.width, self.height, self.text,
+                               enabled=self.is_enabled())
+
+
+class Selector(Button):
+    """Button that cycles through a list of options on each click."""
+
+    def __init__(self, options, on_change, prefix="", index=0, x=0, y=0, width=0, height=32):
+        """
+        Initialize the selector.
+
+        Args:
+            options: List of option strings
+            on_change: Callable receiving the newly selected option
+            prefix: Text shown before the option
+            index: Initially selected option
+        """
+        super().__init__("", self._next, True, x, y, width, height)
+        self.options = options
+        self.on_change = on_change
+        self.prefix = prefix
+        self.index = index
+        self.text = f"{prefix}{options[index]}"
+
+    @property
+    def value(self):
+        """Currently selected option."""
+        return self.options[self.index]
+
+    def _next(self):
+        """Select the following option, wrapping around."""
+        self.index = (self.index + 1) % len(self.options)
+        self.text = f"{self.prefix}{self.value}"
+        self.on_change(self.value)
+
+
+class TextInput(Widget):
+    """Labeled single-line text box; the label sits above the interactive box."""
+
+    focusable = True
+    LABEL_HEIGHT = 18
+
+    def __init__(self, label, max_length=30, numeric=False, x=0, y=0, width=0, height=28):
+        """
+        Initialize the text input.
+
+        Args:
+            label: Label drawn above the box
+            max_length: Maximum number of characters
+            numeric: Accept only digits (and a leading minus sign)
+        """
+        super().__init__(x, y, width, height)
+        self.label = label
+        self.max_length = max_length
+        self.numeric = numeric
+        self.value = ""
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            return True
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_BACKSPACE:
+            self.value = self.value[:-1]
+        elif event.key == pygame.K_RETURN:
+            # Submitting is done with the Submit button
+            pass
+        elif event.unicode and event.unicode.isprintable():
+            char = event.unicode
+            if self.numeric and not (char.isdigit() or (char == '-' and not self.value)):
+                return True
+            if len(self.value) < self.max_length:
+                self.value += char
+        else:
+            return False
+        return True
+
+    def render(self, renderer):
+        renderer.render_text_input(self.x, self.y - self.LABEL_HEIGHT, self.width, self.height,
+                                   self.label, self.value, self.focused)
+
+
+class WidgetTree:
+    """Owns a set of widgets, their region index and keyboard focus."""
+
+    def __init__(self, cell_size=64):
+        """
+        Initialize the tree.
+
+        Args:
+            cell_size: Grid cell size of the region index in pixels
+        """
+        self.widgets = []  # Draw order, back to front
+        self.index = SpatialHash(cell_size)
+        self.focus = None
+        self._index_valid = False
+
+    def add(self, widget):
+        """Add a widget on top of the existing ones and return it."""
+        self.widgets.append(widget)
+        self._index_valid = False
+        return widget
+
+    def invalidate_layout(self):
+        """Mark the region index stale after widgets moved or changed visibility."""
+        self._index_valid = False
+
+    def _rebuild_index(self):
+        """Index every visible, clickable widget by the screen cells it covers."""
+        self.index.clear()
+        for widget in self.widgets:
+            if widget.visible and widget.hit_testable:
+                self.index.insert(widget)
+        self._index_valid = True
+
+    def widget_at(self, x, y):
+        """
+        Get the topmost clickable widget under a screen point.
+
+        Returns:
+            Widget, or None
+        """
+        if not self._index_valid:
+            self._rebuild_index()
+        hits = self.index.query_point(x, y)
+        return hits[-1] if hits else None
+
+    def set_focus(self, widget):
+        """Give keyboard focus to a widget (None clears focus)."""
+        if widget is self.focus:
+            return
+        if self.focus is not None:
+            self.focus.focused = False
+        self.focus = widget
+        if widget is not None:
+            widget.focused = True
+
+    def dispatch(self, event):
+        """
+        Route an event to the widget under the cursor or with focus.
+
+        Left clicks go to the widget under the cursor; clicks that miss every
+        widget clear focus. Key presses go to the focused widget.
+
+        Args:
+            event: Pygame event
+
+        Returns:
+            True if a widget consumed the event
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            widget = self.widget_at(*event.pos)
+            if widget is None:
+                self.set_focus(None)
+                return False
+            self.set_focus(widget if widget.focusable else None)
+            return widget.handle_event(event)
+        if event.type == pygame.KEYDOWN and self.focus is not None:
+            return self.focus.handle_event(event)
+        return False
+
+    def render(self, renderer):
+        """Draw visible widgets back to front."""
+        for widget in self.widgets:
+            if widget.visible:
+                widget.render(renderer)